@@ -1,5 +1,5 @@
 """Pydantic models for API requests and responses."""
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Literal, Optional
 from pydantic import BaseModel, Field
 
 
@@ -7,9 +7,15 @@ class PlanRequest(BaseModel):
     """Request body for plan endpoint."""
     domain_pddl: str = Field(..., description="PDDL domain definition")
     problem_pddl: str = Field(..., description="PDDL problem definition")
-    algorithm: str = Field(default="astar", description="Search algorithm: bfs, astar, greedy")
-    heuristic: str = Field(default="h_add", description="Heuristic: goal_count, h_add, h_max")
+    algorithm: Literal["bfs", "astar", "greedy", "hda_star"] = Field(default="astar", description="Search algorithm")
+    heuristic: str = Field(default="h_add", description="Heuristic: goal_count, h_add, h_max, lm_cut, lm_count, lm_count_admissible, pdb")
     timeout: int = Field(default=30, description="Timeout in seconds")
+    workers: int = Field(default=4, ge=1, description="Worker processes for hda_star (capped by the server)")
+    open_list: Literal["heap", "bucket"] = Field(default="heap", description="Open list for astar/greedy")
+    tie_breaking: Literal["fifo", "lifo"] = Field(default="fifo", description="Order among equally ranked states")
+    instrument: bool = Field(default=False, description="Report per-phase timings and time heuristic evaluations")
+    profile: bool = Field(default=False, description="Profile the run and store the artifact (administrators only)")
+    profiler: Literal["cprofile", "sampling"] = Field(default="cprofile", description="Profiler for profile=true")
 
 
 class ActionResult(BaseModel):
@@ -20,6 +26,12 @@ class ActionResult(BaseModel):
     effects_del: List[str]
 
 
+class PhaseMetrics(BaseModel):
+    """Wall time and call count of one request phase."""
+    time_ms: float
+    calls: int
+
+
 class SearchMetrics(BaseModel):
     """Search performance metrics."""
     nodes_expanded: int
@@ -29,6 +41,13 @@ class SearchMetrics(BaseModel):
     heuristic_calls: int = 0
     initial_h: float = 0.0
     final_h: float = 0.0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    cache_hit_rate: float = 0.0
+    states_per_second: float = 0.0
+    peak_open: int = 0
+    peak_states: int = 0
+    phases: Optional[Dict[str, PhaseMetrics]] = None  # Only for instrumented requests
 
 
 class SearchTreeNode(BaseModel):
@@ -55,6 +74,14 @@ class SearchTree(BaseModel):
     edges: List[SearchTreeEdge]
 
 
+class ProfileInfo(BaseModel):
+    """Profile captured for a plan request."""
+    artifact: str  # File name, downloadable from /api/v1/profiles/{artifact}
+    profiler: str
+    problem_hash: str
+    summary: str
+
+
 class PlanResponse(BaseModel):
     """Response from plan endpoint."""
     success: bool
@@ -62,6 +89,7 @@ class PlanResponse(BaseModel):
     metrics: Optional[SearchMetrics] = None
     search_tree: Optional[SearchTree] = None
     error_message: Optional[str] = None
+    profile: Optional[ProfileInfo] = None
 
 
 class ValidationRequest(BaseModel):
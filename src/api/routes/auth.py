@@ -1,13 +1,17 @@
 """Authentication API routes."""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
+from functools import lru_cache, partial
 from typing import Optional
 from fastapi import APIRouter, HTTPException, Depends, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from jose import JWTError, jwt
-from passlib.context import CryptContext
 from pydantic import BaseModel, EmailStr
 
-from ...database import (
+from ...config import get_settings
+from ...user_cache import user_cache
+from ...async_db import (
     get_user, get_user_by_email, create_user,
     update_user, delete_user, get_all_users_count
 )
@@ -15,14 +19,24 @@ from ...database import (
 router = APIRouter(prefix="/api/v1/auth", tags=["authentication"])
 
 # Security configuration
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/v1/auth/login")
+# For endpoints that work anonymously but unlock features for signed-in users
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/v1/auth/login", auto_error=False)
 
 # JWT Configuration
 SECRET_KEY = "your-secret-key-change-in-production-use-env-var"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
+# Password hashing: bcrypt releases the GIL, so a few threads hash in parallel
+# while the event loop keeps serving other requests
+HASH_WORKERS = 4
+MAX_CONCURRENT_LOGINS = 2 * HASH_WORKERS  # Admitted at once; keeps the pool busy
+LOGIN_QUEUE_TIMEOUT = 10.0  # Seconds to wait for admission before answering 503
+
+_hash_executor = ThreadPoolExecutor(max_workers=HASH_WORKERS, thread_name_prefix="planlab-bcrypt")
+_login_slots = asyncio.Semaphore(MAX_CONCURRENT_LOGINS)
+
 
 class User(BaseModel):
     """User model."""
@@ -57,28 +71,60 @@ class TokenData(BaseModel):
     username: Optional[str] = None
 
 
+@lru_cache()
+def get_pwd_context():
+    """Password hashing context; passlib is imported on first use."""
+    from passlib.context import CryptContext
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash."""
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
     """Hash a password."""
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
+
+
+async def run_password_hashing(func, *args):
+    """Run verify_password / get_password_hash on the hashing pool."""
+    return await asyncio.get_running_loop().run_in_executor(_hash_executor, partial(func, *args))
+
+
+@asynccontextmanager
+async def login_slot():
+    """Admission control for password hashing; 503 when the queue does not drain in time."""
+    try:
+        await asyncio.wait_for(_login_slots.acquire(), LOGIN_QUEUE_TIMEOUT)
+    except asyncio.TimeoutError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many logins in progress, please retry",
+            headers={"Retry-After": "1"},
+        )
+    try:
+        yield
+    finally:
+        _login_slots.release()
 
 
-def authenticate_user(username: str, password: str) -> Optional[dict]:
+async def authenticate_user(username: str, password: str) -> Optional[dict]:
     """Authenticate a user."""
-    user = get_user(username)
+    user = await get_user(username)
     if not user:
         return None
-    if not verify_password(password, user['hashed_password']):
+    async with login_slot():
+        valid = await run_password_hashing(verify_password, password, user['hashed_password'])
+    if not valid:
         return None
     return user
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """Create a JWT access token."""
+    from jose import jwt  # Imported on first use to keep startup fast
     to_encode = data.copy()
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
@@ -90,12 +136,20 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
 
 
 async def get_current_user(token: str = Depends(oauth2_scheme)) -> dict:
-    """Get current user from token."""
+    """Get current user from token, served from the user cache when possible."""
+    user = user_cache.get(token)
+    if user is not None:
+        return user
+    
+    from jose import JWTError, jwt
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+    if user_cache.is_revoked(token):
+        raise credentials_exception
+    generation = user_cache.generation  # Before the lookup, so a concurrent invalidation wins
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         username: str = payload.get("sub")
@@ -104,9 +158,10 @@ async def get_current_user(token: str = Depends(oauth2_scheme)) -> dict:
     except JWTError:
         raise credentials_exception
     
-    user = get_user(username)
+    user = await get_user(username)
     if user is None:
         raise credentials_exception
+    user_cache.put(token, user, payload.get("exp"), generation)
     return user
 
 
@@ -117,26 +172,50 @@ async def get_current_active_user(current_user: dict = Depends(get_current_user)
     return current_user
 
 
+async def get_optional_user(token: Optional[str] = Depends(optional_oauth2_scheme)) -> Optional[dict]:
+    """Get the current user if a valid token was sent, otherwise None."""
+    if token is None:
+        return None
+    try:
+        return await get_current_user(token)
+    except HTTPException:
+        return None
+
+
+def is_admin(user: Optional[dict]) -> bool:
+    """Whether a user is an active administrator (listed in settings.admin_users)."""
+    return (user is not None and not user.get('disabled')
+            and user['username'] in get_settings().admin_users)
+
+
+async def get_current_admin_user(current_user: dict = Depends(get_current_active_user)) -> dict:
+    """Get current user, requiring administrator rights."""
+    if not is_admin(current_user):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Administrator access required")
+    return current_user
+
+
 @router.post("/register", response_model=User)
 async def register(user_data: UserCreate):
     """Register a new user."""
     # Check if username exists
-    if get_user(user_data.username):
+    if await get_user(user_data.username):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Username already registered"
         )
     
     # Check if email exists
-    if get_user_by_email(user_data.email):
+    if await get_user_by_email(user_data.email):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
     
     # Create new user
-    hashed_password = get_password_hash(user_data.password)
-    success = create_user(
+    async with login_slot():
+        hashed_password = await run_password_hashing(get_password_hash, user_data.password)
+    success = await create_user(
         username=user_data.username,
         email=user_data.email,
         hashed_password=hashed_password,
@@ -160,7 +239,7 @@ async def register(user_data: UserCreate):
 @router.post("/login", response_model=Token)
 async def login(form_data: OAuth2PasswordRequestForm = Depends()):
     """Login and get access token."""
-    user = authenticate_user(form_data.username, form_data.password)
+    user = await authenticate_user(form_data.username, form_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -192,12 +271,15 @@ async def read_users_me(current_user: dict = Depends(get_current_active_user)):
 
 
 @router.post("/logout")
-async def logout(current_user: dict = Depends(get_current_active_user)):
-    """Logout user (client should discard token)."""
+async def logout(current_user: dict = Depends(get_current_active_user),
+                 token: str = Depends(oauth2_scheme)):
+    """Logout user; the token is rejected from now on, until it expires."""
+    from jose import jwt
+    user_cache.revoke_token(token, jwt.get_unverified_claims(token).get("exp"))
     return {"message": "Successfully logged out"}
 
 
 @router.get("/users/count")
 async def get_user_count():
     """Get total user count."""
-    return {"total_users": get_all_users_count()}
+    return {"total_users": await get_all_users_count()}
@@ -1,38 +1,29 @@
 """Domain/benchmark API routes."""
 import json
-from pathlib import Path
-from fastapi import APIRouter
+from fastapi import APIRouter, Query
 
 from ..models import BenchmarksResponse, BenchmarkInfo
+from ...benchmark_index import get_benchmark_index
 
 router = APIRouter(prefix="/api/v1", tags=["domains"])
 
-# Path to benchmarks directory
-BENCHMARKS_DIR = Path(__file__).parent.parent.parent.parent / "benchmarks"
+# Largest generated problem served by the API
+MAX_GENERATED_SIZE = 100
 
 
 @router.get("/benchmarks", response_model=BenchmarksResponse)
 async def list_benchmarks():
     """
-    List available benchmarks.
+    List available benchmarks (indexed once, served from memory).
     """
-    benchmarks = []
-    
-    if BENCHMARKS_DIR.exists():
-        # Scan for domain files
-        for domain_file in sorted(BENCHMARKS_DIR.glob("*/domain.pddl")):
-            domain_name = domain_file.parent.name
-            
-            # Find problems in this domain
-            problem_files = sorted(domain_file.parent.glob("problem*.pddl"))
-            
-            for problem_file in problem_files:
-                problem_name = problem_file.stem
-                benchmarks.append(BenchmarkInfo(
-                    name=problem_name,
-                    domain=domain_name,
-                    description=f"{domain_name} - {problem_name}"
-                ))
+    benchmarks = [
+        BenchmarkInfo(
+            name=benchmark.name,
+            domain=benchmark.domain,
+            description=f"{benchmark.domain} - {benchmark.name}"
+        )
+        for benchmark in get_benchmark_index().benchmarks()
+    ]
     
     return BenchmarksResponse(benchmarks=benchmarks)
 
@@ -42,19 +33,38 @@ async def get_benchmark(domain_name: str, problem_name: str):
     """
     Get a specific benchmark's PDDL files.
     """
-    domain_path = BENCHMARKS_DIR / domain_name / "domain.pddl"
-    problem_path = BENCHMARKS_DIR / domain_name / f"{problem_name}.pddl"
-    
-    if not domain_path.exists():
+    index = get_benchmark_index()
+    if not index.has_domain(domain_name):
         return {"error": f"Domain '{domain_name}' not found"}
     
-    if not problem_path.exists():
-        # Try with problem prefix
-        problem_path = BENCHMARKS_DIR / domain_name / f"problem-{problem_name}.pddl"
-        if not problem_path.exists():
-            return {"error": f"Problem '{problem_name}' not found in domain '{domain_name}'"}
+    # Also accepts the name without its "problem-" prefix
+    benchmark = index.get(domain_name, problem_name)
+    if benchmark is None:
+        return {"error": f"Problem '{problem_name}' not found in domain '{domain_name}'"}
+    
+    return {
+        "domain": benchmark.domain_pddl,
+        "problem": benchmark.problem_pddl
+    }
+
+
+@router.get("/generate/{domain_name}")
+async def generate_problem(domain_name: str,
+                           size: int = Query(..., ge=1, le=MAX_GENERATED_SIZE),
+                           seed: int = Query(0, ge=0)):
+    """
+    Generate a problem of the given size for a benchmark domain.
+    The same size and seed always give the same problem.
+    """
+    # The bench package pulls in every search algorithm; import on first use
+    from ...bench.generators import GENERATORS, generate
+    if domain_name not in GENERATORS:
+        return {"error": f"No generator for domain '{domain_name}'",
+                "domains": sorted(GENERATORS)}
     
+    problem = generate(domain_name, size, seed)
     return {
-        "domain": domain_path.read_text(),
-        "problem": problem_path.read_text()
+        "name": problem.name,
+        "domain": problem.domain_path.read_text(),
+        "problem": problem.problem_text
     }
@@ -1,125 +1,153 @@
 """Planner API routes."""
 import asyncio
+import threading
+import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from fastapi import APIRouter, HTTPException
-from typing import Literal, List
-
-from ..models import PlanRequest, PlanResponse, ActionResult, SearchMetrics, SearchTree, SearchTreeNode, SearchTreeEdge
-from ...parser.domain_parser import DomainParser
-from ...parser.problem_parser import ProblemParser
-from ...grounding.grounder import Grounder
-from ...search.algorithms.bfs import BFS
-from ...search.algorithms.astar import AStar
-from ...search.algorithms.greedy import GreedyBestFirst
-from ...search.heuristics.goal_count import GoalCountHeuristic
-from ...search.heuristics.h_add import HAddHeuristic
-from ...search.heuristics.h_max import HMaxHeuristic
+from contextlib import contextmanager, nullcontext
+from functools import partial
+from pathlib import Path
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import FileResponse
+from typing import Literal, List, Optional
+
+from ...config import get_settings
+from ...instrumentation import PhaseTimer
+from ...profiling import PROFILERS, Profile, artifact_name, problem_hash
+from ... import metrics
+from ..models import PlanRequest, PlanResponse, ActionResult, SearchMetrics, SearchTree, SearchTreeNode, SearchTreeEdge, ProfileInfo
+from .auth import get_current_admin_user, get_optional_user, is_admin
+
+# The parser, grounder, search algorithms and heuristics are imported inside
+# the functions that use them, so starting the app does not load them.
 
 router = APIRouter(prefix="/api/v1", tags=["planner"])
 
 # Thread pool for parallel search
-_executor = ThreadPoolExecutor(max_workers=4)
+_EXECUTOR_WORKERS = 4
+_executor = ThreadPoolExecutor(max_workers=_EXECUTOR_WORKERS)
+metrics.WORKERS.set(_EXECUTOR_WORKERS)
+
+# Threads running /plan requests, so a search never blocks the event loop
+_PLAN_WORKERS = 8
+_plan_executor = ThreadPoolExecutor(max_workers=_PLAN_WORKERS, thread_name_prefix="planlab-plan")
+
+# HDA* searches running at once; each starts up to hda_max_workers processes
+_hda_slots = threading.BoundedSemaphore(get_settings().hda_max_searches)
 
 
 @router.post("/plan", response_model=PlanResponse)
-async def plan(request: PlanRequest):
+async def plan(request: PlanRequest, current_user: Optional[dict] = Depends(get_optional_user)):
     """
     Generate a plan for the given domain and problem.
+    With `instrument`, the metrics include per-phase timings. With `profile`
+    (administrators only), the run is profiled and the artifact stored.
     """
+    if request.profile:
+        if not is_admin(current_user):
+            raise HTTPException(status_code=403, detail="Profiling requires administrator access")
+        if request.profiler not in PROFILERS:
+            raise HTTPException(status_code=400, detail=f"Unknown profiler: {request.profiler}")
+    return await asyncio.get_running_loop().run_in_executor(_plan_executor, partial(_plan, request))
+
+
+def _plan(request: PlanRequest) -> PlanResponse:
+    """Parse, ground and search for /plan; blocking, run on the plan threads."""
+    from ...task_cache import get_task_cache
+    from ...search.algorithms.bfs import BFS
+    from ...search.algorithms.astar import AStar
+    from ...search.algorithms.greedy import GreedyBestFirst
+    from ...search.algorithms.hda_star import HDAStar
+    
+    timer = PhaseTimer(enabled=request.instrument)
+    profile = Profile(request.profiler) if request.profile else nullcontext()
     try:
-        # Parse domain
-        domain_parser = DomainParser()
-        domain = domain_parser.parse(request.domain_pddl)
-        
-        # Parse problem
-        problem_parser = ProblemParser()
-        problem = problem_parser.parse(request.problem_pddl)
-        
-        # Ground the task
-        grounder = Grounder(domain, problem)
-        task = grounder.ground_task()
-        
-        # Select algorithm
-        if request.algorithm == "bfs":
-            algorithm = BFS(task, timeout=request.timeout)
-        elif request.algorithm == "astar":
-            heuristic = _get_heuristic(request.heuristic, task)
-            algorithm = AStar(task, timeout=request.timeout, heuristic=heuristic)
-        elif request.algorithm == "greedy":
-            heuristic = _get_heuristic(request.heuristic, task)
-            algorithm = GreedyBestFirst(task, timeout=request.timeout, heuristic=heuristic)
-        else:
-            raise HTTPException(status_code=400, detail=f"Unknown algorithm: {request.algorithm}")
-        
-        # Run search
-        result = algorithm.search()
+        with profile:
+            # Parse and ground, unless the same problem was grounded before
+            task = get_task_cache().get_or_ground(request.domain_pddl, request.problem_pddl, timer)
+            
+            # Select algorithm; heuristic construction includes any precomputation
+            with timer.phase("heuristic_setup"):
+                if request.algorithm == "bfs":
+                    algorithm = BFS(task, timeout=request.timeout)
+                elif request.algorithm == "astar":
+                    heuristic = _get_heuristic(request.heuristic, task)
+                    algorithm = AStar(task, timeout=request.timeout, heuristic=heuristic,
+                                      open_list=request.open_list, tie_breaking=request.tie_breaking)
+                elif request.algorithm == "greedy":
+                    heuristic = _get_heuristic(request.heuristic, task)
+                    algorithm = GreedyBestFirst(task, timeout=request.timeout, heuristic=heuristic,
+                                                open_list=request.open_list,
+                                                tie_breaking=request.tie_breaking)
+                elif request.algorithm == "hda_star":
+                    heuristic = _get_heuristic(request.heuristic, task)
+                    algorithm = HDAStar(task, timeout=request.timeout, heuristic=heuristic,
+                                        workers=min(request.workers, get_settings().hda_max_workers))
+                else:
+                    raise HTTPException(status_code=400, detail=f"Unknown algorithm: {request.algorithm}")
+                if request.instrument and hasattr(algorithm, "heuristic"):
+                    algorithm.heuristic.timing = True
+            
+            # Run search
+            slot = _hda_slot() if request.algorithm == "hda_star" else nullcontext()
+            with slot, timer.phase("search"):
+                heuristic_name = request.heuristic if request.algorithm != "bfs" else "none"
+                result = _search(algorithm, request.algorithm, heuristic_name)
+        # Heuristic time is part of the search phase
+        timer.add("heuristic", result.heuristic_time_ms / 1000, result.heuristic_evaluations)
+        profile_info = _save_profile(profile, request, heuristic_name) if request.profile else None
         
         if not result.success:
-            # Handle infinity values for JSON serialization
-            initial_h = result.initial_h if result.initial_h != float('inf') else 999999.0
-            final_h = result.final_h if result.final_h != float('inf') else 999999.0
-            
+            with timer.phase("serialize"):
+                search_tree = _convert_search_tree(result.search_tree) if result.search_tree else None
             return PlanResponse(
                 success=False,
                 error_message=result.error_message,
-                metrics=SearchMetrics(
-                    nodes_expanded=result.nodes_expanded,
-                    nodes_generated=result.nodes_generated,
-                    plan_length=0,
-                    search_time_ms=result.search_time_ms,
-                    initial_h=initial_h,
-                    final_h=final_h
-                ) if result.nodes_expanded > 0 else None,
-                search_tree=_convert_search_tree(result.search_tree) if result.search_tree else None
+                metrics=_build_metrics(result, 0, timer) if result.nodes_expanded > 0 else None,
+                search_tree=search_tree,
+                profile=profile_info
             )
         
         # Convert plan to response format
-        plan_actions = []
-        for action in result.plan:
-            plan_actions.append(ActionResult(
-                action=action.name,
-                preconditions=list(action.preconditions),
-                effects_add=list(action.add_effects),
-                effects_del=list(action.del_effects)
-            ))
-        
-        # Handle infinity values for JSON serialization
-        initial_h = result.initial_h if result.initial_h != float('inf') else 999999.0
-        final_h = result.final_h if result.final_h != float('inf') else 999999.0
+        with timer.phase("serialize"):
+            plan_actions = _convert_plan(result.plan)
+            search_tree = _convert_search_tree(result.search_tree) if result.search_tree else None
         
         return PlanResponse(
             success=True,
             plan=plan_actions,
-            metrics=SearchMetrics(
-                nodes_expanded=result.nodes_expanded,
-                nodes_generated=result.nodes_generated,
-                plan_length=result.plan_length,
-                search_time_ms=result.search_time_ms,
-                initial_h=initial_h,
-                final_h=final_h
-            ),
-            search_tree=_convert_search_tree(result.search_tree) if result.search_tree else None
+            metrics=_build_metrics(result, result.plan_length, timer),
+            search_tree=search_tree,
+            profile=profile_info
         )
         
+    except HTTPException:
+        raise
+    except ValueError as e:
+        # Invalid PDDL, or an option combination the algorithm rejects
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/profiles/{artifact}")
+async def get_profile(artifact: str, current_user: dict = Depends(get_current_admin_user)):
+    """Download a stored profile artifact (administrators only)."""
+    profile_dir = Path(get_settings().profile_dir)
+    path = profile_dir / artifact
+    if path.parent != profile_dir or not path.is_file():
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, filename=artifact)
+
+
 @router.post("/plan-parallel", response_model=PlanResponse)
 async def plan_parallel(request: PlanRequest):
     """
     Run multiple algorithms in parallel and return the best result.
     """
+    from ...task_cache import get_task_cache
     try:
-        # Parse domain and problem once
-        domain_parser = DomainParser()
-        domain = domain_parser.parse(request.domain_pddl)
-        
-        problem_parser = ProblemParser()
-        problem = problem_parser.parse(request.problem_pddl)
-        
-        grounder = Grounder(domain, problem)
-        task = grounder.ground_task()
+        # Parse and ground once, shared by all searches
+        task = get_task_cache().get_or_ground(request.domain_pddl, request.problem_pddl)
         
         # Define algorithms to run in parallel
         configs = [
@@ -132,7 +160,8 @@ async def plan_parallel(request: PlanRequest):
         # Run searches in parallel
         futures = []
         for algo, heur in configs:
-            future = _executor.submit(_run_search, task, algo, heur, request.timeout)
+            metrics.QUEUE_DEPTH.inc()
+            future = _executor.submit(_run_queued_search, task, algo, heur, request.timeout)
             futures.append((algo, heur, future))
         
         # Collect results
@@ -158,38 +187,39 @@ async def plan_parallel(request: PlanRequest):
         best_algo, best_heur, best_result = min(results, key=lambda x: x[2].plan_length)
         
         # Convert to response
-        plan_actions = []
-        for action in best_result.plan:
-            plan_actions.append(ActionResult(
-                action=action.name,
-                preconditions=list(action.preconditions),
-                effects_add=list(action.add_effects),
-                effects_del=list(action.del_effects)
-            ))
-        
-        initial_h = best_result.initial_h if best_result.initial_h != float('inf') else 999999.0
-        final_h = best_result.final_h if best_result.final_h != float('inf') else 999999.0
-        
         return PlanResponse(
             success=True,
-            plan=plan_actions,
-            metrics=SearchMetrics(
-                nodes_expanded=best_result.nodes_expanded,
-                nodes_generated=best_result.nodes_generated,
-                plan_length=best_result.plan_length,
-                search_time_ms=best_result.search_time_ms,
-                initial_h=initial_h,
-                final_h=final_h
-            ),
+            plan=_convert_plan(best_result.plan),
+            metrics=_build_metrics(best_result, best_result.plan_length),
             search_tree=_convert_search_tree(best_result.search_tree) if best_result.search_tree else None
         )
         
+    except HTTPException:
+        raise
+    except ValueError as e:
+        # Invalid PDDL, or an option combination the algorithm rejects
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _run_queued_search(task, algorithm: str, heuristic: str, timeout: float):
+    """Run a search submitted to the thread pool, tracking queue and worker use."""
+    metrics.QUEUE_DEPTH.dec()
+    metrics.WORKERS_BUSY.inc()
+    try:
+        return _run_search(task, algorithm, heuristic, timeout)
+    finally:
+        metrics.WORKERS_BUSY.dec()
+
+
 def _run_search(task, algorithm: str, heuristic: str, timeout: float):
     """Run a single search algorithm."""
+    from ...search.algorithms.bfs import BFS
+    from ...search.algorithms.astar import AStar
+    from ...search.algorithms.greedy import GreedyBestFirst
+    from ...search.algorithms.hda_star import HDAStar
+    
     if algorithm == "bfs":
         algo = BFS(task, timeout=timeout)
     elif algorithm == "astar":
@@ -198,22 +228,140 @@ def _run_search(task, algorithm: str, heuristic: str, timeout: float):
     elif algorithm == "greedy":
         heur = _get_heuristic(heuristic, task)
         algo = GreedyBestFirst(task, timeout=timeout, heuristic=heur)
+    elif algorithm == "hda_star":
+        heur = _get_heuristic(heuristic, task)
+        algo = HDAStar(task, timeout=timeout, heuristic=heur, workers=get_settings().hda_max_workers)
+        with _hda_slot():
+            return _search(algo, algorithm, heuristic)
     else:
         raise ValueError(f"Unknown algorithm: {algorithm}")
     
-    return algo.search()
+    return _search(algo, algorithm, heuristic or "none")
+
+
+@contextmanager
+def _hda_slot():
+    """Admission control for HDA* worker processes; 503 when every slot is taken."""
+    if not _hda_slots.acquire(blocking=False):
+        raise HTTPException(
+            status_code=503,
+            detail="Too many parallel searches in progress, please retry",
+            headers={"Retry-After": "1"},
+        )
+    try:
+        yield
+    finally:
+        _hda_slots.release()
+
+
+def _search(algorithm, algorithm_name: str, heuristic_name: str):
+    """Run a search and record it in the service metrics."""
+    metrics.SEARCHES_IN_PROGRESS.inc()
+    start = time.perf_counter()
+    try:
+        result = algorithm.search()
+    except Exception:
+        metrics.SEARCHES.inc(algorithm=algorithm_name, heuristic=heuristic_name, outcome="error")
+        raise
+    finally:
+        metrics.SEARCHES_IN_PROGRESS.dec()
+    
+    elapsed = time.perf_counter() - start
+    if result.success:
+        outcome = "solved"
+    elif result.error_message == "Search timeout":
+        outcome = "timeout"
+    else:
+        outcome = "unsolved"
+    metrics.SEARCHES.inc(algorithm=algorithm_name, heuristic=heuristic_name, outcome=outcome)
+    metrics.SEARCH_LATENCY.observe(elapsed, algorithm=algorithm_name, heuristic=heuristic_name)
+    metrics.NODES_EXPANDED.inc(result.nodes_expanded, algorithm=algorithm_name)
+    if elapsed > 0:
+        metrics.EXPANSION_RATE.observe(result.nodes_expanded / elapsed, algorithm=algorithm_name)
+    metrics.CACHE_HITS.inc(result.cache_hits, cache="heuristic")
+    metrics.CACHE_MISSES.inc(result.cache_misses, cache="heuristic")
+    return result
 
 
 def _get_heuristic(name: str, task):
-    """Get heuristic by name."""
+    """Get heuristic by name, with the configured value cache."""
+    from ...search.heuristics.goal_count import GoalCountHeuristic
+    from ...search.heuristics.h_add import HAddHeuristic
+    from ...search.heuristics.h_max import HMaxHeuristic
+    from ...search.heuristics.lm_cut import LMCutHeuristic
+    from ...search.heuristics.lm_count import LandmarkCountHeuristic
+    from ...search.heuristics.pdb import CanonicalPDBHeuristic
+    
+    settings = get_settings()
     if name == "goal_count":
-        return GoalCountHeuristic(task)
+        heuristic = GoalCountHeuristic(task)
     elif name == "h_add":
-        return HAddHeuristic(task)
+        heuristic = HAddHeuristic(task)
     elif name == "h_max":
-        return HMaxHeuristic(task)
+        heuristic = HMaxHeuristic(task)
+    elif name == "lm_cut":
+        heuristic = LMCutHeuristic(task)
+    elif name == "lm_count":
+        heuristic = LandmarkCountHeuristic(task)
+    elif name == "lm_count_admissible":
+        heuristic = LandmarkCountHeuristic(task, admissible=True)
+    elif name == "pdb":
+        heuristic = CanonicalPDBHeuristic(task, cache_dir=settings.pdb_cache_dir,
+                                          cache_max_bytes=settings.pdb_cache_max_bytes)
     else:
-        return GoalCountHeuristic(task)
+        heuristic = GoalCountHeuristic(task)
+    heuristic.set_cache(settings.heuristic_cache_size, settings.heuristic_cache_policy)
+    return heuristic
+
+
+def _convert_plan(plan) -> List[ActionResult]:
+    """Convert plan actions to response format."""
+    return [
+        ActionResult(
+            action=action.name,
+            preconditions=list(action.preconditions),
+            effects_add=list(action.add_effects),
+            effects_del=list(action.del_effects)
+        )
+        for action in plan
+    ]
+
+
+def _save_profile(profile: Profile, request: PlanRequest, heuristic_name: str) -> ProfileInfo:
+    """Store a request's profile, tagged with its algorithm, heuristic and problem hash."""
+    digest = problem_hash(request.domain_pddl, request.problem_pddl)
+    name = artifact_name(request.algorithm, heuristic_name, digest, request.profiler)
+    profile.save(Path(get_settings().profile_dir) / name)
+    return ProfileInfo(
+        artifact=name,
+        profiler=request.profiler,
+        problem_hash=digest,
+        summary=profile.summary()
+    )
+
+
+def _build_metrics(result, plan_length: int, timer: PhaseTimer | None = None) -> SearchMetrics:
+    """Search metrics of a result, with phase timings from an enabled timer."""
+    # Handle infinity values for JSON serialization
+    initial_h = result.initial_h if result.initial_h != float('inf') else 999999.0
+    final_h = result.final_h if result.final_h != float('inf') else 999999.0
+    seconds = result.search_time_ms / 1000
+    return SearchMetrics(
+        nodes_expanded=result.nodes_expanded,
+        nodes_generated=result.nodes_generated,
+        plan_length=plan_length,
+        search_time_ms=result.search_time_ms,
+        heuristic_calls=result.heuristic_calls,
+        initial_h=initial_h,
+        final_h=final_h,
+        cache_hits=result.cache_hits,
+        cache_misses=result.cache_misses,
+        cache_hit_rate=result.cache_hit_rate,
+        states_per_second=result.nodes_expanded / seconds if seconds > 0 else 0.0,
+        peak_open=result.peak_open,
+        peak_states=result.peak_states,
+        phases=timer.report() if timer is not None and timer.enabled else None
+    )
 
 
 def _convert_search_tree(tree_data: dict) -> SearchTree:
@@ -3,12 +3,11 @@ from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
 
-from ...database import (
+from ...async_db import (
     get_user_progress, update_lesson_progress, get_completed_lessons_count,
-    get_user_statistics, increment_plans_generated, increment_problems_solved,
-    log_algorithm_usage, get_algorithm_usage_history, get_most_used_algorithm,
-    update_favorite_algorithm
+    get_user_statistics, get_algorithm_usage_history
 )
+from ...usage_buffer import usage_buffer
 from .auth import get_current_active_user
 
 router = APIRouter(prefix="/api/v1/progress", tags=["progress"])
@@ -40,7 +39,7 @@ class UserStatsResponse(BaseModel):
 @router.get("/lessons", response_model=List[dict])
 async def get_lessons_progress(current_user: dict = Depends(get_current_active_user)):
     """Get all lesson progress for current user."""
-    return get_user_progress(current_user['username'])
+    return await get_user_progress(current_user['username'])
 
 
 @router.post("/lessons/{lesson_id}")
@@ -50,7 +49,7 @@ async def update_lesson(
     current_user: dict = Depends(get_current_active_user)
 ):
     """Update lesson progress."""
-    update_lesson_progress(
+    await update_lesson_progress(
         current_user['username'],
         lesson_id,
         progress.completed,
@@ -62,8 +61,9 @@ async def update_lesson(
 @router.get("/stats", response_model=UserStatsResponse)
 async def get_statistics(current_user: dict = Depends(get_current_active_user)):
     """Get user statistics."""
-    stats = get_user_statistics(current_user['username'])
-    completed = get_completed_lessons_count(current_user['username'])
+    await usage_buffer.try_flush()
+    stats = await get_user_statistics(current_user['username'])
+    completed = await get_completed_lessons_count(current_user['username'])
     
     if not stats:
         raise HTTPException(status_code=404, detail="Statistics not found")
@@ -81,7 +81,8 @@ async def get_statistics(current_user: dict = Depends(get_current_active_user)):
 @router.post("/plan-generated")
 async def track_plan_generated(current_user: dict = Depends(get_current_active_user)):
     """Track that user generated a plan."""
-    increment_plans_generated(current_user['username'])
+    usage_buffer.plan_generated(current_user['username'])
+    await usage_buffer.flush_if_full()
     return {"message": "Tracked"}
 
 
@@ -91,7 +92,8 @@ async def track_problem_solved(
     current_user: dict = Depends(get_current_active_user)
 ):
     """Track that user solved a problem."""
-    increment_problems_solved(current_user['username'], nodes_expanded)
+    usage_buffer.problem_solved(current_user['username'], nodes_expanded)
+    await usage_buffer.flush_if_full()
     return {"message": "Tracked"}
 
 
@@ -100,8 +102,8 @@ async def track_algorithm_usage(
     usage: AlgorithmUsage,
     current_user: dict = Depends(get_current_active_user)
 ):
-    """Log algorithm usage."""
-    log_algorithm_usage(
+    """Log algorithm usage (written behind; favorite algorithm follows on flush)."""
+    usage_buffer.log_usage(
         current_user['username'],
         usage.algorithm,
         usage.heuristic,
@@ -110,11 +112,7 @@ async def track_algorithm_usage(
         usage.plan_length,
         usage.search_time_ms
     )
-    
-    # Update favorite algorithm
-    most_used = get_most_used_algorithm(current_user['username'])
-    if most_used:
-        update_favorite_algorithm(current_user['username'], most_used)
+    await usage_buffer.flush_if_full()
     
     return {"message": "Usage logged"}
 
@@ -125,4 +123,5 @@ async def get_algorithm_history(
     current_user: dict = Depends(get_current_active_user)
 ):
     """Get recent algorithm usage history."""
-    return get_algorithm_usage_history(current_user['username'], limit)
+    await usage_buffer.try_flush()
+    return await get_algorithm_usage_history(current_user['username'], limit)
@@ -1,12 +1,17 @@
 """User projects API routes."""
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException
+import base64
+import binascii
+import hashlib
+import json
+from typing import List, Optional, Union
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from pydantic import BaseModel
 import uuid
 
-from ...database import (
-    create_project, get_user_projects, get_project, update_project, 
-    delete_project, share_project, get_shared_project
+from ...async_db import (
+    create_project, get_user_projects_page, get_project, get_project_summary,
+    update_project, delete_project, share_project, get_shared_project,
+    get_project_versions, get_project_version, get_blob_contents
 )
 from .auth import get_current_active_user
 
@@ -25,38 +30,132 @@ class ProjectUpdate(BaseModel):
     project_name: Optional[str] = None
 
 
-class ProjectResponse(BaseModel):
+class ProjectSummary(BaseModel):
+    """Project listing entry without the PDDL content."""
     id: int
     project_name: str
     project_type: str
     folder_path: str
-    content: str
     is_shared: bool
     share_id: Optional[str]
+    content_hash: Optional[str] = None  # sha256 of the content; changes with every edit
     created_at: str
     updated_at: str
 
 
-@router.get("/", response_model=List[ProjectResponse])
+class ProjectResponse(ProjectSummary):
+    content: str
+
+
+class ProjectVersion(BaseModel):
+    """A previous content of a project."""
+    id: int
+    project_name: Optional[str]
+    content_hash: str
+    size: int
+    created_at: str
+
+
+class ProjectVersionContent(ProjectVersion):
+    content: str
+
+
+MAX_PAGE_SIZE = 200
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+# Fields that change when a project does; its content is covered by content_hash
+ETAG_FIELDS = ('id', 'updated_at', 'content_hash', 'project_name', 'share_id')
+
+
+def _encode_cursor(project: dict) -> str:
+    """Opaque cursor pointing after a project in listing order."""
+    key = json.dumps([project['updated_at'], project['id']])
+    return base64.urlsafe_b64encode(key.encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple:
+    try:
+        updated_at, project_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (binascii.Error, ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return updated_at, project_id
+
+
+def _etag(projects: List[dict], *extra) -> str:
+    """Strong ETag of the served projects, from their ETAG_FIELDS only (never the content)."""
+    key = [[project[field] for field in ETAG_FIELDS] for project in projects]
+    digest = hashlib.sha256(json.dumps([key, *extra], default=str).encode())
+    return f'"{digest.hexdigest()[:32]}"'
+
+
+async def _with_contents(projects: List[dict]) -> List[dict]:
+    """
+    Add the content to project summary rows. Blobs are immutable, so loading
+    them by hash matches the rows the ETag describes. A blob collected since
+    the rows were read means its project changed: that project is read again,
+    and left out if it was deleted.
+    """
+    contents = await get_blob_contents([p['content_hash'] for p in projects])
+    result = []
+    for project in projects:
+        content = contents.get(project['content_hash'])
+        if content is not None:
+            result.append({**project, 'content': content})
+            continue
+        current = await get_project(project['id'])
+        if current and current['username'] == project['username'] and 'content' in current:
+            result.append(current)
+    return result
+
+
+def _not_modified(request: Request, etag: str) -> bool:
+    """Whether the client's If-None-Match already names this ETag."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    tags = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return "*" in tags or etag in tags
+
+
+@router.get("/", response_model=Union[List[ProjectResponse], List[ProjectSummary]])
 async def list_projects(
+    request: Request,
+    response: Response,
     folder_path: str = "",
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    summary: bool = False,
     current_user: dict = Depends(get_current_active_user)
 ):
-    """List all projects for current user."""
-    projects = get_user_projects(current_user['username'], folder_path)
+    """
+    List projects for current user, newest first.
+    
+    Without `limit` the whole folder is returned. With it, the cursor of the next
+    page is sent in the X-Next-Cursor header. `summary=true` leaves out the
+    content. Responses carry an ETag; a matching If-None-Match returns 304
+    without loading any content.
+    """
+    after = _decode_cursor(cursor) if cursor else None
+    # One extra row tells whether there is a next page
+    projects = await get_user_projects_page(
+        current_user['username'], folder_path,
+        limit + 1 if limit is not None else None, after, include_content=False
+    )
+    headers = {}
+    if limit is not None and len(projects) > limit:
+        projects = projects[:limit]
+        headers[NEXT_CURSOR_HEADER] = _encode_cursor(projects[-1])
+    
+    etag = _etag(projects, headers)
+    headers["ETag"] = etag
+    if _not_modified(request, etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    
+    if summary:
+        return [ProjectSummary(**{**p, 'is_shared': bool(p['is_shared'])}) for p in projects]
     return [
-        ProjectResponse(
-            id=p['id'],
-            project_name=p['project_name'],
-            project_type=p['project_type'],
-            folder_path=p['folder_path'],
-            content=p['content'],
-            is_shared=bool(p['is_shared']),
-            share_id=p['share_id'],
-            created_at=p['created_at'],
-            updated_at=p['updated_at']
-        )
-        for p in projects
+        ProjectResponse(**{**p, 'is_shared': bool(p['is_shared'])})
+        for p in await _with_contents(projects)
     ]
 
 
@@ -66,7 +165,7 @@ async def create_new_project(
     current_user: dict = Depends(get_current_active_user)
 ):
     """Create a new project."""
-    project_id = create_project(
+    project_id = await create_project(
         current_user['username'],
         project.project_name,
         project.project_type,
@@ -83,25 +182,25 @@ async def create_new_project(
 @router.get("/{project_id}", response_model=ProjectResponse)
 async def get_project_by_id(
     project_id: int,
+    request: Request,
+    response: Response,
     current_user: dict = Depends(get_current_active_user)
 ):
-    """Get a specific project."""
-    project = get_project(project_id)
+    """Get a specific project (304 when If-None-Match matches its ETag, without loading the content)."""
+    project = await get_project_summary(project_id)
     
     if not project or project['username'] != current_user['username']:
         raise HTTPException(status_code=404, detail="Project not found")
     
-    return ProjectResponse(
-        id=project['id'],
-        project_name=project['project_name'],
-        project_type=project['project_type'],
-        folder_path=project['folder_path'],
-        content=project['content'],
-        is_shared=bool(project['is_shared']),
-        share_id=project['share_id'],
-        created_at=project['created_at'],
-        updated_at=project['updated_at']
-    )
+    etag = _etag([project])
+    if _not_modified(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    
+    project = await _with_contents([project])
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+    return ProjectResponse(**{**project[0], 'is_shared': bool(project[0]['is_shared'])})
 
 
 @router.put("/{project_id}")
@@ -111,13 +210,13 @@ async def update_existing_project(
     current_user: dict = Depends(get_current_active_user)
 ):
     """Update a project."""
-    project = get_project(project_id)
+    project = await get_project(project_id)
     
     if not project or project['username'] != current_user['username']:
         raise HTTPException(status_code=404, detail="Project not found")
     
-    success = update_project(
-        project_id, 
+    success = await update_project(
+        project_id,
         update.content, 
         update.project_name
     )
@@ -134,12 +233,12 @@ async def delete_existing_project(
     current_user: dict = Depends(get_current_active_user)
 ):
     """Delete a project."""
-    project = get_project(project_id)
+    project = await get_project(project_id)
     
     if not project or project['username'] != current_user['username']:
         raise HTTPException(status_code=404, detail="Project not found")
     
-    success = delete_project(project_id)
+    success = await delete_project(project_id)
     
     if not success:
         raise HTTPException(status_code=400, detail="Failed to delete project")
@@ -147,19 +246,52 @@ async def delete_existing_project(
     return {"message": "Project deleted successfully"}
 
 
+@router.get("/{project_id}/versions", response_model=List[ProjectVersion])
+async def list_project_versions(
+    project_id: int,
+    current_user: dict = Depends(get_current_active_user)
+):
+    """List previous versions of a project, newest first."""
+    project = await get_project(project_id)
+    
+    if not project or project['username'] != current_user['username']:
+        raise HTTPException(status_code=404, detail="Project not found")
+    
+    return [ProjectVersion(**v) for v in await get_project_versions(project_id)]
+
+
+@router.get("/{project_id}/versions/{version_id}", response_model=ProjectVersionContent)
+async def get_project_version_by_id(
+    project_id: int,
+    version_id: int,
+    current_user: dict = Depends(get_current_active_user)
+):
+    """Get the content of a previous version of a project."""
+    project = await get_project(project_id)
+    
+    if not project or project['username'] != current_user['username']:
+        raise HTTPException(status_code=404, detail="Project not found")
+    
+    version = await get_project_version(project_id, version_id)
+    if not version:
+        raise HTTPException(status_code=404, detail="Version not found")
+    
+    return ProjectVersionContent(**version)
+
+
 @router.post("/{project_id}/share")
 async def share_existing_project(
     project_id: int,
     current_user: dict = Depends(get_current_active_user)
 ):
     """Generate a share link for a project."""
-    project = get_project(project_id)
+    project = await get_project(project_id)
     
     if not project or project['username'] != current_user['username']:
         raise HTTPException(status_code=404, detail="Project not found")
     
     share_id = str(uuid.uuid4())[:8]
-    success = share_project(project_id, share_id)
+    success = await share_project(project_id, share_id)
     
     if not success:
         raise HTTPException(status_code=400, detail="Failed to share project")
@@ -170,19 +302,9 @@ async def share_existing_project(
 @router.get("/shared/{share_id}", response_model=ProjectResponse)
 async def get_shared_project_by_id(share_id: str):
     """Get a shared project by share ID (public access)."""
-    project = get_shared_project(share_id)
+    project = await get_shared_project(share_id)
     
     if not project:
         raise HTTPException(status_code=404, detail="Shared project not found")
     
-    return ProjectResponse(
-        id=project['id'],
-        project_name=project['project_name'],
-        project_type=project['project_type'],
-        folder_path=project['folder_path'],
-        content=project['content'],
-        is_shared=bool(project['is_shared']),
-        share_id=project['share_id'],
-        created_at=project['created_at'],
-        updated_at=project['updated_at']
-    )
+    return ProjectResponse(**{**project, 'is_shared': bool(project['is_shared'])})
@@ -2,10 +2,6 @@
 from fastapi import APIRouter, HTTPException
 
 from ..models import ValidationRequest, ValidationResponse, ValidationStep
-from ...parser.domain_parser import DomainParser
-from ...parser.problem_parser import ProblemParser
-from ...grounding.grounder import Grounder
-from ...validator.plan_validator import PlanValidator
 
 router = APIRouter(prefix="/api/v1", tags=["validation"])
 
@@ -15,18 +11,12 @@ async def validate(request: ValidationRequest):
     """
     Validate a plan against domain and problem.
     """
+    # The planning stack is imported on first use to keep startup fast
+    from ...task_cache import get_task_cache
+    from ...validator.plan_validator import PlanValidator
     try:
-        # Parse domain
-        domain_parser = DomainParser()
-        domain = domain_parser.parse(request.domain_pddl)
-        
-        # Parse problem
-        problem_parser = ProblemParser()
-        problem = problem_parser.parse(request.problem_pddl)
-        
-        # Ground the task
-        grounder = Grounder(domain, problem)
-        task = grounder.ground_task()
+        # Parse and ground, unless the same problem was grounded before
+        task = get_task_cache().get_or_ground(request.domain_pddl, request.problem_pddl)
         
         # Find actions by name
         plan = []
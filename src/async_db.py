@@ -0,0 +1,93 @@
+"""
+Async access to the SQLite database for the API routes.
+
+Every function in `database` is blocking. Its async counterpart here runs it
+on a dedicated executor and awaits the result, so handlers yield to the event
+loop while SQLite works:
+
+    writes  one writer thread; its queue orders writes, and SQLite only
+            allows one writer at a time anyway
+    reads   READ_WORKERS threads; under WAL they run alongside the writer
+
+Each executor thread keeps its own pooled connection (see
+database.get_connection).
+"""
+from __future__ import annotations
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial, wraps
+from typing import Callable
+
+from . import database
+
+READ_WORKERS = 4
+
+_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="planlab-db-write")
+_readers = ThreadPoolExecutor(max_workers=READ_WORKERS, thread_name_prefix="planlab-db-read")
+
+
+async def run_read(func: Callable, *args, **kwargs):
+    """Run a blocking read on the reader threads."""
+    return await asyncio.get_running_loop().run_in_executor(_readers, partial(func, *args, **kwargs))
+
+
+async def run_write(func: Callable, *args, **kwargs):
+    """Queue a blocking write on the writer thread."""
+    return await asyncio.get_running_loop().run_in_executor(_writer, partial(func, *args, **kwargs))
+
+
+def _read(func: Callable) -> Callable:
+    @wraps(func)
+    async def wrapper(*args, **kwargs):
+        return await run_read(func, *args, **kwargs)
+    return wrapper
+
+
+def _write(func: Callable) -> Callable:
+    @wraps(func)
+    async def wrapper(*args, **kwargs):
+        return await run_write(func, *args, **kwargs)
+    return wrapper
+
+
+# Users
+get_user = _read(database.get_user)
+get_user_by_email = _read(database.get_user_by_email)
+get_all_users_count = _read(database.get_all_users_count)
+create_user = _write(database.create_user)
+update_last_login = _write(database.update_last_login)
+update_user = _write(database.update_user)
+delete_user = _write(database.delete_user)
+
+# Progress
+get_user_progress = _read(database.get_user_progress)
+get_completed_lessons_count = _read(database.get_completed_lessons_count)
+update_lesson_progress = _write(database.update_lesson_progress)
+
+# Statistics and algorithm usage
+get_user_statistics = _read(database.get_user_statistics)
+get_algorithm_usage_history = _read(database.get_algorithm_usage_history)
+get_most_used_algorithm = _read(database.get_most_used_algorithm)
+increment_plans_generated = _write(database.increment_plans_generated)
+increment_problems_solved = _write(database.increment_problems_solved)
+update_favorite_algorithm = _write(database.update_favorite_algorithm)
+log_algorithm_usage = _write(database.log_algorithm_usage)
+apply_usage_batch = _write(database.apply_usage_batch)
+
+# Projects
+get_user_projects = _read(database.get_user_projects)
+get_user_projects_page = _read(database.get_user_projects_page)
+get_project = _read(database.get_project)
+get_project_summary = _read(database.get_project_summary)
+get_shared_project = _read(database.get_shared_project)
+create_project = _write(database.create_project)
+update_project = _write(database.update_project)
+delete_project = _write(database.delete_project)
+share_project = _write(database.share_project)
+get_project_versions = _read(database.get_project_versions)
+get_project_version = _read(database.get_project_version)
+get_blob_contents = _read(database.get_blob_contents)
+collect_garbage_blobs = _write(database.collect_garbage_blobs)
+
+# Schema
+get_schema_version = _read(database.get_schema_version)
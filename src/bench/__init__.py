@@ -0,0 +1,9 @@
+"""Benchmark suite runner with history and regression tracking."""
+from .runner import BenchmarkProblem, RunResult, discover, matrix, run_config, run_suite
+from .history import Regression, append_history, compare, load_baseline, save_baseline
+from .generators import GENERATORS, generate
+from .scaling import ScalingPoint, scaling_curves
+
+__all__ = ["BenchmarkProblem", "RunResult", "discover", "matrix", "run_config", "run_suite",
+           "Regression", "append_history", "compare", "load_baseline", "save_baseline",
+           "GENERATORS", "generate", "ScalingPoint", "scaling_curves"]
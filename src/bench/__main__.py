@@ -0,0 +1,141 @@
+"""
+Command line entry point: python -m src.bench
+
+Runs the benchmark matrix, appends the results to the history files and
+compares them with the stored baseline. Exits with status 1 if any
+regression is found, so the command can gate CI.
+
+With --generate, the problems come from the seeded generators instead of
+benchmarks/, and a scaling report (time and memory against size) is
+printed and written to <output-dir>/scaling.csv.
+"""
+import argparse
+import sys
+from pathlib import Path
+
+from .runner import ALGORITHMS, HEURISTICS, discover, matrix, run_suite
+from .generators import GENERATORS, generate
+from .scaling import format_scaling, scaling_curves, write_scaling_csv
+from ..profiling import PROFILERS
+from .history import (
+    BASELINE_JSON, DEFAULT_OUTPUT_DIR, append_history, compare, load_baseline,
+    make_run_record, save_baseline,
+)
+
+
+def _list(value: str):
+    return [item for item in value.split(",") if item]
+
+
+def _int_list(value: str):
+    return [int(item) for item in _list(value)]
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m src.bench", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--algorithms", type=_list, default=["bfs", "astar", "greedy"],
+                        help=f"Comma-separated algorithms ({', '.join(ALGORITHMS)})")
+    parser.add_argument("--heuristics", type=_list, default=["goal_count", "h_add", "h_max"],
+                        help=f"Comma-separated heuristics ({', '.join(HEURISTICS)})")
+    parser.add_argument("--domains", type=_list, default=None,
+                        help="Comma-separated benchmark domains (default: all)")
+    parser.add_argument("--generate", type=_list, default=None, metavar="DOMAINS",
+                        help=f"Generate problems for these domains ({', '.join(GENERATORS)}) "
+                             "instead of using benchmarks/")
+    parser.add_argument("--sizes", type=_int_list, default=[2, 4, 6, 8],
+                        help="Problem sizes for --generate (default 2,4,6,8)")
+    parser.add_argument("--seeds", type=_int_list, default=[0],
+                        help="Generator seeds for --generate (default 0)")
+    parser.add_argument("--repetitions", type=int, default=3, help="Timed runs per configuration")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Search timeout in seconds")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the traced peak memory run")
+    parser.add_argument("--profile", choices=PROFILERS, default=None,
+                        help="Profile an extra run per configuration; artifacts go to <output-dir>/profiles")
+    parser.add_argument("--output-dir", type=Path, default=DEFAULT_OUTPUT_DIR,
+                        help="Directory for history.json, history.csv and baseline.json")
+    parser.add_argument("--baseline", type=Path, default=None,
+                        help="Baseline to compare with (default: <output-dir>/baseline.json)")
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the baseline")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="Relative slowdown reported as a regression (default 0.2 = 20%%)")
+    parser.add_argument("--no-history", action="store_true", help="Do not append to the history files")
+    return parser.parse_args(argv)
+
+
+def _print_result(result) -> None:
+    status = "ok" if result.valid else ("INVALID" if result.success else "FAIL")
+    memory = f"{result.peak_memory_kb:9.0f}KB" if result.peak_memory_kb is not None else ""
+    print(f"{result.domain + '/' + result.problem:36} {result.algorithm:9} {result.heuristic:20} "
+          f"{status:7} len={result.plan_length:<4} exp={result.nodes_expanded:<7} "
+          f"parse={result.parse_ms:7.1f}ms ground={result.ground_ms:7.1f}ms "
+          f"search={result.search_ms:8.1f}ms {memory}", flush=True)
+    if result.error:
+        print(f"    {result.error}")
+    if result.profile:
+        print(f"    profile: {result.profile}")
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    try:
+        configs = matrix(args.algorithms, args.heuristics)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+    if args.generate:
+        try:
+            problems = [generate(domain, n, seed) for domain in args.generate
+                        for n in args.sizes for seed in args.seeds]
+        except ValueError as e:
+            print(e, file=sys.stderr)
+            return 2
+    else:
+        problems = discover(domains=args.domains)
+    if not problems:
+        print("No benchmark problems found", file=sys.stderr)
+        return 2
+
+    results = run_suite(problems, configs, args.repetitions, args.timeout,
+                        measure_memory=not args.no_memory, progress=_print_result,
+                        profiler=args.profile, profile_dir=args.output_dir / "profiles")
+    record = make_run_record(results, {
+        "algorithms": args.algorithms,
+        "heuristics": args.heuristics,
+        "domains": args.generate or args.domains,
+        "generated": bool(args.generate),
+        "sizes": args.sizes if args.generate else None,
+        "seeds": args.seeds if args.generate else None,
+        "repetitions": args.repetitions,
+        "timeout": args.timeout,
+    })
+    if not args.no_history:
+        append_history(record, args.output_dir)
+    if args.generate:
+        points = scaling_curves(results)
+        print()
+        print(format_scaling(points))
+        write_scaling_csv(points, args.output_dir / "scaling.csv")
+
+    baseline_path = args.baseline or args.output_dir / BASELINE_JSON
+    if args.save_baseline:
+        save_baseline(record, baseline_path)
+        print(f"Baseline saved to {baseline_path}")
+        return 0
+
+    baseline = load_baseline(baseline_path)
+    if baseline is None:
+        print(f"No baseline at {baseline_path}; run with --save-baseline to create one")
+        return 0
+    regressions = compare(results, baseline, args.threshold)
+    if not regressions:
+        print(f"No regressions against baseline from {baseline['timestamp']} ({baseline['commit']})")
+        return 0
+    print(f"{len(regressions)} regression(s) against baseline from {baseline['timestamp']} "
+          f"({baseline['commit']}):")
+    for regression in regressions:
+        print(f"  {regression}")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,182 @@
+"""
+Seeded problem generators for the benchmark domains.
+
+Every generator takes a size n and a seed and returns problem PDDL for the
+matching `benchmarks/<domain>/domain.pddl`. The same (n, seed) always
+produces the same problem.
+"""
+from __future__ import annotations
+import math
+import random
+from typing import Callable, Dict, List
+
+from .runner import BENCHMARKS_DIR, BenchmarkProblem
+
+
+def blocksworld(n: int, seed: int = 0) -> str:
+    """n blocks, random initial and goal towers."""
+    rng = random.Random(seed)
+    blocks = [f"b{i}" for i in range(1, n + 1)]
+    init_towers = _random_towers(blocks, rng)
+    goal_towers = _random_towers(blocks, rng)
+
+    init = ["(handempty)"]
+    for tower in init_towers:
+        init.append(f"(ontable {tower[0]})")
+        init.extend(f"(on {upper} {lower})" for lower, upper in zip(tower, tower[1:]))
+        init.append(f"(clear {tower[-1]})")
+    goal = [f"(on {upper} {lower})" for tower in goal_towers for lower, upper in zip(tower, tower[1:])]
+    if not goal:
+        goal = [f"(ontable {block})" for block in blocks]
+
+    return _problem(f"blocksworld-n{n}-s{seed}", "blocksworld",
+                    [f"{' '.join(blocks)} - block"], init, goal)
+
+
+def gripper(n: int, seed: int = 0) -> str:
+    """n balls, each starting in a random room and wanted in the other."""
+    rng = random.Random(seed)
+    rooms = ["rooma", "roomb"]
+    balls = [f"ball{i}" for i in range(1, n + 1)]
+    starts = {ball: rng.choice(rooms) for ball in balls}
+
+    init = [f"(at-robby {rng.choice(rooms)})", "(free left)", "(free right)"]
+    init.extend(f"(at {ball} {starts[ball]})" for ball in balls)
+    goal = [f"(at {ball} {rooms[1 - rooms.index(starts[ball])]})" for ball in balls]
+
+    return _problem(f"gripper-n{n}-s{seed}", "gripper",
+                    [f"{' '.join(rooms)} - room", f"{' '.join(balls)} - ball", "left right - gripper"],
+                    init, goal)
+
+
+def hanoi(n: int, seed: int = 0) -> str:
+    """
+    n disks moved from the first to the last of three pegs.
+    The puzzle has a single instance per size, so the seed is unused.
+    """
+    disks = [f"d{i}" for i in range(1, n + 1)]  # d1 is the smallest
+    pegs = ["peg1", "peg2", "peg3"]
+
+    init = []
+    for i, small in enumerate(disks):
+        init.extend(f"(smaller {small} {large})" for large in disks[i + 1:])
+        init.extend(f"(smaller {small} {peg})" for peg in pegs)
+    init.extend(f"(on {upper} {lower})" for upper, lower in zip(disks, disks[1:]))
+    init.append(f"(on {disks[-1]} peg1)")
+    init.extend(["(clear d1)", "(clear peg2)", "(clear peg3)"])
+    goal = [f"(on {upper} {lower})" for upper, lower in zip(disks, disks[1:])]
+    goal.append(f"(on {disks[-1]} peg3)")
+
+    return _problem(f"hanoi-n{n}-s{seed}", "hanoi",
+                    [f"{' '.join(disks)} - disk", f"{' '.join(pegs)} - peg"], init, goal)
+
+
+def logistics(n: int, seed: int = 0) -> str:
+    """
+    n packages in ceil(n / 3) cities (at least two), each with an airport,
+    one other location and a truck; one airplane. Packages start and end at
+    random locations.
+    """
+    rng = random.Random(seed)
+    num_cities = max(2, math.ceil(n / 3))
+    cities = [f"city{i}" for i in range(1, num_cities + 1)]
+    airports = [f"airport{i}" for i in range(1, num_cities + 1)]
+    locations = [f"loc{i}" for i in range(1, num_cities + 1)]
+    trucks = [f"truck{i}" for i in range(1, num_cities + 1)]
+    packages = [f"package{i}" for i in range(1, n + 1)]
+    places = airports + locations
+
+    init = []
+    for city, airport, location, truck in zip(cities, airports, locations, trucks):
+        init.extend([f"(in-city {airport} {city})", f"(in-city {location} {city})"])
+        init.append(f"(at {truck} {rng.choice([airport, location])})")
+    init.append(f"(at plane1 {rng.choice(airports)})")
+    goal = []
+    for package in packages:
+        start = rng.choice(places)
+        init.append(f"(at {package} {start})")
+        goal.append(f"(at {package} {rng.choice([p for p in places if p != start])})")
+
+    return _problem(f"logistics-n{n}-s{seed}", "logistics",
+                    [f"{' '.join(cities)} - city", f"{' '.join(trucks)} - truck", "plane1 - airplane",
+                     f"{' '.join(packages)} - package", f"{' '.join(locations)} - location",
+                     f"{' '.join(airports)} - airport"],
+                    init, goal)
+
+
+def tyreworld(n: int, seed: int = 0) -> str:
+    """
+    n flat tyres, each on its own hub, replaced by spares from the boot.
+    The domain has a single instance per size, so the seed is unused.
+    """
+    hubs = [f"hub{i}" for i in range(1, n + 1)]
+    nuts = [f"nut{i}" for i in range(1, n + 1)]
+    flats = [f"flat{i}" for i in range(1, n + 1)]
+    spares = [f"spare{i}" for i in range(1, n + 1)]
+
+    init = ["(in wrench boot)", "(in jack boot)", "(in pump boot)"]
+    for hub, nut, flat, spare in zip(hubs, nuts, flats, spares):
+        init.extend([f"(in {spare} boot)", f"(inflated {spare})",
+                     f"(on-vehicle {flat})", f"(flat {flat})", f"(at {flat} {hub})",
+                     f"(tight {nut})", f"(at {nut} {hub})"])
+    goal = []
+    for nut, flat, spare in zip(nuts, flats, spares):
+        goal.extend([f"(on-vehicle {spare})", f"(tight {nut})", f"(in {flat} boot)"])
+    goal.extend(["(in wrench boot)", "(in jack boot)", "(in pump boot)"])
+
+    return _problem(f"tyreworld-n{n}-s{seed}", "tyreworld",
+                    [f"{' '.join(hubs)} - location", "boot - container", "wrench jack pump - tool",
+                     f"{' '.join(flats + spares)} - wheel", f"{' '.join(nuts)} - nut"],
+                    init, goal)
+
+
+GENERATORS: Dict[str, Callable[[int, int], str]] = {
+    "blocksworld": blocksworld,
+    "gripper": gripper,
+    "hanoi": hanoi,
+    "logistics": logistics,
+    "tyreworld": tyreworld,
+}
+
+
+def generate(domain: str, n: int, seed: int = 0) -> BenchmarkProblem:
+    """A generated problem for one of the benchmark domains."""
+    if domain not in GENERATORS:
+        raise ValueError(f"No generator for domain: {domain}")
+    if n < 1:
+        raise ValueError("Problem size must be positive")
+    return BenchmarkProblem(
+        domain=domain,
+        name=f"{domain}-n{n}-s{seed}",
+        domain_path=BENCHMARKS_DIR / domain / "domain.pddl",
+        problem_text=GENERATORS[domain](n, seed),
+        size=n,
+    )
+
+
+def _random_towers(blocks: List[str], rng: random.Random) -> List[List[str]]:
+    """Random partition of shuffled blocks into towers, listed bottom to top."""
+    order = blocks[:]
+    rng.shuffle(order)
+    towers: List[List[str]] = []
+    for block in order:
+        # Start a new tower with probability 1 / (towers + 1)
+        if not towers or rng.random() < 1 / (len(towers) + 1):
+            towers.append([block])
+        else:
+            rng.choice(towers).append(block)
+    return towers
+
+
+def _problem(name: str, domain: str, objects: List[str], init: List[str], goal: List[str]) -> str:
+    lines = [f"(define (problem {name})", f"  (:domain {domain})", "  (:objects"]
+    lines.extend(f"    {group}" for group in objects)
+    lines.append("  )")
+    lines.append("  (:init")
+    lines.extend(f"    {fact}" for fact in init)
+    lines.append("  )")
+    lines.append("  (:goal (and")
+    lines.extend(f"    {fact}" for fact in goal)
+    lines.append("  ))")
+    lines.append(")")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,127 @@
+"""Benchmark history files and baseline comparison."""
+from __future__ import annotations
+import csv
+import json
+import platform
+import subprocess
+from dataclasses import dataclass, fields
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .runner import RunResult
+
+DEFAULT_OUTPUT_DIR = Path(__file__).parent.parent.parent / "data" / "bench"
+HISTORY_JSON = "history.json"
+HISTORY_CSV = "history.csv"
+BASELINE_JSON = "baseline.json"
+
+# Timing differences below this many milliseconds are treated as noise
+MIN_TIME_DELTA_MS = 1.0
+
+
+@dataclass
+class Regression:
+    """A metric that got worse than the baseline."""
+    key: str
+    metric: str
+    baseline: float
+    current: float
+
+    @property
+    def change(self) -> float:
+        """Relative change; infinite if the baseline was zero."""
+        if self.baseline == 0:
+            return float("inf")
+        return (self.current - self.baseline) / self.baseline
+
+    def __str__(self) -> str:
+        change = "new" if self.change == float("inf") else f"{self.change:+.0%}"
+        return f"{self.key}: {self.metric} {self.baseline:g} -> {self.current:g} ({change})"
+
+
+def make_run_record(results: List[RunResult], settings: Dict) -> Dict:
+    """A history entry: when, on what code, with which settings, and the results."""
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "settings": settings,
+        "results": [result.to_dict() for result in results],
+    }
+
+
+def append_history(record: Dict, output_dir: Path = DEFAULT_OUTPUT_DIR) -> None:
+    """Append a run to the JSON history and its results to the CSV history."""
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    json_path = output_dir / HISTORY_JSON
+    history = json.loads(json_path.read_text()) if json_path.exists() else []
+    history.append(record)
+    json_path.write_text(json.dumps(history, indent=2))
+
+    csv_path = output_dir / HISTORY_CSV
+    columns = ["timestamp", "commit"] + [f.name for f in fields(RunResult)]
+    write_header = not csv_path.exists()
+    with csv_path.open("a", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        if write_header:
+            writer.writeheader()
+        for result in record["results"]:
+            writer.writerow({"timestamp": record["timestamp"], "commit": record["commit"], **result})
+
+
+def save_baseline(record: Dict, path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(record, indent=2))
+
+
+def load_baseline(path: Path) -> Optional[Dict]:
+    return json.loads(path.read_text()) if path.exists() else None
+
+
+def compare(results: List[RunResult], baseline: Dict, threshold: float = 0.2) -> List[Regression]:
+    """
+    Compare results with a baseline run.
+
+    Search effort and plan quality are deterministic, so any increase in
+    expansions or plan length counts; times regress when they grow by more
+    than `threshold` (relative) and MIN_TIME_DELTA_MS (absolute).
+    """
+    previous = {_key(entry): entry for entry in baseline["results"]}
+    regressions = []
+    for result in results:
+        base = previous.get(result.key)
+        if base is None:
+            continue
+        if base["success"] and not result.success:
+            regressions.append(Regression(result.key, "solved", 1, 0))
+            continue
+        if not result.success:
+            continue
+        for metric in ("nodes_expanded", "plan_length"):
+            if getattr(result, metric) > base[metric]:
+                regressions.append(Regression(result.key, metric, base[metric], getattr(result, metric)))
+        for metric in ("parse_ms", "ground_ms", "search_ms"):
+            old, new = base[metric], getattr(result, metric)
+            if new - old > MIN_TIME_DELTA_MS and new > old * (1 + threshold):
+                regressions.append(Regression(result.key, metric, round(old, 3), round(new, 3)))
+        old_memory, new_memory = base.get("peak_memory_kb"), result.peak_memory_kb
+        if old_memory and new_memory and new_memory > old_memory * (1 + threshold):
+            regressions.append(Regression(result.key, "peak_memory_kb", round(old_memory, 1),
+                                          round(new_memory, 1)))
+    return regressions
+
+
+def _key(entry: Dict) -> str:
+    return f"{entry['domain']}/{entry['problem']}/{entry['algorithm']}/{entry['heuristic']}"
+
+
+def _git_commit() -> Optional[str]:
+    """Current commit of the source tree, if it is a git checkout."""
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                             text=True, timeout=5, cwd=Path(__file__).parent)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
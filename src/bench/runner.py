@@ -0,0 +1,246 @@
+"""Benchmark discovery and the algorithm x heuristic run matrix."""
+from __future__ import annotations
+import statistics
+import time
+import tracemalloc
+from dataclasses import dataclass, asdict
+from functools import partial
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+from ..parser.domain_parser import DomainParser
+from ..parser.problem_parser import ProblemParser
+from ..grounding.grounder import Grounder
+from ..search.algorithms.bfs import BFS
+from ..search.algorithms.astar import AStar
+from ..search.algorithms.greedy import GreedyBestFirst
+from ..search.algorithms.hda_star import HDAStar
+from ..search.heuristics import (
+    CanonicalPDBHeuristic, GoalCountHeuristic, HAddHeuristic, HMaxHeuristic,
+    LandmarkCountHeuristic, LMCutHeuristic,
+)
+from ..validator.plan_validator import PlanValidator
+from ..profiling import Profile, artifact_name, problem_hash
+
+BENCHMARKS_DIR = Path(__file__).parent.parent.parent / "benchmarks"
+
+ALGORITHMS: Dict[str, Callable] = {
+    "bfs": BFS,
+    "astar": AStar,
+    "greedy": GreedyBestFirst,
+    "hda_star": HDAStar,
+}
+
+HEURISTICS: Dict[str, Callable] = {
+    "goal_count": GoalCountHeuristic,
+    "h_add": HAddHeuristic,
+    "h_max": HMaxHeuristic,
+    "lm_cut": LMCutHeuristic,
+    "lm_count": LandmarkCountHeuristic,
+    "lm_count_admissible": partial(LandmarkCountHeuristic, admissible=True),
+    "pdb": CanonicalPDBHeuristic,
+}
+
+NO_HEURISTIC = "none"  # Heuristic label of blind searches
+
+# Searching in worker processes, whose memory tracemalloc cannot see
+MULTIPROCESS_ALGORITHMS = {"hda_star"}
+
+
+@dataclass
+class BenchmarkProblem:
+    """A benchmark problem: a problem file, or generated PDDL, with its domain file."""
+    domain: str
+    name: str
+    domain_path: Path
+    problem_path: Optional[Path] = None
+    problem_text: Optional[str] = None
+    size: Optional[int] = None  # Generator parameter n, for scaling reports
+
+    @property
+    def key(self) -> str:
+        return f"{self.domain}/{self.name}"
+
+    def read_problem(self) -> str:
+        if self.problem_text is not None:
+            return self.problem_text
+        return self.problem_path.read_text()
+
+
+@dataclass
+class RunResult:
+    """Measurements of one configuration on one problem, over all repetitions."""
+    domain: str
+    problem: str
+    algorithm: str
+    heuristic: str
+    size: Optional[int]
+    repetitions: int
+    success: bool
+    valid: bool
+    plan_length: int
+    nodes_expanded: int
+    nodes_generated: int
+    parse_ms: float  # Median over repetitions
+    ground_ms: float
+    search_ms: float
+    search_ms_min: float
+    total_ms: float
+    peak_memory_kb: Optional[float] = None  # From a separate traced run; None for multi-process searches
+    profile: Optional[str] = None  # Profile artifact of a separate run
+    error: Optional[str] = None
+
+    @property
+    def key(self) -> str:
+        return f"{self.domain}/{self.problem}/{self.algorithm}/{self.heuristic}"
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+def discover(root: Path = BENCHMARKS_DIR, domains: Optional[Iterable[str]] = None) -> List[BenchmarkProblem]:
+    """Find every `<root>/*/domain.pddl` and its `problem*.pddl` files."""
+    wanted = set(domains) if domains else None
+    problems = []
+    for domain_path in sorted(root.glob("*/domain.pddl")):
+        domain = domain_path.parent.name
+        if wanted is not None and domain not in wanted:
+            continue
+        for problem_path in sorted(domain_path.parent.glob("problem*.pddl")):
+            problems.append(BenchmarkProblem(domain, problem_path.stem, domain_path, problem_path))
+    return problems
+
+
+def matrix(algorithms: Iterable[str], heuristics: Iterable[str]) -> List[tuple]:
+    """(algorithm, heuristic) pairs; blind searches run once without a heuristic."""
+    heuristics = list(heuristics)
+    pairs = []
+    for algorithm in algorithms:
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"Unknown algorithm: {algorithm}")
+        if algorithm == "bfs":
+            pairs.append((algorithm, NO_HEURISTIC))
+            continue
+        for heuristic in heuristics:
+            if heuristic not in HEURISTICS:
+                raise ValueError(f"Unknown heuristic: {heuristic}")
+            pairs.append((algorithm, heuristic))
+    return pairs
+
+
+def _run_once(problem: BenchmarkProblem, algorithm: str, heuristic: str, timeout: float) -> Dict:
+    """Parse, ground and search once, timing each phase."""
+    start = time.perf_counter()
+    domain = DomainParser().parse(problem.domain_path.read_text())
+    parsed_problem = ProblemParser().parse(problem.read_problem())
+    parsed = time.perf_counter()
+    task = Grounder(domain, parsed_problem).ground_task()
+    grounded = time.perf_counter()
+
+    if heuristic == NO_HEURISTIC:
+        search = ALGORITHMS[algorithm](task, timeout=timeout)
+    else:
+        search = ALGORITHMS[algorithm](task, timeout=timeout, heuristic=HEURISTICS[heuristic](task))
+    result = search.search()
+    searched = time.perf_counter()
+
+    valid = result.success and PlanValidator(task).validate(result.plan).valid
+    return {
+        "result": result,
+        "valid": valid,
+        "parse_ms": (parsed - start) * 1000,
+        "ground_ms": (grounded - parsed) * 1000,
+        # Includes heuristic construction, which is part of the search cost
+        "search_ms": (searched - grounded) * 1000,
+    }
+
+
+def _peak_memory_kb(problem: BenchmarkProblem, algorithm: str, heuristic: str,
+                    timeout: float) -> Optional[float]:
+    """
+    Peak traced allocation of one full run, in KiB. None for multi-process
+    searches: only this process is traced, so the figure would leave out the
+    workers and not be comparable with single-process searches.
+    """
+    if algorithm in MULTIPROCESS_ALGORITHMS:
+        return None
+    tracemalloc.start()
+    try:
+        _run_once(problem, algorithm, heuristic, timeout)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 1024
+
+
+def _profile_run(problem: BenchmarkProblem, algorithm: str, heuristic: str, timeout: float,
+                 profiler: str, profile_dir: Path) -> Path:
+    """Profile one full run and store the artifact, tagged like API profiles."""
+    with Profile(profiler) as profile:
+        _run_once(problem, algorithm, heuristic, timeout)
+    digest = problem_hash(problem.domain_path.read_text(), problem.read_problem())
+    return profile.save(profile_dir / artifact_name(algorithm, heuristic, digest, profiler))
+
+
+def run_config(problem: BenchmarkProblem, algorithm: str, heuristic: str,
+               repetitions: int = 3, timeout: float = 30.0,
+               measure_memory: bool = True, profiler: Optional[str] = None,
+               profile_dir: Optional[Path] = None) -> RunResult:
+    """
+    Run one configuration `repetitions` times and report median timings.
+    Memory and profiles come from extra runs because tracing slows the timed ones.
+    """
+    runs = []
+    try:
+        for _ in range(repetitions):
+            runs.append(_run_once(problem, algorithm, heuristic, timeout))
+        peak_kb = _peak_memory_kb(problem, algorithm, heuristic, timeout) if measure_memory else None
+        profile_path = None
+        if profiler is not None:
+            profile_path = _profile_run(problem, algorithm, heuristic, timeout, profiler, profile_dir)
+    except Exception as e:
+        return RunResult(problem.domain, problem.name, algorithm, heuristic, problem.size, len(runs),
+                         success=False, valid=False, plan_length=0, nodes_expanded=0,
+                         nodes_generated=0, parse_ms=0.0, ground_ms=0.0, search_ms=0.0,
+                         search_ms_min=0.0, total_ms=0.0, error=f"{type(e).__name__}: {e}")
+
+    last = runs[-1]["result"]
+    median = {name: statistics.median(run[name] for run in runs)
+              for name in ("parse_ms", "ground_ms", "search_ms")}
+    return RunResult(
+        domain=problem.domain,
+        problem=problem.name,
+        algorithm=algorithm,
+        heuristic=heuristic,
+        size=problem.size,
+        repetitions=repetitions,
+        success=last.success,
+        valid=runs[-1]["valid"],
+        plan_length=last.plan_length,
+        nodes_expanded=last.nodes_expanded,
+        nodes_generated=last.nodes_generated,
+        parse_ms=median["parse_ms"],
+        ground_ms=median["ground_ms"],
+        search_ms=median["search_ms"],
+        search_ms_min=min(run["search_ms"] for run in runs),
+        total_ms=sum(median.values()),
+        peak_memory_kb=peak_kb,
+        profile=str(profile_path) if profile_path is not None else None,
+        error=None if last.success else last.error_message,
+    )
+
+
+def run_suite(problems: List[BenchmarkProblem], configs: List[tuple],
+              repetitions: int = 3, timeout: float = 30.0, measure_memory: bool = True,
+              progress: Optional[Callable[[RunResult], None]] = None,
+              profiler: Optional[str] = None, profile_dir: Optional[Path] = None) -> List[RunResult]:
+    """Run every configuration on every problem."""
+    results = []
+    for problem in problems:
+        for algorithm, heuristic in configs:
+            result = run_config(problem, algorithm, heuristic, repetitions, timeout, measure_memory,
+                                profiler, profile_dir)
+            results.append(result)
+            if progress is not None:
+                progress(result)
+    return results
@@ -0,0 +1,98 @@
+"""Scaling curves: time and memory against problem size."""
+from __future__ import annotations
+import csv
+import statistics
+from dataclasses import dataclass, asdict, fields
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .runner import RunResult
+
+# A step in size that multiplies search time by at least this much is a cliff
+CLIFF_FACTOR = 10.0
+
+
+@dataclass
+class ScalingPoint:
+    """One configuration at one problem size, aggregated over seeds."""
+    domain: str
+    algorithm: str
+    heuristic: str
+    size: int
+    problems: int
+    solved: int
+    search_ms: float  # Median over solved problems
+    nodes_expanded: float
+    peak_memory_kb: Optional[float]  # Largest over all problems
+    cliff: bool = False  # First size with failures or a CLIFF_FACTOR slowdown
+
+
+def scaling_curves(results: List[RunResult]) -> List[ScalingPoint]:
+    """Aggregate generated-problem results into per-configuration curves."""
+    groups: Dict[Tuple[str, str, str, int], List[RunResult]] = {}
+    for result in results:
+        if result.size is None:
+            continue
+        key = (result.domain, result.algorithm, result.heuristic, result.size)
+        groups.setdefault(key, []).append(result)
+
+    points = []
+    for (domain, algorithm, heuristic, size), group in sorted(groups.items()):
+        solved = [r for r in group if r.success]
+        memory = [r.peak_memory_kb for r in group if r.peak_memory_kb is not None]
+        points.append(ScalingPoint(
+            domain=domain,
+            algorithm=algorithm,
+            heuristic=heuristic,
+            size=size,
+            problems=len(group),
+            solved=len(solved),
+            search_ms=statistics.median(r.search_ms for r in solved) if solved else 0.0,
+            nodes_expanded=statistics.median(r.nodes_expanded for r in solved) if solved else 0.0,
+            peak_memory_kb=max(memory) if memory else None,
+        ))
+    _mark_cliffs(points)
+    return points
+
+
+def _mark_cliffs(points: List[ScalingPoint]) -> None:
+    """Flag the first size at which each configuration falls off."""
+    previous: Dict[Tuple[str, str, str], ScalingPoint] = {}
+    marked = set()
+    for point in points:  # Sorted by configuration, then size
+        config = (point.domain, point.algorithm, point.heuristic)
+        before = previous.get(config)
+        previous[config] = point
+        if config in marked:
+            continue
+        failed = point.solved < point.problems
+        slowdown = (before is not None and before.solved and point.solved
+                    and before.search_ms > 0 and point.search_ms >= before.search_ms * CLIFF_FACTOR)
+        if failed or slowdown:
+            point.cliff = True
+            marked.add(config)
+
+
+def format_scaling(points: List[ScalingPoint]) -> str:
+    """Plain-text table of the curves, one block per configuration."""
+    lines = []
+    config = None
+    for point in points:
+        if (point.domain, point.algorithm, point.heuristic) != config:
+            config = (point.domain, point.algorithm, point.heuristic)
+            lines.append(f"{point.domain} {point.algorithm} {point.heuristic}")
+            lines.append(f"  {'n':>5} {'solved':>7} {'search ms':>11} {'expanded':>10} {'peak KB':>10}")
+        memory = f"{point.peak_memory_kb:10.0f}" if point.peak_memory_kb is not None else f"{'-':>10}"
+        marker = "  <- cliff" if point.cliff else ""
+        lines.append(f"  {point.size:5d} {point.solved:3d}/{point.problems:<3d} {point.search_ms:11.1f} "
+                     f"{point.nodes_expanded:10.0f} {memory}{marker}")
+    return "\n".join(lines)
+
+
+def write_scaling_csv(points: List[ScalingPoint], path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=[field.name for field in fields(ScalingPoint)])
+        writer.writeheader()
+        for point in points:
+            writer.writerow(asdict(point))
@@ -0,0 +1,86 @@
+"""
+In-memory index of the shipped benchmarks.
+
+The benchmarks/ directory is scanned and read once; the API serves listings and
+PDDL text from memory afterwards. `warm_task_cache` additionally parses and
+grounds every benchmark problem so the first plan request for it is fast.
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+BENCHMARKS_DIR = Path(__file__).parent.parent / "benchmarks"
+
+
+@dataclass(frozen=True)
+class Benchmark:
+    """A shipped benchmark problem with its domain."""
+    domain: str
+    name: str
+    domain_pddl: str
+    problem_pddl: str
+
+
+class BenchmarkIndex:
+    """Benchmark files of `root`, read into memory by load()."""
+
+    def __init__(self, root: Path = BENCHMARKS_DIR):
+        self.root = root
+        self._domains: Dict[str, str] = {}  # Domain name -> domain PDDL
+        self._files: Dict[Tuple[str, str], str] = {}  # (domain, file stem) -> PDDL
+        self._listed: List[Benchmark] = []  # problem*.pddl files, in listing order
+
+    def load(self) -> BenchmarkIndex:
+        domains, files, listed = {}, {}, []
+        if self.root.exists():
+            for domain_file in sorted(self.root.glob("*/domain.pddl")):
+                domain_name = domain_file.parent.name
+                domains[domain_name] = domain_file.read_text()
+                for path in sorted(domain_file.parent.glob("*.pddl")):
+                    files[domain_name, path.stem] = path.read_text()
+                for path in sorted(domain_file.parent.glob("problem*.pddl")):
+                    listed.append(Benchmark(domain_name, path.stem, domains[domain_name],
+                                            files[domain_name, path.stem]))
+        # Swap in complete tables so readers never see a half-built index
+        self._domains, self._files, self._listed = domains, files, listed
+        return self
+
+    def benchmarks(self) -> List[Benchmark]:
+        return list(self._listed)
+
+    def has_domain(self, domain_name: str) -> bool:
+        return domain_name in self._domains
+
+    def get(self, domain_name: str, problem_name: str) -> Optional[Benchmark]:
+        """Look up `<problem_name>.pddl`, then `problem-<problem_name>.pddl`."""
+        domain_pddl = self._domains.get(domain_name)
+        if domain_pddl is None:
+            return None
+        for stem in (problem_name, f"problem-{problem_name}"):
+            problem_pddl = self._files.get((domain_name, stem))
+            if problem_pddl is not None:
+                return Benchmark(domain_name, stem, domain_pddl, problem_pddl)
+        return None
+
+
+@lru_cache()
+def get_benchmark_index() -> BenchmarkIndex:
+    """Get the benchmark index, loading it on first use."""
+    return BenchmarkIndex().load()
+
+
+def warm_task_cache(index: Optional[BenchmarkIndex] = None) -> int:
+    """Parse and ground every listed benchmark into the task cache; returns the number cached."""
+    from .task_cache import get_task_cache  # Parser and grounder are only needed here
+    index = index or get_benchmark_index()
+    cache = get_task_cache()
+    warmed = 0
+    for benchmark in index.benchmarks():
+        try:
+            cache.get_or_ground(benchmark.domain_pddl, benchmark.problem_pddl)
+        except Exception:
+            continue  # A broken benchmark fails again, with its error, when requested
+        warmed += 1
+    return warmed
@@ -1,6 +1,7 @@
 """Configuration settings for STRIPS-NG."""
 from pydantic_settings import BaseSettings
 from functools import lru_cache
+from pathlib import Path
 
 
 class Settings(BaseSettings):
@@ -10,6 +11,16 @@ class Settings(BaseSettings):
     cors_origins: list[str] = ["http://localhost:5173", "http://localhost:5174", "http://localhost:3000", "http://127.0.0.1:5173", "http://127.0.0.1:5174"]
     default_timeout: int = 30
     max_search_nodes: int = 10000
+    heuristic_cache_size: int = 100000  # Cached heuristic values per search; 0 disables
+    heuristic_cache_policy: str = "lru"  # "lru" or "clock"
+    pdb_cache_dir: str = str(Path(__file__).parent.parent / "data" / "pdb_cache")
+    pdb_cache_max_bytes: int = 256 * 1024 * 1024  # Least recently used PDBs are evicted beyond this
+    profile_dir: str = str(Path(__file__).parent.parent / "data" / "profiles")
+    admin_users: list[str] = []  # Usernames allowed to profile requests
+    task_cache_size: int = 64  # Grounded tasks kept for repeated problems; 0 disables
+    hda_max_workers: int = 4  # Worker processes per HDA* search, whatever the request asks for
+    hda_max_searches: int = 2  # HDA* searches running at once; further requests get a 503
+    warm_benchmarks: bool = False  # Also ground the shipped benchmarks at startup (otherwise on first request)
     
     class Config:
         env_file = ".env"
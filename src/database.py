@@ -1,28 +1,157 @@
 """SQLite database for user persistence, progress tracking, and projects."""
+import hashlib
 import sqlite3
 import json
+import threading
+import time
+import zlib
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Dict, Optional, List, Any
 from datetime import datetime
 
+from .metrics import DB_QUERY_LATENCY
+from .user_cache import user_cache
+
 # Database file path
 DB_DIR = Path(__file__).parent.parent / "data"
 DB_FILE = DB_DIR / "planlab.db"
 
-# Ensure data directory exists
-DB_DIR.mkdir(exist_ok=True)
+# Applied to every new connection
+PRAGMAS = (
+    "PRAGMA journal_mode = WAL",    # Readers no longer block the writer
+    "PRAGMA synchronous = NORMAL",  # Safe under WAL; fsync only at checkpoints
+    "PRAGMA cache_size = -8000",    # 8 MB page cache
+    "PRAGMA temp_store = MEMORY",
+)
+BUSY_TIMEOUT = 5.0  # Seconds to wait for a lock held by another connection
+STATEMENT_CACHE_SIZE = 256  # Prepared statements kept per connection
+
+_local = threading.local()
+_init_lock = threading.Lock()
+_initialized = False
+
+
+class TimedCursor(sqlite3.Cursor):
+    """Cursor that records statement latency in the service metrics."""
+    
+    def execute(self, sql, parameters=()):
+        with _timed(sql):
+            return super().execute(sql, parameters)
+    
+    def executemany(self, sql, seq_of_parameters):
+        with _timed(sql):
+            return super().executemany(sql, seq_of_parameters)
+
+
+class TimedConnection(sqlite3.Connection):
+    """Connection whose cursors, and shortcut execute methods, are timed."""
+    
+    def cursor(self, factory=TimedCursor):
+        return super().cursor(factory)
+    
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+    
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+
+class PooledConnection(TimedConnection):
+    """
+    Per-thread connection that outlives close(), so later calls on the same
+    thread reuse it together with its prepared statement cache.
+    
+    Helpers use it as a context manager (`with get_connection() as conn:`),
+    which commits when the block succeeds and rolls back when it raises, so
+    no transaction is left open for the next caller on the thread.
+    """
+    
+    def close(self):
+        """Release the connection, rolling back anything left uncommitted."""
+        if self.in_transaction:
+            self.rollback()
+    
+    def dispose(self):
+        """Really close the connection."""
+        super().close()
+
+
+def _operation(sql: str) -> str:
+    """Statement type of a query (SELECT, INSERT, ...) for metric labels."""
+    words = sql.split(None, 1)
+    return words[0].upper() if words else "UNKNOWN"
+
+
+@contextmanager
+def _timed(sql: str):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        DB_QUERY_LATENCY.observe(time.perf_counter() - start, operation=_operation(sql))
 
 
 def get_connection():
-    """Get database connection."""
-    conn = sqlite3.connect(str(DB_FILE))
-    conn.row_factory = sqlite3.Row
+    """Get this thread's database connection; the schema is set up on first use."""
+    if not _initialized:
+        init_db()
+    return _thread_connection()
+
+
+def _thread_connection():
+    """This thread's connection, opened on first use."""
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn = sqlite3.connect(str(DB_FILE), factory=PooledConnection, timeout=BUSY_TIMEOUT,
+                               cached_statements=STATEMENT_CACHE_SIZE)
+        conn.row_factory = sqlite3.Row
+        for pragma in PRAGMAS:
+            conn.execute(pragma)
+        _local.conn = conn
     return conn
 
 
+@contextmanager
+def write_transaction():
+    """
+    This thread's connection inside a BEGIN IMMEDIATE transaction, committed when
+    the block succeeds and rolled back when it raises. The write lock is taken up
+    front, so nothing the block reads can be changed by another writer before it
+    commits.
+    """
+    with get_connection() as conn:
+        conn.execute('BEGIN IMMEDIATE')
+        yield conn
+
+
+def close_connection():
+    """Close this thread's connection, if it has one."""
+    conn = getattr(_local, "conn", None)
+    if conn is not None:
+        conn.dispose()
+        _local.conn = None
+
+
 def init_db():
-    """Initialize database with tables."""
-    conn = get_connection()
+    """
+    Initialize database with tables and apply migrations.
+    Runs once per process; later calls return immediately.
+    """
+    global _initialized
+    with _init_lock:
+        if _initialized:
+            return
+        DB_DIR.mkdir(exist_ok=True)
+        conn = _thread_connection()
+        _create_tables(conn)
+        migrate(conn)
+        conn.close()
+        _initialized = True
+
+
+def _create_tables(conn):
+    """Create the base tables (later changes are MIGRATIONS)."""
     cursor = conn.cursor()
     
     # Users table
@@ -99,64 +228,169 @@ def init_db():
     ''')
     
     conn.commit()
-    conn.close()
+
+
+# ==================== MIGRATIONS ====================
+
+def _add_column(table: str, column: str, definition: str):
+    """Migration step adding a column, unless a previous partial run already did."""
+    def step(cursor):
+        cursor.execute(f'PRAGMA table_info({table})')
+        if column not in {row[1] for row in cursor.fetchall()}:
+            cursor.execute(f'ALTER TABLE {table} ADD COLUMN {column} {definition}')
+    return step
+
+
+# (version, description, steps), applied in order and recorded in schema_migrations.
+# A step is SQL or a callable taking the cursor, for data moves SQL cannot express.
+# Steps must be safe to repeat (IF NOT EXISTS, _add_column, ...).
+# Never edit an applied migration; append a new one instead.
+MIGRATIONS = [
+    (1, "Composite indexes for per-user queries", [
+        # get_user_projects: username + folder_path, ordered by updated_at
+        'CREATE INDEX IF NOT EXISTS idx_projects_user_folder_updated '
+        'ON user_projects (username, folder_path, updated_at DESC)',
+        # get_algorithm_usage_history: newest usage of one user
+        'CREATE INDEX IF NOT EXISTS idx_usage_user_used_at '
+        'ON algorithm_usage (username, used_at DESC)',
+        # get_most_used_algorithm: covers the per-user GROUP BY algorithm
+        'CREATE INDEX IF NOT EXISTS idx_usage_user_algorithm '
+        'ON algorithm_usage (username, algorithm)',
+        'ANALYZE',
+    ]),
+    (2, "Per-user algorithm counters for favorite tracking", [
+        '''CREATE TABLE IF NOT EXISTS user_algorithm_counts (
+            username TEXT NOT NULL,
+            algorithm TEXT NOT NULL,
+            uses INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (username, algorithm),
+            FOREIGN KEY (username) REFERENCES users(username) ON DELETE CASCADE
+        )''',
+        '''INSERT OR IGNORE INTO user_algorithm_counts (username, algorithm, uses)
+           SELECT username, algorithm, COUNT(*) FROM algorithm_usage GROUP BY username, algorithm''',
+    ]),
+    (3, "Project listing index with id tie-break for keyset pagination", [
+        'CREATE INDEX IF NOT EXISTS idx_projects_user_folder_updated_id '
+        'ON user_projects (username, folder_path, updated_at DESC, id DESC)',
+        'DROP INDEX IF EXISTS idx_projects_user_folder_updated',
+    ]),
+    (4, "Content-addressed, compressed project contents with version history", [
+        '''CREATE TABLE IF NOT EXISTS content_blobs (
+            hash TEXT PRIMARY KEY,  -- sha256 of the text
+            data BLOB NOT NULL,     -- zlib-compressed UTF-8
+            size INTEGER NOT NULL,  -- Uncompressed bytes
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )''',
+        _add_column('user_projects', 'content_hash', 'TEXT REFERENCES content_blobs(hash)'),
+        '''CREATE TABLE IF NOT EXISTS project_versions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            project_id INTEGER NOT NULL,
+            content_hash TEXT NOT NULL,
+            project_name TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (project_id) REFERENCES user_projects(id) ON DELETE CASCADE,
+            FOREIGN KEY (content_hash) REFERENCES content_blobs(hash)
+        )''',
+        'CREATE INDEX IF NOT EXISTS idx_versions_project ON project_versions (project_id, id DESC)',
+        'CREATE INDEX IF NOT EXISTS idx_versions_hash ON project_versions (content_hash)',
+        'CREATE INDEX IF NOT EXISTS idx_projects_content_hash ON user_projects (content_hash)',
+        lambda cursor: _move_contents_to_blobs(cursor),  # Defined with the blob helpers below
+    ]),
+]
+
+
+def migrate(conn) -> List[int]:
+    """
+    Apply pending migrations; returns the versions applied.
+    
+    Each migration runs in its own BEGIN IMMEDIATE transaction, so it is applied
+    completely or not at all. Processes migrating the same database take turns
+    on the write lock and re-check schema_migrations once they hold it, so a
+    migration another process has just applied is skipped.
+    """
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INTEGER PRIMARY KEY,
+            description TEXT NOT NULL,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    applied = {row[0] for row in conn.execute('SELECT version FROM schema_migrations')}
+    
+    new = []
+    for version, description, steps in MIGRATIONS:
+        if version in applied:
+            continue
+        with conn:
+            conn.execute('BEGIN IMMEDIATE')
+            cursor = conn.cursor()
+            cursor.execute('SELECT 1 FROM schema_migrations WHERE version = ?', (version,))
+            if cursor.fetchone() is not None:
+                continue
+            for step in steps:
+                if callable(step):
+                    step(cursor)
+                else:
+                    cursor.execute(step)
+            cursor.execute('INSERT INTO schema_migrations (version, description) VALUES (?, ?)',
+                           (version, description))
+        new.append(version)
+    return new
+
+
+def get_schema_version() -> int:
+    """Highest applied migration version."""
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute('SELECT COALESCE(MAX(version), 0) FROM schema_migrations')
+        return cursor.fetchone()[0]
 
 
 # ==================== USER FUNCTIONS ====================
 
 def get_user(username: str) -> Optional[Dict]:
     """Get a user by username."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute('SELECT * FROM users WHERE username = ?', (username,))
-    row = cursor.fetchone()
-    conn.close()
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute('SELECT * FROM users WHERE username = ?', (username,))
+        row = cursor.fetchone()
     return dict(row) if row else None
 
 
 def get_user_by_email(email: str) -> Optional[Dict]:
     """Get a user by email."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute('SELECT * FROM users WHERE email = ?', (email,))
-    row = cursor.fetchone()
-    conn.close()
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute('SELECT * FROM users WHERE email = ?', (email,))
+        row = cursor.fetchone()
     return dict(row) if row else None
 
 
 def create_user(username: str, email: str, hashed_password: str, full_name: str = None) -> bool:
     """Create a new user."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
     try:
-        cursor.execute('''
-            INSERT INTO users (username, email, full_name, hashed_password)
-            VALUES (?, ?, ?, ?)
-        ''', (username, email, full_name, hashed_password))
-        
-        # Initialize user statistics
-        cursor.execute('''
-            INSERT INTO user_statistics (username) VALUES (?)
-        ''', (username,))
-        
-        conn.commit()
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                INSERT INTO users (username, email, full_name, hashed_password)
+                VALUES (?, ?, ?, ?)
+            ''', (username, email, full_name, hashed_password))
+            
+            # Initialize user statistics
+            cursor.execute('''
+                INSERT INTO user_statistics (username) VALUES (?)
+            ''', (username,))
         return True
     except sqlite3.IntegrityError:
         return False
-    finally:
-        conn.close()
 
 
 def update_last_login(username: str):
     """Update user's last login time."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute('''
-        UPDATE users SET last_login = CURRENT_TIMESTAMP WHERE username = ?
-    ''', (username,))
-    conn.commit()
-    conn.close()
+    with get_connection() as conn:
+        conn.execute('''
+            UPDATE users SET last_login = CURRENT_TIMESTAMP WHERE username = ?
+        ''', (username,))
 
 
 def update_user(username: str, **kwargs) -> bool:
@@ -167,299 +401,451 @@ def update_user(username: str, **kwargs) -> bool:
     if not updates:
         return False
     
-    conn = get_connection()
-    cursor = conn.cursor()
-    
     set_clause = ', '.join(f'{k} = ?' for k in updates.keys())
     values = list(updates.values()) + [username]
     
     try:
-        cursor.execute(f'''
-            UPDATE users SET {set_clause} WHERE username = ?
-        ''', values)
-        conn.commit()
-        return cursor.rowcount > 0
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f'''
+                UPDATE users SET {set_clause} WHERE username = ?
+            ''', values)
     except sqlite3.IntegrityError:
         return False
-    finally:
-        conn.close()
+    user_cache.invalidate_user(username)
+    return cursor.rowcount > 0
 
 
 def delete_user(username: str) -> bool:
     """Delete a user."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute('DELETE FROM users WHERE username = ?', (username,))
-    success = cursor.rowcount > 0
-    conn.commit()
-    conn.close()
-    return success
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute('DELETE FROM users WHERE username = ?', (username,))
+    user_cache.invalidate_user(username)
+    return cursor.rowcount > 0
 
 
 # ==================== PROGRESS FUNCTIONS ====================
 
 def get_user_progress(username: str) -> List[Dict]:
     """Get all lesson progress for a user."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute('''
-        SELECT * FROM user_progress WHERE username = ? ORDER BY completed_at DESC
-    ''', (username,))
-    rows = cursor.fetchall()
-    conn.close()
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT * FROM user_progress WHERE username = ? ORDER BY completed_at DESC
+        ''', (username,))
+        rows = cursor.fetchall()
     return [dict(row) for row in rows]
 
 
 def update_lesson_progress(username: str, lesson_id: str, completed: bool = True, time_spent: int = 0):
     """Update or create lesson progress."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    cursor.execute('''
-        INSERT INTO user_progress (username, lesson_id, completed, completed_at, time_spent_seconds)
-        VALUES (?, ?, ?, CASE WHEN ? THEN CURRENT_TIMESTAMP ELSE NULL END, ?)
-        ON CONFLICT(username, lesson_id) DO UPDATE SET
-            completed = excluded.completed,
-            completed_at = CASE WHEN excluded.completed THEN CURRENT_TIMESTAMP ELSE completed_at END,
-            time_spent_seconds = user_progress.time_spent_seconds + excluded.time_spent_seconds
-    ''', (username, lesson_id, completed, completed, time_spent))
-    
-    conn.commit()
-    conn.close()
+    with get_connection() as conn:
+        conn.execute('''
+            INSERT INTO user_progress (username, lesson_id, completed, completed_at, time_spent_seconds)
+            VALUES (?, ?, ?, CASE WHEN ? THEN CURRENT_TIMESTAMP ELSE NULL END, ?)
+            ON CONFLICT(username, lesson_id) DO UPDATE SET
+                completed = excluded.completed,
+                completed_at = CASE WHEN excluded.completed THEN CURRENT_TIMESTAMP ELSE completed_at END,
+                time_spent_seconds = user_progress.time_spent_seconds + excluded.time_spent_seconds
+        ''', (username, lesson_id, completed, completed, time_spent))
 
 
 def get_completed_lessons_count(username: str) -> int:
     """Get number of completed lessons."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute('''
-        SELECT COUNT(*) FROM user_progress WHERE username = ? AND completed = 1
-    ''', (username,))
-    count = cursor.fetchone()[0]
-    conn.close()
-    return count
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT COUNT(*) FROM user_progress WHERE username = ? AND completed = 1
+        ''', (username,))
+        return cursor.fetchone()[0]
 
 
 # ==================== STATISTICS FUNCTIONS ====================
 
 def get_user_statistics(username: str) -> Optional[Dict]:
     """Get user statistics."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute('SELECT * FROM user_statistics WHERE username = ?', (username,))
-    row = cursor.fetchone()
-    conn.close()
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute('SELECT * FROM user_statistics WHERE username = ?', (username,))
+        row = cursor.fetchone()
     return dict(row) if row else None
 
 
 def increment_plans_generated(username: str):
     """Increment plans generated counter."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute('''
-        UPDATE user_statistics 
-        SET total_plans_generated = total_plans_generated + 1,
-            last_active = CURRENT_TIMESTAMP
-        WHERE username = ?
-    ''', (username,))
-    conn.commit()
-    conn.close()
+    with get_connection() as conn:
+        conn.execute('''
+            UPDATE user_statistics 
+            SET total_plans_generated = total_plans_generated + 1,
+                last_active = CURRENT_TIMESTAMP
+            WHERE username = ?
+        ''', (username,))
 
 
 def increment_problems_solved(username: str, nodes_expanded: int = 0):
     """Increment problems solved counter."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute('''
-        UPDATE user_statistics 
-        SET total_problems_solved = total_problems_solved + 1,
-            total_nodes_expanded = total_nodes_expanded + ?,
-            last_active = CURRENT_TIMESTAMP
-        WHERE username = ?
-    ''', (nodes_expanded, username))
-    conn.commit()
-    conn.close()
+    with get_connection() as conn:
+        conn.execute('''
+            UPDATE user_statistics 
+            SET total_problems_solved = total_problems_solved + 1,
+                total_nodes_expanded = total_nodes_expanded + ?,
+                last_active = CURRENT_TIMESTAMP
+            WHERE username = ?
+        ''', (nodes_expanded, username))
 
 
 def update_favorite_algorithm(username: str, algorithm: str):
     """Update user's favorite algorithm."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute('''
-        UPDATE user_statistics SET favorite_algorithm = ? WHERE username = ?
-    ''', (algorithm, username))
-    conn.commit()
-    conn.close()
+    with get_connection() as conn:
+        conn.execute('''
+            UPDATE user_statistics SET favorite_algorithm = ? WHERE username = ?
+        ''', (algorithm, username))
 
 
 # ==================== ALGORITHM USAGE FUNCTIONS ====================
 
+USAGE_HISTORY_QUERY = '''
+    SELECT * FROM algorithm_usage 
+    WHERE username = ? 
+    ORDER BY used_at DESC 
+    LIMIT ?
+'''
+
+# Counters are maintained incrementally by apply_usage_batch
+MOST_USED_ALGORITHM_QUERY = '''
+    SELECT algorithm, uses 
+    FROM user_algorithm_counts 
+    WHERE username = ? 
+    ORDER BY uses DESC 
+    LIMIT 1
+'''
+
 def log_algorithm_usage(username: str, algorithm: str, heuristic: str, 
                         problem_name: str, nodes_expanded: int, 
                         plan_length: int, search_time_ms: float):
     """Log algorithm usage."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute('''
-        INSERT INTO algorithm_usage 
-        (username, algorithm, heuristic, problem_name, nodes_expanded, plan_length, search_time_ms)
-        VALUES (?, ?, ?, ?, ?, ?, ?)
-    ''', (username, algorithm, heuristic, problem_name, nodes_expanded, plan_length, search_time_ms))
-    conn.commit()
-    conn.close()
+    apply_usage_batch([(username, algorithm, heuristic, problem_name,
+                        nodes_expanded, plan_length, search_time_ms)], {}, {})
+
+
+def apply_usage_batch(usage: List[tuple], plans: Dict[str, int],
+                      solved: Dict[str, tuple]):
+    """
+    Write buffered tracking events in a single transaction.
+    
+    Args:
+        usage: algorithm_usage rows (username, algorithm, heuristic, problem_name,
+               nodes_expanded, plan_length, search_time_ms)
+        plans: username -> plans generated
+        solved: username -> (problems solved, nodes expanded)
+    """
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.executemany('''
+            INSERT INTO algorithm_usage 
+            (username, algorithm, heuristic, problem_name, nodes_expanded, plan_length, search_time_ms)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', usage)
+        
+        counts: Dict[tuple, int] = {}
+        for row in usage:
+            counts[row[0], row[1]] = counts.get((row[0], row[1]), 0) + 1
+        cursor.executemany('''
+            INSERT INTO user_algorithm_counts (username, algorithm, uses) VALUES (?, ?, ?)
+            ON CONFLICT(username, algorithm) DO UPDATE SET uses = uses + excluded.uses
+        ''', [(username, algorithm, n) for (username, algorithm), n in counts.items()])
+        cursor.executemany('''
+            UPDATE user_statistics SET favorite_algorithm = (
+                SELECT algorithm FROM user_algorithm_counts
+                WHERE username = ? ORDER BY uses DESC LIMIT 1
+            )
+            WHERE username = ?
+        ''', [(username, username) for username in {row[0] for row in usage}])
+        
+        cursor.executemany('''
+            UPDATE user_statistics 
+            SET total_plans_generated = total_plans_generated + ?,
+                last_active = CURRENT_TIMESTAMP
+            WHERE username = ?
+        ''', [(n, username) for username, n in plans.items()])
+        cursor.executemany('''
+            UPDATE user_statistics 
+            SET total_problems_solved = total_problems_solved + ?,
+                total_nodes_expanded = total_nodes_expanded + ?,
+                last_active = CURRENT_TIMESTAMP
+            WHERE username = ?
+        ''', [(n, nodes, username) for username, (n, nodes) in solved.items()])
 
 
 def get_algorithm_usage_history(username: str, limit: int = 10) -> List[Dict]:
     """Get recent algorithm usage."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute('''
-        SELECT * FROM algorithm_usage 
-        WHERE username = ? 
-        ORDER BY used_at DESC 
-        LIMIT ?
-    ''', (username, limit))
-    rows = cursor.fetchall()
-    conn.close()
+    with get_connection() as conn:
+        rows = conn.execute(USAGE_HISTORY_QUERY, (username, limit)).fetchall()
     return [dict(row) for row in rows]
 
 
 def get_most_used_algorithm(username: str) -> Optional[str]:
     """Get user's most used algorithm."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute('''
-        SELECT algorithm, COUNT(*) as count 
-        FROM algorithm_usage 
-        WHERE username = ? 
-        GROUP BY algorithm 
-        ORDER BY count DESC 
-        LIMIT 1
-    ''', (username,))
-    row = cursor.fetchone()
-    conn.close()
+    with get_connection() as conn:
+        row = conn.execute(MOST_USED_ALGORITHM_QUERY, (username,)).fetchone()
     return row['algorithm'] if row else None
 
 
+# ==================== CONTENT BLOBS ====================
+
+# Project contents live in content_blobs, compressed and stored once per
+# distinct text; user_projects.content is left empty once migrated.
+BLOB_COMPRESSION_LEVEL = 6
+MAX_VERSIONS_PER_PROJECT = 50
+BLOB_BATCH_SIZE = 500  # Hashes per IN (...) lookup
+
+
+def content_hash(content: str) -> str:
+    """Address of a content blob."""
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+def _store_blob(cursor, content: str) -> str:
+    """
+    Store content unless an identical blob exists; returns its hash.
+    
+    Call inside a write_transaction that also stores the reference, so
+    collect_garbage_blobs cannot delete the blob in between.
+    """
+    digest = content_hash(content)
+    cursor.execute('SELECT 1 FROM content_blobs WHERE hash = ?', (digest,))
+    if cursor.fetchone() is None:
+        encoded = content.encode()
+        cursor.execute('''
+            INSERT OR IGNORE INTO content_blobs (hash, data, size) VALUES (?, ?, ?)
+        ''', (digest, zlib.compress(encoded, BLOB_COMPRESSION_LEVEL), len(encoded)))
+    return digest
+
+
+def _load_blob(data: bytes) -> str:
+    return zlib.decompress(data).decode()
+
+
+def _project_dict(row) -> Dict:
+    """Project row joined with its blob (column `blob`) -> dict with `content`."""
+    project = dict(row)
+    blob = project.pop('blob', None)
+    if blob is not None:
+        project['content'] = _load_blob(blob)
+    return project
+
+
+def get_blob_contents(hashes: List[str]) -> Dict[str, str]:
+    """Contents of the given blobs, by hash."""
+    hashes = list(dict.fromkeys(hashes))
+    contents = {}
+    with get_connection() as conn:
+        for start in range(0, len(hashes), BLOB_BATCH_SIZE):
+            batch = hashes[start:start + BLOB_BATCH_SIZE]
+            rows = conn.execute(f'SELECT hash, data FROM content_blobs WHERE hash IN '
+                                f'({", ".join("?" * len(batch))})', batch).fetchall()
+            contents.update((row['hash'], _load_blob(row['data'])) for row in rows)
+    return contents
+
+
+def _move_contents_to_blobs(cursor):
+    """Migration step: move inline project contents into content_blobs."""
+    cursor.execute('SELECT id, content FROM user_projects WHERE content_hash IS NULL')
+    for project_id, content in cursor.fetchall():
+        digest = _store_blob(cursor, content)
+        cursor.execute('''
+            UPDATE user_projects SET content_hash = ?, content = '' WHERE id = ?
+        ''', (digest, project_id))
+
+
+def collect_garbage_blobs() -> int:
+    """Delete blobs no project or version references; returns the number deleted."""
+    with write_transaction() as conn:
+        cursor = conn.cursor()
+        cursor.execute('''
+            DELETE FROM content_blobs
+            WHERE hash NOT IN (SELECT content_hash FROM user_projects WHERE content_hash IS NOT NULL)
+              AND hash NOT IN (SELECT content_hash FROM project_versions)
+        ''')
+    return cursor.rowcount
+
+
 # ==================== PROJECT FUNCTIONS ====================
 
+# Listing columns without the PDDL content
+PROJECT_SUMMARY_COLUMNS = (
+    'p.id, p.username, p.project_name, p.project_type, p.folder_path, '
+    'p.is_shared, p.share_id, p.content_hash, p.created_at, p.updated_at'
+)
+
+# Project rows with their content blob, for _project_dict
+PROJECT_WITH_BLOB = '''
+    SELECT p.*, b.data AS blob FROM user_projects p
+    LEFT JOIN content_blobs b ON b.hash = p.content_hash
+'''
+
+
+def user_projects_query(after: bool = False, limit: bool = False,
+                        include_content: bool = True) -> str:
+    """Project listing query, newest first; `after` continues from an (updated_at, id) key."""
+    if include_content:
+        sql = PROJECT_WITH_BLOB
+    else:
+        sql = f'SELECT {PROJECT_SUMMARY_COLUMNS} FROM user_projects p'
+    sql += ' WHERE p.username = ? AND p.folder_path = ?'
+    if after:
+        sql += ' AND (p.updated_at, p.id) < (?, ?)'
+    sql += ' ORDER BY p.updated_at DESC, p.id DESC'
+    if limit:
+        sql += ' LIMIT ?'
+    return sql
+
+
 def create_project(username: str, project_name: str, project_type: str, 
                    content: str, folder_path: str = '') -> Optional[int]:
     """Create a new project."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
     try:
-        cursor.execute('''
-            INSERT INTO user_projects (username, project_name, project_type, folder_path, content)
-            VALUES (?, ?, ?, ?, ?)
-        ''', (username, project_name, project_type, folder_path, content))
-        
-        project_id = cursor.lastrowid
-        conn.commit()
-        return project_id
+        with write_transaction() as conn:
+            cursor = conn.cursor()
+            digest = _store_blob(cursor, content)
+            cursor.execute('''
+                INSERT INTO user_projects (username, project_name, project_type, folder_path, content, content_hash)
+                VALUES (?, ?, ?, ?, '', ?)
+            ''', (username, project_name, project_type, folder_path, digest))
+        return cursor.lastrowid
     except sqlite3.IntegrityError:
         return None
-    finally:
-        conn.close()
 
 
 def get_user_projects(username: str, folder_path: str = '') -> List[Dict]:
     """Get all projects for a user in a folder."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute('''
-        SELECT * FROM user_projects 
-        WHERE username = ? AND folder_path = ?
-        ORDER BY updated_at DESC
-    ''', (username, folder_path))
-    rows = cursor.fetchall()
-    conn.close()
-    return [dict(row) for row in rows]
+    return get_user_projects_page(username, folder_path)
+
+
+def get_user_projects_page(username: str, folder_path: str = '', limit: Optional[int] = None,
+                           after: Optional[tuple] = None,
+                           include_content: bool = True) -> List[Dict]:
+    """
+    Get one page of a folder's projects, newest first.
+    
+    Args:
+        limit: Page size; None returns the rest of the folder
+        after: (updated_at, id) of the last project of the previous page
+        include_content: False leaves out the PDDL content
+    """
+    params = [username, folder_path]
+    if after is not None:
+        params.extend(after)
+    if limit is not None:
+        params.append(limit)
+    with get_connection() as conn:
+        rows = conn.execute(user_projects_query(after is not None, limit is not None, include_content),
+                            params).fetchall()
+    return [_project_dict(row) for row in rows]
 
 
 def get_project(project_id: int) -> Optional[Dict]:
     """Get a specific project."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute('SELECT * FROM user_projects WHERE id = ?', (project_id,))
-    row = cursor.fetchone()
-    conn.close()
+    with get_connection() as conn:
+        row = conn.execute(PROJECT_WITH_BLOB + ' WHERE p.id = ?', (project_id,)).fetchone()
+    return _project_dict(row) if row else None
+
+
+def get_project_summary(project_id: int) -> Optional[Dict]:
+    """Get a specific project without its content."""
+    with get_connection() as conn:
+        row = conn.execute(f'SELECT {PROJECT_SUMMARY_COLUMNS} FROM user_projects p WHERE p.id = ?',
+                           (project_id,)).fetchone()
     return dict(row) if row else None
 
 
 def update_project(project_id: int, content: str, project_name: str = None) -> bool:
-    """Update a project."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    if project_name:
-        cursor.execute('''
-            UPDATE user_projects 
-            SET content = ?, project_name = ?, updated_at = CURRENT_TIMESTAMP
-            WHERE id = ?
-        ''', (content, project_name, project_id))
-    else:
+    """Update a project, keeping its previous content as a version."""
+    with write_transaction() as conn:
+        cursor = conn.cursor()
+        digest = _store_blob(cursor, content)
         cursor.execute('''
-            UPDATE user_projects 
-            SET content = ?, updated_at = CURRENT_TIMESTAMP
-            WHERE id = ?
-        ''', (content, project_id))
-    
-    success = cursor.rowcount > 0
-    conn.commit()
-    conn.close()
-    return success
+            INSERT INTO project_versions (project_id, content_hash, project_name)
+            SELECT id, content_hash, project_name FROM user_projects
+            WHERE id = ? AND content_hash IS NOT NULL AND content_hash != ?
+        ''', (project_id, digest))
+        if cursor.rowcount:
+            cursor.execute('''
+                DELETE FROM project_versions WHERE project_id = ? AND id NOT IN (
+                    SELECT id FROM project_versions WHERE project_id = ? ORDER BY id DESC LIMIT ?
+                )
+            ''', (project_id, project_id, MAX_VERSIONS_PER_PROJECT))
+        
+        if project_name:
+            cursor.execute('''
+                UPDATE user_projects 
+                SET content_hash = ?, project_name = ?, updated_at = CURRENT_TIMESTAMP
+                WHERE id = ?
+            ''', (digest, project_name, project_id))
+        else:
+            cursor.execute('''
+                UPDATE user_projects 
+                SET content_hash = ?, updated_at = CURRENT_TIMESTAMP
+                WHERE id = ?
+            ''', (digest, project_id))
+    return cursor.rowcount > 0
 
 
 def delete_project(project_id: int) -> bool:
-    """Delete a project."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute('DELETE FROM user_projects WHERE id = ?', (project_id,))
-    success = cursor.rowcount > 0
-    conn.commit()
-    conn.close()
-    return success
+    """Delete a project and its versions (blobs are collected by maintenance)."""
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute('DELETE FROM project_versions WHERE project_id = ?', (project_id,))
+        cursor.execute('DELETE FROM user_projects WHERE id = ?', (project_id,))
+    return cursor.rowcount > 0
+
+
+def get_project_versions(project_id: int) -> List[Dict]:
+    """Previous versions of a project, newest first."""
+    with get_connection() as conn:
+        rows = conn.execute('''
+            SELECT v.id, v.project_name, v.content_hash, b.size, v.created_at
+            FROM project_versions v JOIN content_blobs b ON b.hash = v.content_hash
+            WHERE v.project_id = ?
+            ORDER BY v.id DESC
+        ''', (project_id,)).fetchall()
+    return [dict(row) for row in rows]
+
+
+def get_project_version(project_id: int, version_id: int) -> Optional[Dict]:
+    """One previous version of a project, with its content."""
+    with get_connection() as conn:
+        row = conn.execute('''
+            SELECT v.id, v.project_name, v.content_hash, b.size, v.created_at, b.data AS blob
+            FROM project_versions v JOIN content_blobs b ON b.hash = v.content_hash
+            WHERE v.project_id = ? AND v.id = ?
+        ''', (project_id, version_id)).fetchone()
+    return _project_dict(row) if row else None
 
 
 def share_project(project_id: int, share_id: str) -> bool:
     """Make a project shareable."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute('''
-        UPDATE user_projects 
-        SET is_shared = 1, share_id = ?
-        WHERE id = ?
-    ''', (share_id, project_id))
-    success = cursor.rowcount > 0
-    conn.commit()
-    conn.close()
-    return success
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute('''
+            UPDATE user_projects 
+            SET is_shared = 1, share_id = ?
+            WHERE id = ?
+        ''', (share_id, project_id))
+    return cursor.rowcount > 0
 
 
 def get_shared_project(share_id: str) -> Optional[Dict]:
     """Get a shared project by share ID."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute('''
-        SELECT * FROM user_projects 
-        WHERE share_id = ? AND is_shared = 1
-    ''', (share_id,))
-    row = cursor.fetchone()
-    conn.close()
-    return dict(row) if row else None
+    with get_connection() as conn:
+        row = conn.execute(PROJECT_WITH_BLOB + ' WHERE p.share_id = ? AND p.is_shared = 1',
+                           (share_id,)).fetchone()
+    return _project_dict(row) if row else None
 
 
 def get_all_users_count() -> int:
     """Get total user count."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute('SELECT COUNT(*) FROM users')
-    count = cursor.fetchone()[0]
-    conn.close()
-    return count
-
+    with get_connection() as conn:
+        return conn.execute('SELECT COUNT(*) FROM users').fetchone()[0]
 
-# Initialize database on module import
-init_db()
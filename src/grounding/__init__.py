@@ -1,4 +1,5 @@
 """Grounding module for converting lifted to grounded representations."""
 from .grounder import Grounder
+from .sas_translator import translate
 
-__all__ = ["Grounder"]
+__all__ = ["Grounder", "translate"]
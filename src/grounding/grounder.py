@@ -7,6 +7,7 @@ from ..representations.domain import Domain
 from ..representations.action import Action, ActionSchema
 from ..representations.task import Task
 from ..representations.state import State
+from .invariants import find_invariants, ground_mutex_groups
 
 
 class Grounder:
@@ -39,7 +40,7 @@ class Grounder:
             actions = self._ground_schema(schema)
             grounded_actions.extend(actions)
         
-        return Task(
+        task = Task(
             name=self.task_name,
             domain_name=self.domain.name,
             objects=self.objects,
@@ -47,6 +48,36 @@ class Grounder:
             goal=self.goal,
             actions=grounded_actions
         )
+        
+        # Mutex groups from lifted invariants; actions needing two facts
+        # of one group can never be applied
+        task.mutex_groups = ground_mutex_groups(find_invariants(self.domain), task)
+        task.actions = self._prune_mutex_actions(task.actions, task.mutex_groups)
+        return task
+    
+    @staticmethod
+    def _prune_mutex_actions(actions: List[Action], mutex_groups: List[List[str]]) -> List[Action]:
+        """Drop actions whose preconditions contain two facts of one mutex group."""
+        groups_of: Dict[str, List[int]] = {}
+        for group_id, group in enumerate(mutex_groups):
+            for fact in group:
+                groups_of.setdefault(fact, []).append(group_id)
+        
+        result = []
+        for action in actions:
+            seen = set()
+            consistent = True
+            for pre in action.preconditions:
+                for group_id in groups_of.get(pre, ()):
+                    if group_id in seen:
+                        consistent = False
+                        break
+                    seen.add(group_id)
+                if not consistent:
+                    break
+            if consistent:
+                result.append(action)
+        return result
     
     def _ground_schema(self, schema: ActionSchema) -> List[Action]:
         """
@@ -0,0 +1,205 @@
+"""Lifted invariant synthesis and mutex groups (after Helmert, 2009)."""
+from __future__ import annotations
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from itertools import combinations, product
+from typing import Dict, Iterator, List, Set, Tuple
+
+from ..representations.domain import Domain
+from ..representations.action import ActionSchema
+from ..representations.task import Task
+
+Atom = Tuple[str, Tuple[str, ...]]  # (predicate, args) as in ActionSchema
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class InvariantPart:
+    """
+    One predicate of an invariant.
+    order[i] is the argument position holding invariant parameter i;
+    omitted is the position of the counted argument, if any.
+    """
+    predicate: str
+    order: Tuple[int, ...]
+    omitted: int | None = None
+
+    def parameters(self, args: Tuple[str, ...]) -> Tuple[str, ...]:
+        """Invariant parameters of an atom of this part."""
+        return tuple(args[i] for i in self.order)
+
+    def matches_arity(self, args: Tuple[str, ...]) -> bool:
+        return len(args) == len(self.order) + (self.omitted is not None)
+
+
+@dataclass(frozen=True)
+class Invariant:
+    """
+    A set of parts such that, for every binding of the invariant
+    parameters, at most one matching atom is true in any reachable state
+    (provided that holds in the initial state).
+
+    Example: {on(X, *), ontable(X), holding(X)} - a block is in one place.
+    """
+    parts: Tuple[InvariantPart, ...]
+
+    def part_for(self, predicate: str) -> InvariantPart | None:
+        for part in self.parts:
+            if part.predicate == predicate:
+                return part
+        return None
+
+    def with_part(self, part: InvariantPart) -> Invariant:
+        return Invariant(tuple(sorted(self.parts + (part,), key=lambda p: p.predicate)))
+
+
+def find_invariants(domain: Domain, max_candidates: int = 5000,
+                    max_time: float | None = None) -> List[Invariant]:
+    """
+    Synthesize invariants of a domain from its action schemas.
+
+    Starts with one candidate per fluent predicate (and per counted argument)
+    and checks that no action can make two atoms of one instance true:
+    every add effect must delete a precondition atom of the same instance.
+    Candidates failing because of an unbalanced add effect are refined with
+    the predicates that action deletes.
+
+    The search is bounded by max_candidates, so the result depends only on
+    the domain. max_time optionally adds a wall-clock limit; a truncated run
+    is logged, since the invariants (and every mutex group, SAS+ variable
+    and PDB derived from them) then depend on machine load.
+    """
+    start = time.time()
+    schemas = list(domain.action_schemas.values())
+    fluents: Dict[str, int] = {}
+    for schema in schemas:
+        for pred, args in schema.add_effects + schema.del_effects:
+            fluents[pred] = len(args)
+
+    queue = deque()
+    for pred, arity in sorted(fluents.items()):
+        queue.append(Invariant((InvariantPart(pred, tuple(range(arity))),)))
+        for omitted in range(arity):
+            order = tuple(i for i in range(arity) if i != omitted)
+            queue.append(Invariant((InvariantPart(pred, order, omitted),)))
+    seen = set(queue)
+
+    invariants = []
+    while queue:
+        if max_time is not None and time.time() - start >= max_time:
+            logger.warning("Invariant synthesis for %s stopped after %.1fs with %d candidates left",
+                           domain.name, max_time, len(queue))
+            break
+        candidate = queue.popleft()
+        refinements = None
+        for schema in schemas:
+            refinements = _check_schema(candidate, schema)
+            if refinements is not None:
+                break
+        if refinements is None:
+            # Single atoms per instance are trivially invariant
+            if len(candidate.parts) > 1 or candidate.parts[0].omitted is not None:
+                invariants.append(candidate)
+            continue
+        for refined in refinements:
+            if refined not in seen and len(seen) < max_candidates:
+                seen.add(refined)
+                queue.append(refined)
+    return invariants
+
+
+def _check_schema(candidate: Invariant, schema: ActionSchema) -> List[Invariant] | None:
+    """
+    Check an action schema against a candidate.
+    Returns None if the schema keeps the invariant, otherwise the candidate
+    refinements that might fix it (empty if none can).
+    """
+    pre = set(schema.preconditions)
+    dels = set(schema.del_effects)
+    # Atoms both added and deleted end up false
+    adds = [(e, part) for e in schema.add_effects if e not in dels
+            for part in [candidate.part_for(e[0])]
+            if part is not None and part.matches_arity(e[1])]
+
+    # Too heavy: two add effects that may fall into the same instance
+    for (e1, p1), (e2, p2) in combinations(adds, 2):
+        if e1 != e2 and _may_unify(p1.parameters(e1[1]), p2.parameters(e2[1])):
+            return []
+
+    for effect, part in adds:
+        if effect in pre:
+            continue  # Already true; the instance count is unchanged
+        params = part.parameters(effect[1])
+        if any(_deletes_from_instance(candidate, d, params) and d in pre for d in dels):
+            continue
+        refinements = []
+        for d in sorted(dels & pre):
+            if candidate.part_for(d[0]) is None:
+                for new_part in _parts_matching(d, params):
+                    refinements.append(candidate.with_part(new_part))
+        return refinements
+    return None
+
+
+def _deletes_from_instance(candidate: Invariant, atom: Atom, params: Tuple[str, ...]) -> bool:
+    """True if the atom certainly belongs to the instance with these parameters."""
+    part = candidate.part_for(atom[0])
+    return part is not None and part.matches_arity(atom[1]) and part.parameters(atom[1]) == params
+
+
+def _parts_matching(atom: Atom, params: Tuple[str, ...]) -> Iterator[InvariantPart]:
+    """Parts for the atom's predicate that map it to the instance with these parameters."""
+    pred, args = atom
+    if len(args) - len(params) not in (0, 1):
+        return
+    positions = [[i for i, arg in enumerate(args) if arg == param] for param in params]
+    for order in product(*positions):
+        if len(set(order)) != len(order):
+            continue
+        rest = [i for i in range(len(args)) if i not in order]
+        yield InvariantPart(pred, tuple(order), rest[0] if rest else None)
+
+
+def _may_unify(params1: Tuple[str, ...], params2: Tuple[str, ...]) -> bool:
+    """Whether two parameter tuples can denote the same instance for some grounding."""
+    return all(a == b or a.startswith("?") or b.startswith("?")
+               for a, b in zip(params1, params2))
+
+
+def parse_fact(fact: str) -> Atom:
+    """Split a grounded fact such as "on(a,b)" into ("on", ("a", "b"))."""
+    if "(" not in fact:
+        return fact, ()
+    name, rest = fact.split("(", 1)
+    args = rest.rstrip(")")
+    return name, tuple(args.split(",")) if args else ()
+
+
+def ground_mutex_groups(invariants: List[Invariant], task: Task) -> List[List[str]]:
+    """
+    Instantiate invariants over the task's facts.
+    Returns the groups of at least two facts whose instance holds at most one
+    fact in the initial state.
+    """
+    init = task.initial_state.predicates
+    facts = [(fact, parse_fact(fact)) for fact in task.get_facts()]
+    groups: List[List[str]] = []
+    seen: Set[Tuple[str, ...]] = set()
+    for invariant in invariants:
+        instances: Dict[Tuple[str, ...], List[str]] = {}
+        for fact, (pred, args) in facts:
+            part = invariant.part_for(pred)
+            if part is not None and part.matches_arity(args):
+                instances.setdefault(part.parameters(args), []).append(fact)
+        for group in instances.values():
+            key = tuple(sorted(group))
+            if len(key) < 2 or key in seen:
+                continue
+            if sum(1 for fact in key if fact in init) > 1:
+                continue
+            seen.add(key)
+            groups.append(list(key))
+    return groups
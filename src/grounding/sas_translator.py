@@ -0,0 +1,110 @@
+"""Translation of grounded STRIPS tasks to SAS+."""
+from __future__ import annotations
+from typing import Dict, List, Set
+
+from ..representations.action import Action
+from ..representations.sas_task import NONE_OF_THOSE, SASOperator, SASTask, SASVariable
+from ..representations.task import Task
+
+
+def get_sas_task(task: Task) -> SASTask:
+    """Return the task's SAS+ translation, computing it on first use."""
+    sas_task = task.cache.get("sas_task")
+    if sas_task is None:
+        sas_task = translate(task)
+        task.cache["sas_task"] = sas_task
+    return sas_task
+
+
+def translate(task: Task) -> SASTask:
+    """
+    Translate a STRIPS task into SAS+.
+
+    Mutex groups are chosen greedily, largest first, to cover the facts with
+    multi-valued variables; facts left over become binary variables.
+    """
+    facts = task.get_facts()
+    groups = _choose_variables(task, facts)
+
+    variables = []
+    for group in groups:
+        values = list(group)
+        if len(group) == 1 or _needs_none_value(task, group):
+            values.append(NONE_OF_THOSE)
+        name = f"var{len(variables)}"
+        variables.append(SASVariable(name, values))
+
+    sas_task = SASTask(task.name, variables, [], [])
+    sas_task.initial_state = sas_task.encode(task.initial_state.predicates)
+    sas_task.goal = sorted(sas_task.fact_to_value[fact] for fact in task.goal)
+    sas_task.operators = [_translate_action(sas_task, action) for action in task.actions]
+    return sas_task
+
+
+def _choose_variables(task: Task, facts: List[str]) -> List[List[str]]:
+    """Cover the facts with disjoint mutex groups, then singletons."""
+    remaining = [set(group) for group in task.mutex_groups
+                 if _is_translatable(task, set(group))]
+    covered: Set[str] = set()
+    chosen = []
+    while remaining:
+        best = max(remaining, key=len)
+        if len(best) < 2:
+            break
+        chosen.append(sorted(best))
+        covered |= best
+        remaining = [group - best for group in remaining]
+        remaining = [group for group in remaining if len(group) >= 2]
+    chosen.extend([fact] for fact in facts if fact not in covered)
+    return chosen
+
+
+def _is_translatable(task: Task, group: Set[str]) -> bool:
+    """
+    A group can be one variable if every action that deletes one of its
+    facts either requires that fact or adds another fact of the group, so
+    the effect does not depend on which value the variable had.
+    """
+    for action in task.actions:
+        for fact in action.del_effects & group:
+            if fact not in action.preconditions and not (action.add_effects - action.del_effects) & group:
+                return False
+    return True
+
+
+def _needs_none_value(task: Task, group: List[str]) -> bool:
+    """Whether a state can make none of the group's facts true."""
+    group_set = set(group)
+    if not group_set & task.initial_state.predicates:
+        return True
+    for action in task.actions:
+        if action.del_effects & group_set and not (action.add_effects - action.del_effects) & group_set:
+            return True
+    return False
+
+
+def _translate_action(sas_task: SASTask, action: Action) -> SASOperator:
+    """Translate a STRIPS action to an operator over the task's variables."""
+    fact_to_value = sas_task.fact_to_value
+    preconditions: Dict[int, int] = {}
+    for fact in action.preconditions:
+        var, value = fact_to_value[fact]
+        preconditions[var] = value
+
+    effects: Dict[int, int] = {}
+    for fact in action.del_effects:
+        var, value = fact_to_value[fact]
+        if preconditions.get(var, value) != value:
+            continue  # Another value is required, so the fact is already false
+        effects[var] = sas_task.variables[var].none_value()
+    for fact in action.add_effects - action.del_effects:
+        var, value = fact_to_value[fact]
+        effects[var] = value
+    effects = {var: value for var, value in effects.items()
+               if preconditions.get(var) != value}
+
+    return SASOperator(
+        name=action.name,
+        preconditions=tuple(sorted(preconditions.items())),
+        effects=tuple(sorted(effects.items()))
+    )
@@ -0,0 +1,46 @@
+"""Per-phase wall time and call count instrumentation."""
+from __future__ import annotations
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+
+class PhaseTimer:
+    """
+    Accumulates wall time and call counts for named request phases
+    (parse, ground, search, ...).
+
+    A disabled timer records nothing, so phases can be wrapped
+    unconditionally at negligible cost.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._times: Dict[str, float] = {}
+        self._calls: Dict[str, int] = {}
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as one call of a phase."""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def add(self, name: str, seconds: float, calls: int = 1) -> None:
+        """Record time measured elsewhere, e.g. heuristic time inside search."""
+        if not self.enabled:
+            return
+        self._times[name] = self._times.get(name, 0.0) + seconds
+        self._calls[name] = self._calls.get(name, 0) + calls
+
+    def report(self) -> Dict[str, Dict[str, float]]:
+        """Phases in recording order as {name: {"time_ms": ..., "calls": ...}}."""
+        return {
+            name: {"time_ms": seconds * 1000, "calls": self._calls[name]}
+            for name, seconds in self._times.items()
+        }
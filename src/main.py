@@ -1,13 +1,51 @@
 """FastAPI main application."""
+import time
+_import_start = time.perf_counter()
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
 from pathlib import Path
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import FileResponse, JSONResponse, Response
 
 from .config import get_settings
+from . import metrics
+from .async_db import run_write
+from .database import init_db
+from .usage_buffer import usage_buffer
+from .benchmark_index import get_benchmark_index, warm_task_cache
 from .api.routes import planner, validation, domains, auth, progress, projects
 
+# uvicorn configures this logger, so startup lines appear next to its own
+logger = logging.getLogger("uvicorn.error")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Set up the database and index the benchmarks (and, with warm_benchmarks,
+    warm the task cache in the background); run the usage write-behind flusher
+    and flush what is left on shutdown.
+    """
+    start = time.perf_counter()
+    await run_write(init_db)
+    index = get_benchmark_index()
+    if get_settings().warm_benchmarks:
+        asyncio.get_running_loop().run_in_executor(None, warm_task_cache, index)
+    flusher = asyncio.create_task(usage_buffer.run())
+    startup_seconds = time.perf_counter() - start
+    metrics.STARTUP_SECONDS.set(startup_seconds, phase="startup")
+    logger.info("Application imported in %.0f ms, started in %.0f ms",
+                _import_seconds * 1000, startup_seconds * 1000)
+    try:
+        yield
+    finally:
+        flusher.cancel()
+        await usage_buffer.flush()
+
 
 def create_app() -> FastAPI:
     """Create and configure FastAPI application."""
@@ -17,7 +55,8 @@ def create_app() -> FastAPI:
         title=settings.app_name,
         description="Domain-Independent Classical Planning Workbench",
         version="0.1.0",
-        debug=settings.debug
+        debug=settings.debug,
+        lifespan=lifespan
     )
     
     # CORS middleware - must be first
@@ -29,6 +68,23 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
     
+    @app.middleware("http")
+    async def record_request_metrics(request: Request, call_next):
+        """Count requests and record latency per route template."""
+        start = time.perf_counter()
+        status = 500
+        try:
+            response = await call_next(request)
+            status = response.status_code
+            return response
+        finally:
+            # The matched route's template keeps label cardinality bounded
+            route = request.scope.get("route")
+            route_path = getattr(route, "path", "unmatched")
+            metrics.HTTP_LATENCY.observe(time.perf_counter() - start,
+                                         method=request.method, route=route_path)
+            metrics.HTTP_REQUESTS.inc(method=request.method, route=route_path, status=str(status))
+    
     # API routes first (before catch-all)
     app.include_router(auth.router)
     app.include_router(planner.router)
@@ -42,6 +98,11 @@ def create_app() -> FastAPI:
         """Health check endpoint."""
         return {"status": "healthy"}
     
+    @app.get("/api/metrics")
+    async def service_metrics():
+        """Service metrics in the Prometheus text format."""
+        return Response(content=metrics.render(), media_type=metrics.CONTENT_TYPE)
+    
     # Serve static frontend files last
     frontend_dir = Path(__file__).parent.parent / "frontend" / "dist"
     if frontend_dir.exists():
@@ -75,6 +136,10 @@ def create_app() -> FastAPI:
 
 app = create_app()
 
+# Modules the app needs to serve its first request; the planning stack loads on first use
+_import_seconds = time.perf_counter() - _import_start
+metrics.STARTUP_SECONDS.set(_import_seconds, phase="import")
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
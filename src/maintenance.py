@@ -0,0 +1,105 @@
+"""
+Database maintenance: apply migrations, refresh planner statistics and check
+that the hot per-user queries are served by indexes.
+
+Usage:
+    python -m src.maintenance              # migrate, ANALYZE, check query plans
+    python -m src.maintenance --no-analyze # migrate and check query plans, without ANALYZE
+    python -m src.maintenance --vacuum     # also drop unreferenced content blobs and VACUUM
+
+Exits with status 1 when a checked query falls back to a full table scan.
+"""
+from __future__ import annotations
+import argparse
+import sqlite3
+import sys
+from typing import Dict, List, Tuple
+
+from .database import (
+    MIGRATIONS, MOST_USED_ALGORITHM_QUERY, USAGE_HISTORY_QUERY,
+    collect_garbage_blobs, get_connection, get_schema_version, user_projects_query,
+)
+
+# Query name -> (sql, sample parameters)
+HOT_QUERIES: Dict[str, Tuple[str, tuple]] = {
+    "get_user_projects": (user_projects_query(), ("user", "")),
+    "get_user_projects_page": (user_projects_query(after=True, limit=True, include_content=False),
+                               ("user", "", "2024-01-01 00:00:00", 1, 50)),
+    "get_algorithm_usage_history": (USAGE_HISTORY_QUERY, ("user", 10)),
+    "get_most_used_algorithm": (MOST_USED_ALGORITHM_QUERY, ("user",)),
+    "get_user_progress": ("SELECT * FROM user_progress WHERE username = ? ORDER BY completed_at DESC",
+                          ("user",)),
+    "get_user_by_email": ("SELECT * FROM users WHERE email = ?", ("user@example.com",)),
+}
+
+
+def analyze(conn) -> None:
+    """Refresh the statistics the SQLite query planner uses to pick indexes."""
+    conn.execute("ANALYZE")
+    conn.execute("PRAGMA optimize")
+    conn.commit()
+
+
+def explain(conn, sql: str, params: tuple) -> List[str]:
+    """EXPLAIN QUERY PLAN detail lines of a query."""
+    return [row[-1] for row in conn.execute("EXPLAIN QUERY PLAN " + sql, params).fetchall()]
+
+
+def is_full_scan(detail: str) -> bool:
+    """Whether a plan step reads a whole table instead of using an index."""
+    return detail.startswith("SCAN ") and " USING " not in detail
+
+
+def schema_copy(conn) -> sqlite3.Connection:
+    """
+    Empty in-memory database with the same tables and indexes.
+    
+    Without ANALYZE statistics the planner picks indexes by availability, not by
+    current table sizes, which shows how the queries behave once tables grow.
+    """
+    copy = sqlite3.connect(":memory:")
+    for (sql,) in conn.execute("SELECT sql FROM sqlite_master WHERE sql IS NOT NULL "
+                               "AND name NOT LIKE 'sqlite_%' ORDER BY type = 'index'"):
+        copy.execute(sql)
+    return copy
+
+
+def check_query_plans(conn) -> Dict[str, List[str]]:
+    """Plans of all HOT_QUERIES; prints them and returns those with full scans."""
+    problems = {}
+    schema = schema_copy(conn)
+    for name, (sql, params) in HOT_QUERIES.items():
+        plan = explain(schema, sql, params)
+        scans = [detail for detail in plan if is_full_scan(detail)]
+        print(f"{'SCAN' if scans else 'ok':4}  {name}")
+        for detail in plan:
+            print(f"        {detail}")
+        if scans:
+            problems[name] = scans
+    return problems
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m src.maintenance", description=__doc__.splitlines()[1])
+    parser.add_argument("--no-analyze", action="store_true", help="Skip ANALYZE")
+    parser.add_argument("--vacuum", action="store_true",
+                        help="Delete unreferenced content blobs and rebuild the database file")
+    args = parser.parse_args(argv)
+
+    conn = get_connection()  # Applies pending migrations
+    if not args.no_analyze:
+        analyze(conn)
+    if args.vacuum:
+        print(f"Deleted {collect_garbage_blobs()} unreferenced content blobs")
+        conn.execute("VACUUM")
+    print(f"Schema version {get_schema_version()} of {MIGRATIONS[-1][0]}\n")
+
+    problems = check_query_plans(conn)
+    if problems:
+        print(f"\n{len(problems)} queries use full table scans: {', '.join(problems)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
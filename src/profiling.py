@@ -0,0 +1,131 @@
+"""
+Per-run profiling with artifacts for offline analysis.
+
+Two profilers are available:
+    cprofile  deterministic; saved as a .pstats file (pstats, snakeviz)
+    sampling  samples the profiled thread's stack at a fixed interval; saved
+              as collapsed stacks (.collapsed), the format py-spy writes
+              and flamegraph.pl / speedscope read
+"""
+from __future__ import annotations
+import cProfile
+import hashlib
+import io
+import pstats
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+PROFILERS = ("cprofile", "sampling")
+DEFAULT_SAMPLE_INTERVAL = 0.001  # Seconds between stack samples
+
+_EXTENSIONS = {"cprofile": ".pstats", "sampling": ".collapsed"}
+
+
+def problem_hash(domain_pddl: str, problem_pddl: str) -> str:
+    """Stable identifier of a domain/problem pair."""
+    digest = hashlib.sha256()
+    digest.update(domain_pddl.encode())
+    digest.update(b"\0")
+    digest.update(problem_pddl.encode())
+    return digest.hexdigest()
+
+
+def artifact_name(algorithm: str, heuristic: str, problem_digest: str, profiler: str) -> str:
+    """File name tagging an artifact with its run: time, algorithm, heuristic, problem."""
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+    parts = [stamp, algorithm, heuristic, problem_digest[:12]]
+    name = "-".join(re.sub(r"[^A-Za-z0-9_.]", "_", part) for part in parts)
+    return name + _EXTENSIONS[profiler]
+
+
+class Profile:
+    """
+    Context manager profiling the enclosed block in the current thread.
+
+    Example:
+        with Profile("sampling") as profile:
+            algorithm.search()
+        profile.save(directory / name)
+    """
+
+    def __init__(self, profiler: str = "cprofile", interval: float = DEFAULT_SAMPLE_INTERVAL):
+        if profiler not in PROFILERS:
+            raise ValueError(f"Unknown profiler: {profiler}")
+        self.profiler = profiler
+        self.interval = interval
+        self.elapsed = 0.0
+        self._profile: Optional[cProfile.Profile] = None
+        self._samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+
+    def __enter__(self) -> Profile:
+        self._start = time.perf_counter()
+        if self.profiler == "cprofile":
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        else:
+            target = threading.get_ident()
+            self._sampler = threading.Thread(target=self._sample, args=(target,), daemon=True)
+            self._sampler.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        if self._profile is not None:
+            self._profile.disable()
+        if self._sampler is not None:
+            self._stop.set()
+            self._sampler.join()
+        self.elapsed = time.perf_counter() - self._start
+
+    def _sample(self, target: int) -> None:
+        """Sampler thread: record the target thread's stack until stopped."""
+        own_file = __file__
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(target)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                if code.co_filename != own_file:
+                    stack.append(f"{code.co_name} ({_short_path(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack and not self._stop.is_set():
+                self._samples[";".join(reversed(stack))] += 1
+
+    def save(self, path: Path) -> Path:
+        """Write the artifact (pstats dump or collapsed stacks)."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if self._profile is not None:
+            self._profile.dump_stats(str(path))
+        else:
+            path.write_text("".join(f"{stack} {count}\n" for stack, count in self._samples.most_common()))
+        return path
+
+    def summary(self, limit: int = 20) -> str:
+        """Human-readable top functions: cumulative time, or self samples when sampling."""
+        if self._profile is not None:
+            out = io.StringIO()
+            stats = pstats.Stats(self._profile, stream=out)
+            stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(limit)
+            return out.getvalue()
+
+        total = sum(self._samples.values())
+        leaves: Counter = Counter()
+        for stack, count in self._samples.items():
+            leaves[stack.rsplit(";", 1)[-1]] += count
+        lines = [f"{total} samples at {self.interval * 1000:g} ms intervals, by self samples:"]
+        for frame, count in leaves.most_common(limit):
+            lines.append(f"{count:8d} {count / total:6.1%}  {frame}")
+        return "\n".join(lines)
+
+
+def _short_path(filename: str) -> str:
+    """Path relative to the source tree, or the file name for outside code."""
+    index = filename.rfind("/src/")
+    return filename[index + 1:] if index >= 0 else Path(filename).name
@@ -3,5 +3,7 @@ from .state import State
 from .action import Action, ActionSchema
 from .domain import Domain
 from .task import Task
+from .sas_task import SASTask, SASVariable, SASOperator
 
-__all__ = ["State", "Action", "ActionSchema", "Domain", "Task"]
+__all__ = ["State", "Action", "ActionSchema", "Domain", "Task",
+           "SASTask", "SASVariable", "SASOperator"]
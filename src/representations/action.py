@@ -2,6 +2,7 @@
 from __future__ import annotations
 from dataclasses import dataclass, field
 from typing import Set, Dict, List, Tuple
+from .state import State
 
 
 @dataclass(frozen=True)
@@ -20,9 +21,15 @@ class Action:
         """Check if action is applicable in a state."""
         return self.preconditions.issubset(state_preds)
     
-    def apply(self, state_preds: Set[str]) -> Set[str]:
-        """Apply action to state predicates, return new set."""
-        return (state_preds | self.add_effects) - self.del_effects
+    def apply(self, state: State | Set[str]) -> State | Set[str]:
+        """
+        Apply action to a state or to raw state predicates.
+        A State yields a new State whose hash is updated incrementally;
+        a predicate set yields a new set.
+        """
+        if isinstance(state, State):
+            return state.apply(self.add_effects, self.del_effects)
+        return (state | self.add_effects) - self.del_effects
     
     def __hash__(self) -> int:
         return hash((self.name, self.schema_name, 
@@ -0,0 +1,79 @@
+"""Finite-domain (SAS+) task representation."""
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Set, Tuple
+
+NONE_OF_THOSE = "<none of those>"  # Value of a variable none of whose facts is true
+
+
+@dataclass
+class SASVariable:
+    """
+    A multi-valued state variable.
+    Each value is a STRIPS fact, except the optional NONE_OF_THOSE value.
+    """
+    name: str
+    values: List[str]
+
+    @property
+    def facts(self) -> List[str]:
+        """Values that correspond to facts."""
+        return [v for v in self.values if v != NONE_OF_THOSE]
+
+    def none_value(self) -> int | None:
+        """Index of the NONE_OF_THOSE value, if the variable has one."""
+        return self.values.index(NONE_OF_THOSE) if NONE_OF_THOSE in self.values else None
+
+
+@dataclass(frozen=True)
+class SASOperator:
+    """
+    A grounded SAS+ operator.
+    preconditions and effects are (variable, value) pairs.
+    """
+    name: str
+    preconditions: Tuple[Tuple[int, int], ...]
+    effects: Tuple[Tuple[int, int], ...]
+    cost: int = 1
+
+
+@dataclass
+class SASTask:
+    """
+    A planning task over multi-valued variables.
+    States are lists with one value index per variable.
+    """
+    name: str
+    variables: List[SASVariable]
+    initial_state: List[int]
+    goal: List[Tuple[int, int]]
+    operators: List[SASOperator] = field(default_factory=list)
+    fact_to_value: Dict[str, Tuple[int, int]] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.fact_to_value = {}
+        for var, variable in enumerate(self.variables):
+            for value, fact in enumerate(variable.values):
+                if fact != NONE_OF_THOSE:
+                    self.fact_to_value[fact] = (var, value)
+
+    def encode(self, predicates: Iterable[str]) -> List[int]:
+        """Convert a set of true facts to variable values."""
+        values = [variable.none_value() for variable in self.variables]
+        for fact in predicates:
+            var, value = self.fact_to_value[fact]
+            values[var] = value
+        return values
+
+    def decode(self, values: List[int]) -> Set[str]:
+        """Convert variable values back to the set of true facts."""
+        facts = set()
+        for variable, value in zip(self.variables, values):
+            fact = variable.values[value]
+            if fact != NONE_OF_THOSE:
+                facts.add(fact)
+        return facts
+
+    def state_bits(self) -> int:
+        """Bits needed to store one state."""
+        return sum(max(1, (len(v.values) - 1).bit_length()) for v in self.variables)
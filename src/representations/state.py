@@ -1,18 +1,44 @@
 """Immutable State representation using frozenset."""
 from __future__ import annotations
-from typing import Set, Iterable
+import hashlib
+from typing import Dict, Set, Iterable
+
+# Zobrist key per fact, filled lazily
+_ZOBRIST_KEYS: Dict[str, int] = {}
+
+
+def zobrist_key(fact: str) -> int:
+    """
+    Get the 63-bit Zobrist key of a fact.
+    Keys are derived from the fact text, so every process agrees on them.
+    """
+    key = _ZOBRIST_KEYS.get(fact)
+    if key is None:
+        digest = hashlib.blake2b(fact.encode(), digest_size=8).digest()
+        key = int.from_bytes(digest, 'little') >> 1
+        _ZOBRIST_KEYS[fact] = key
+    return key
 
 
 class State:
     """
     Immutable state representation for STRIPS planning.
     Uses frozenset of predicate strings for hashability and efficient comparison.
+    The hash is the XOR of the Zobrist keys of all predicates, which lets
+    successor states derive their hash from the parent's in O(|effects|).
     """
     
-    def __init__(self, predicates: Iterable[str] | None = None):
-        """Initialize state with a set of predicate strings."""
+    def __init__(self, predicates: Iterable[str] | None = None,
+                 zobrist_hash: int | None = None):
+        """
+        Initialize state with a set of predicate strings.
+        
+        Args:
+            predicates: Predicate strings true in the state
+            zobrist_hash: Precomputed Zobrist hash of the predicates, if known
+        """
         self._predicates: frozenset[str] = frozenset(predicates) if predicates else frozenset()
-        self._hash: int | None = None
+        self._hash: int | None = zobrist_hash
     
     @property
     def predicates(self) -> frozenset[str]:
@@ -24,9 +50,19 @@ class State:
         return condition.issubset(self._predicates)
     
     def apply(self, add_effects: Set[str], del_effects: Set[str]) -> State:
-        """Apply effects to create a new state (immutable)."""
-        new_preds = (self._predicates | add_effects) - del_effects
-        return State(new_preds)
+        """
+        Apply effects to create a new state (immutable).
+        The successor's hash is updated incrementally from this state's hash.
+        """
+        preds = self._predicates
+        new_hash = hash(self)
+        for pred in del_effects:
+            if pred in preds:
+                new_hash ^= zobrist_key(pred)
+        for pred in add_effects:
+            if pred not in preds and pred not in del_effects:
+                new_hash ^= zobrist_key(pred)
+        return State((preds | add_effects) - del_effects, zobrist_hash=new_hash)
     
     def is_goal(self, goal: Set[str]) -> bool:
         """Check if state satisfies the goal."""
@@ -37,9 +73,12 @@ class State:
         return predicate in self._predicates
     
     def __hash__(self) -> int:
-        """Hash based on frozenset."""
+        """Zobrist hash, computed from scratch only if not derived from a parent."""
         if self._hash is None:
-            self._hash = hash(self._predicates)
+            h = 0
+            for pred in self._predicates:
+                h ^= zobrist_key(pred)
+            self._hash = h
         return self._hash
     
     def __eq__(self, other: object) -> bool:
@@ -1,7 +1,7 @@
 """Grounded planning task representation."""
 from __future__ import annotations
 from dataclasses import dataclass, field
-from typing import Dict, List, Set
+from typing import Any, Dict, List, Set
 from .state import State
 from .action import Action
 
@@ -18,12 +18,28 @@ class Task:
     initial_state: State
     goal: Set[str]
     actions: List[Action] = field(default_factory=list)
+    # Groups of facts of which at most one is true in any reachable state
+    mutex_groups: List[List[str]] = field(default_factory=list)
+    # Derived analyses (e.g. the landmark graph), computed once on demand
+    cache: Dict[str, Any] = field(default_factory=dict, repr=False, compare=False)
     
     def get_applicable_actions(self, state: State) -> List[Action]:
         """Get all actions applicable in the given state."""
         state_preds = state.predicates
         return [a for a in self.actions if a.is_applicable(state_preds)]
     
+    def get_applicable_action_ids(self, state: State) -> List[int]:
+        """Get indices (into self.actions) of actions applicable in the state."""
+        state_preds = state.predicates
+        return [i for i, a in enumerate(self.actions) if a.is_applicable(state_preds)]
+    
+    def get_facts(self) -> List[str]:
+        """Get every fact mentioned by the task, sorted."""
+        facts = set(self.initial_state.predicates) | set(self.goal)
+        for action in self.actions:
+            facts |= action.preconditions | action.add_effects | action.del_effects
+        return sorted(facts)
+    
     def is_goal_reached(self, state: State) -> bool:
         """Check if goal is satisfied."""
         return state.is_goal(self.goal)
@@ -2,5 +2,6 @@
 from .algorithms.bfs import BFS
 from .algorithms.astar import AStar
 from .algorithms.greedy import GreedyBestFirst
+from .algorithms.hda_star import HDAStar
 
-__all__ = ["BFS", "AStar", "GreedyBestFirst"]
+__all__ = ["BFS", "AStar", "GreedyBestFirst", "HDAStar"]
@@ -2,52 +2,43 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import List, Optional, Dict, Set, Tuple
-from heapq import heappush, heappop
+from typing import List, Optional, Dict
 
 from ...representations.state import State
 from ...representations.action import Action
 from ...representations.task import Task
+from ..state_registry import StateRegistry, NO_STATE, NO_ACTION
 
 
-@dataclass
+@dataclass(slots=True)
 class SearchNode:
-    """A node in the search tree."""
-    state: State
-    action: Optional[Action] = None  # Action that led to this state
-    parent: Optional[SearchNode] = None
+    """
+    Compact view of one registered state in the search tree.
+    Slotted (no __dict__), with f precomputed and the parent referenced by
+    state ID; the authoritative per-state data lives in the StateRegistry.
+    """
+    state_id: int
+    parent_id: int = NO_STATE  # State ID the best path came from
+    action_id: int = NO_ACTION  # Index into task.actions of the action that led here
     g_cost: float = 0.0  # Path cost from start
     h_cost: float = 0.0  # Heuristic estimate to goal
+    f_cost: float = 0.0  # g(n) + h(n)
     depth: int = 0
-    node_id: int = 0
-    
-    @property
-    def f_cost(self) -> float:
-        """f(n) = g(n) + h(n)"""
-        return self.g_cost + self.h_cost
-    
-    def __lt__(self, other: SearchNode) -> bool:
-        """Comparison for priority queue."""
-        return self.f_cost < other.f_cost
     
-    def get_path(self) -> List[Tuple[State, Optional[Action]]]:
-        """Reconstruct path from root to this node."""
-        path = []
-        current: Optional[SearchNode] = self
-        while current is not None:
-            path.append((current.state, current.action))
-            current = current.parent
-        return list(reversed(path))
-    
-    def get_action_sequence(self) -> List[Action]:
-        """Get sequence of actions from root to this node."""
-        actions = []
-        current: Optional[SearchNode] = self
-        while current is not None:
-            if current.action is not None:
-                actions.append(current.action)
-            current = current.parent
-        return list(reversed(actions))
+    @classmethod
+    def from_registry(cls, registry: StateRegistry, state_id: int) -> SearchNode:
+        """Build the node view of a registered state."""
+        g_cost = registry.g[state_id]
+        h_cost = registry.h[state_id]
+        return cls(
+            state_id=state_id,
+            parent_id=registry.parent[state_id],
+            action_id=registry.action[state_id],
+            g_cost=float(g_cost),
+            h_cost=h_cost,
+            f_cost=g_cost + h_cost,
+            depth=g_cost  # Unit costs: depth equals path cost
+        )
 
 
 @dataclass
@@ -63,6 +54,14 @@ class SearchResult:
     final_h: float = 0.0
     search_tree: Optional[Dict] = None
     error_message: Optional[str] = None
+    heuristic_calls: int = 0  # Heuristic lookups, including cache hits
+    heuristic_evaluations: int = 0  # Heuristic computations (cache misses)
+    heuristic_time_ms: float = 0.0  # Only measured with heuristic timing enabled
+    cache_hits: int = 0  # Heuristic cache statistics
+    cache_misses: int = 0
+    cache_hit_rate: float = 0.0
+    peak_open: int = 0  # Largest open list size
+    peak_states: int = 0  # States stored at the end of the search
 
 
 class SearchAlgorithm(ABC):
@@ -80,52 +79,65 @@ class SearchAlgorithm(ABC):
         self.timeout = timeout
         self.nodes_expanded = 0
         self.nodes_generated = 0
+        self.peak_open = 0
         self.start_time = 0.0
-        self.node_counter = 0
         self.search_tree_nodes: List[Dict] = []
         self.search_tree_edges: List[Dict] = []
+        self.recorded_nodes: Dict[int, int] = {}  # state ID -> index in search_tree_nodes
+        self.max_tree_nodes = 10000  # Stop recording the tree beyond this many nodes
     
     @abstractmethod
     def search(self) -> SearchResult:
         """Execute search and return result."""
         pass
     
-    def _create_node(self, state: State, action: Optional[Action] = None, 
-                     parent: Optional[SearchNode] = None, g_cost: float = 0.0,
-                     h_cost: float = 0.0) -> SearchNode:
-        """Create a new search node."""
-        self.node_counter += 1
-        depth = parent.depth + 1 if parent else 0
-        return SearchNode(
-            state=state,
-            action=action,
-            parent=parent,
-            g_cost=g_cost,
-            h_cost=h_cost,
-            depth=depth,
-            node_id=self.node_counter
-        )
-    
-    def _record_node(self, node: SearchNode, is_goal: bool = False, 
-                     is_expanded: bool = False):
-        """Record node for search tree visualization."""
+    def _record_state(self, registry: StateRegistry, state_id: int, state: State):
+        """Record a registered state for search tree visualization (once per state)."""
+        if state_id in self.recorded_nodes or len(self.search_tree_nodes) >= self.max_tree_nodes:
+            return
+        node = SearchNode.from_registry(registry, state_id)
+        node_id = f"n{state_id}"
+        self.recorded_nodes[state_id] = len(self.search_tree_nodes)
+        
         self.search_tree_nodes.append({
-            'id': f"n{node.node_id}",
-            'state_hash': hash(node.state),
+            'id': node_id,
+            'state_hash': registry.get_hash(state_id),
             'heuristic': node.h_cost,
             'depth': node.depth,
             'g_cost': node.g_cost,
-            'is_goal': is_goal,
-            'is_expanded': is_expanded
+            'is_goal': self.task.is_goal_reached(state),
+            'is_expanded': False
         })
         
-        if node.parent:
+        if node.parent_id != NO_STATE:
             self.search_tree_edges.append({
-                'source': f"n{node.parent.node_id}",
-                'target': f"n{node.node_id}",
-                'action': node.action.name if node.action else None
+                'source': f"n{node.parent_id}",
+                'target': node_id,
+                'action': self.task.actions[node.action_id].name
             })
     
+    def _record_expanded(self, state_id: int):
+        """Mark a recorded state as expanded in the search tree."""
+        index = self.recorded_nodes.get(state_id)
+        if index is not None:
+            self.search_tree_nodes[index]['is_expanded'] = True
+    
+    def _search_stats(self, registry: StateRegistry | None = None) -> Dict[str, float]:
+        """Memory, heuristic and heuristic cache statistics as SearchResult fields."""
+        stats = {'peak_open': self.peak_open}
+        if registry is not None:
+            stats['peak_states'] = len(registry)
+        heuristic = getattr(self, 'heuristic', None)
+        if heuristic is not None:
+            stats['heuristic_calls'] = heuristic.calls
+            stats['heuristic_evaluations'] = heuristic.evaluations
+            stats['heuristic_time_ms'] = heuristic.time_spent * 1000
+            if heuristic.cache is not None:
+                stats['cache_hits'] = heuristic.cache.hits
+                stats['cache_misses'] = heuristic.cache.misses
+                stats['cache_hit_rate'] = heuristic.cache.hit_rate
+        return stats
+    
     def _get_search_tree(self) -> Dict:
         """Get the recorded search tree."""
         return {
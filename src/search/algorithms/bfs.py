@@ -3,8 +3,8 @@ from __future__ import annotations
 from collections import deque
 import time
 
-from .base import SearchAlgorithm, SearchNode, SearchResult
-from ...representations.state import State
+from .base import SearchAlgorithm, SearchResult
+from ..state_registry import StateRegistry
 
 
 class BFS(SearchAlgorithm):
@@ -13,10 +13,6 @@ class BFS(SearchAlgorithm):
     Complete and optimal for unweighted graphs.
     """
     
-    def __init__(self, task, timeout: float = 30.0):
-        super().__init__(task, timeout)
-        self.recorded_nodes = set()
-    
     def search(self) -> SearchResult:
         """Execute BFS search."""
         start_time = time.time()
@@ -38,15 +34,14 @@ class BFS(SearchAlgorithm):
                 search_tree=self._get_search_tree()
             )
         
-        # Create root node
-        root = self._create_node(initial_state)
-        self._record_node_once(root)
-        
-        # Frontier: queue of nodes to expand
-        frontier = deque([root])
+        # Every unique state is stored once; search works on state IDs
+        registry = StateRegistry(self.task)
+        root_id, _ = registry.insert(initial_state)
+        registry.g[root_id] = 0
+        self._record_state(registry, root_id, initial_state)
         
-        # Visited set: states we've already seen
-        visited = {initial_state}
+        # Frontier: queue of state IDs to expand
+        frontier = deque([root_id])
         
         while frontier:
             # Check timeout
@@ -57,39 +52,38 @@ class BFS(SearchAlgorithm):
                     nodes_expanded=self.nodes_expanded,
                     nodes_generated=self.nodes_generated,
                     search_time_ms=(time.time() - start_time) * 1000,
-                    search_tree=self._get_search_tree()
+                    search_tree=self._get_search_tree(),
+                    **self._search_stats(registry)
                 )
             
-            # Get next node from frontier
-            node = frontier.popleft()
+            if len(frontier) > self.peak_open:
+                self.peak_open = len(frontier)
+            # Get next state from frontier
+            state_id = frontier.popleft()
+            state = registry.get_state(state_id)
             self.nodes_expanded += 1
-            self._record_expanded(node)
+            self._record_expanded(state_id)
             
             # Generate successors
-            for action in self.task.get_applicable_actions(node.state):
-                new_state_preds = action.apply(node.state.predicates)
-                new_state = State(new_state_preds)
+            new_g = registry.g[state_id] + 1
+            for action_id in self.task.get_applicable_action_ids(state):
+                new_state = self.task.actions[action_id].apply(state)
                 self.nodes_generated += 1
                 
                 # Skip if already visited
-                if new_state in visited:
+                child_id, is_new = registry.insert(new_state)
+                if not is_new:
                     continue
                 
-                visited.add(new_state)
-                
-                # Create child node
-                child = self._create_node(
-                    state=new_state,
-                    action=action,
-                    parent=node,
-                    g_cost=node.g_cost + 1
-                )
-                self._record_node_once(child)
+                registry.g[child_id] = new_g
+                registry.parent[child_id] = state_id
+                registry.action[child_id] = action_id
+                self._record_state(registry, child_id, new_state)
                 
                 # Check if goal reached
                 if self.task.is_goal_reached(new_state):
                     elapsed = (time.time() - start_time) * 1000
-                    plan = child.get_action_sequence()
+                    plan = registry.extract_plan(child_id)
                     return SearchResult(
                         success=True,
                         plan=plan,
@@ -97,11 +91,12 @@ class BFS(SearchAlgorithm):
                         nodes_generated=self.nodes_generated,
                         search_time_ms=elapsed,
                         plan_length=len(plan),
-                        search_tree=self._get_search_tree()
+                        search_tree=self._get_search_tree(),
+                        **self._search_stats(registry)
                     )
                 
                 # Add to frontier
-                frontier.append(child)
+                frontier.append(child_id)
         
         # No solution found
         elapsed = (time.time() - start_time) * 1000
@@ -111,37 +106,6 @@ class BFS(SearchAlgorithm):
             nodes_expanded=self.nodes_expanded,
             nodes_generated=self.nodes_generated,
             search_time_ms=elapsed,
-            search_tree=self._get_search_tree()
+            search_tree=self._get_search_tree(),
+            **self._search_stats(registry)
         )
-    
-    def _record_node_once(self, node: SearchNode):
-        """Record node only if not already recorded."""
-        node_id = f"n{node.node_id}"
-        if node_id in self.recorded_nodes:
-            return
-        self.recorded_nodes.add(node_id)
-        
-        self.search_tree_nodes.append({
-            'id': node_id,
-            'state_hash': hash(node.state),
-            'heuristic': node.h_cost,
-            'depth': node.depth,
-            'g_cost': node.g_cost,
-            'is_goal': self.task.is_goal_reached(node.state),
-            'is_expanded': False
-        })
-        
-        if node.parent:
-            self.search_tree_edges.append({
-                'source': f"n{node.parent.node_id}",
-                'target': node_id,
-                'action': node.action.name if node.action else None
-            })
-    
-    def _record_expanded(self, node: SearchNode):
-        """Mark node as expanded in the search tree."""
-        node_id = f"n{node.node_id}"
-        for n in self.search_tree_nodes:
-            if n['id'] == node_id:
-                n['is_expanded'] = True
-                break
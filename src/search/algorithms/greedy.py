@@ -1,12 +1,12 @@
 """Greedy Best-First Search implementation."""
 from __future__ import annotations
 import time
-from heapq import heappush, heappop
 
-from .base import SearchAlgorithm, SearchNode, SearchResult
+from .base import SearchAlgorithm, SearchResult
+from ..open_list import make_open_list
+from ..state_registry import StateRegistry
 from ..heuristics.base import HeuristicFunction
 from ..heuristics.goal_count import GoalCountHeuristic
-from ...representations.state import State
 
 
 class GreedyBestFirst(SearchAlgorithm):
@@ -17,7 +17,8 @@ class GreedyBestFirst(SearchAlgorithm):
     """
     
     def __init__(self, task, timeout: float = 30.0,
-                 heuristic: HeuristicFunction | None = None):
+                 heuristic: HeuristicFunction | None = None,
+                 open_list: str = "heap", tie_breaking: str = "fifo"):
         """
         Initialize Greedy Best-First search.
         
@@ -25,10 +26,14 @@ class GreedyBestFirst(SearchAlgorithm):
             task: The planning task
             timeout: Maximum search time in seconds
             heuristic: Heuristic function (default: GoalCountHeuristic)
+            open_list: Open list implementation: "heap" or "bucket"
+            tie_breaking: Order among equally ranked states: "fifo" or "lifo"
         """
         super().__init__(task, timeout)
         self.heuristic = heuristic or GoalCountHeuristic(task)
-        self.recorded_nodes = set()
+        self.open_list = open_list
+        self.tie_breaking = tie_breaking
+        make_open_list(open_list, tie_breaking)  # Reject unknown names early
     
     def search(self) -> SearchResult:
         """Execute Greedy Best-First search."""
@@ -51,18 +56,20 @@ class GreedyBestFirst(SearchAlgorithm):
             )
         
         # Calculate initial heuristic
-        initial_h = self.heuristic.calculate(initial_state)
+        self.heuristic.notify_initial_state(initial_state)
+        initial_h = self.heuristic.evaluate(initial_state)
         
-        # Create root node
-        root = self._create_node(initial_state, h_cost=initial_h)
-        self._record_node_once(root)
+        # Every unique state is stored once; search works on state IDs
+        registry = StateRegistry(self.task)
+        root_id, _ = registry.insert(initial_state)
+        registry.g[root_id] = 0
+        registry.h[root_id] = initial_h
+        self._record_state(registry, root_id, initial_state)
         
-        # Frontier: priority queue ordered by h(n)
-        frontier = [(root.h_cost, root.node_id, root)]
-        frontier_states = {initial_state: True}
-        
-        # Closed set: states we've expanded
-        closed_set = set()
+        # Frontier: priority queue of state IDs ordered by h(n)
+        frontier = make_open_list(self.open_list, self.tie_breaking)
+        if initial_h != float('inf'):
+            frontier.push(root_id, initial_h)
         
         while frontier:
             # Check timeout
@@ -75,26 +82,25 @@ class GreedyBestFirst(SearchAlgorithm):
                     nodes_generated=self.nodes_generated,
                     search_time_ms=elapsed,
                     initial_h=initial_h,
-                    search_tree=self._get_search_tree()
+                    search_tree=self._get_search_tree(),
+                    **self._search_stats(registry)
                 )
             
-            # Get node with lowest h_cost
-            _, _, node = heappop(frontier)
-            
-            # Skip if already expanded
-            if node.state in closed_set:
-                continue
+            if len(frontier) > self.peak_open:
+                self.peak_open = len(frontier)
+            # Get state with lowest h_cost
+            state_id = frontier.pop()
             
-            closed_set.add(node.state)
-            del frontier_states[node.state]
+            registry.closed[state_id] = 1
+            state = registry.get_state(state_id)
             
             self.nodes_expanded += 1
-            self._record_expanded(node)
+            self._record_expanded(state_id)
             
             # Check if goal reached
-            if self.task.is_goal_reached(node.state):
+            if self.task.is_goal_reached(state):
                 elapsed = (time.time() - start_time) * 1000
-                plan = node.get_action_sequence()
+                plan = registry.extract_plan(state_id)
                 return SearchResult(
                     success=True,
                     plan=plan,
@@ -103,36 +109,36 @@ class GreedyBestFirst(SearchAlgorithm):
                     search_time_ms=elapsed,
                     plan_length=len(plan),
                     initial_h=initial_h,
-                    final_h=node.h_cost,
-                    search_tree=self._get_search_tree()
+                    final_h=registry.h[state_id],
+                    search_tree=self._get_search_tree(),
+                    **self._search_stats(registry)
                 )
             
             # Generate successors
-            for action in self.task.get_applicable_actions(node.state):
-                new_state_preds = action.apply(node.state.predicates)
-                new_state = State(new_state_preds)
+            new_g = registry.g[state_id] + 1
+            for action_id in self.task.get_applicable_action_ids(state):
+                action = self.task.actions[action_id]
+                new_state = action.apply(state)
                 self.nodes_generated += 1
+                self.heuristic.notify_transition(state, action, new_state)
                 
                 # Skip if already expanded or in frontier
-                if new_state in closed_set or new_state in frontier_states:
+                child_id, is_new = registry.insert(new_state)
+                if not is_new:
                     continue
                 
                 # Calculate heuristic
-                h = self.heuristic.calculate(new_state)
+                h = self.heuristic.evaluate(new_state)
                 
-                # Create child node
-                child = self._create_node(
-                    state=new_state,
-                    action=action,
-                    parent=node,
-                    g_cost=node.g_cost + 1,
-                    h_cost=h
-                )
-                self._record_node_once(child)
+                registry.g[child_id] = new_g
+                registry.h[child_id] = h
+                registry.parent[child_id] = state_id
+                registry.action[child_id] = action_id
+                self._record_state(registry, child_id, new_state)
                 
-                # Add to frontier
-                frontier_states[new_state] = True
-                heappush(frontier, (child.h_cost, child.node_id, child))
+                # Add to frontier unless the heuristic proves a dead end
+                if h != float('inf'):
+                    frontier.push(child_id, h)
         
         # No solution found
         elapsed = (time.time() - start_time) * 1000
@@ -143,37 +149,6 @@ class GreedyBestFirst(SearchAlgorithm):
             nodes_generated=self.nodes_generated,
             search_time_ms=elapsed,
             initial_h=initial_h,
-            search_tree=self._get_search_tree()
+            search_tree=self._get_search_tree(),
+            **self._search_stats(registry)
         )
-    
-    def _record_node_once(self, node: SearchNode):
-        """Record node only if not already recorded."""
-        node_id = f"n{node.node_id}"
-        if node_id in self.recorded_nodes:
-            return
-        self.recorded_nodes.add(node_id)
-        
-        self.search_tree_nodes.append({
-            'id': node_id,
-            'state_hash': hash(node.state),
-            'heuristic': node.h_cost,
-            'depth': node.depth,
-            'g_cost': node.g_cost,
-            'is_goal': self.task.is_goal_reached(node.state),
-            'is_expanded': False
-        })
-        
-        if node.parent:
-            self.search_tree_edges.append({
-                'source': f"n{node.parent.node_id}",
-                'target': node_id,
-                'action': node.action.name if node.action else None
-            })
-    
-    def _record_expanded(self, node: SearchNode):
-        """Mark node as expanded in the search tree."""
-        node_id = f"n{node.node_id}"
-        for n in self.search_tree_nodes:
-            if n['id'] == node_id:
-                n['is_expanded'] = True
-                break
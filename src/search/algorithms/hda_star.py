@@ -0,0 +1,368 @@
+"""Hash-Distributed A* (HDA*) implementation."""
+from __future__ import annotations
+import multiprocessing as mp
+import os
+import queue
+import time
+from typing import Dict, List, Tuple
+
+from .base import SearchAlgorithm, SearchResult
+from ..open_list import HeapOpenList
+from ..state_registry import StateRegistry
+from ..heuristics.base import HeuristicFunction
+from ..heuristics.goal_count import GoalCountHeuristic
+from ...representations.task import Task
+
+# How long an idle worker blocks on its inbox before re-checking the stop flag
+_IDLE_POLL_SECONDS = 0.01
+# How often the coordinator checks for termination and timeout
+_COORDINATOR_POLL_SECONDS = 0.005
+# How long the coordinator waits for a worker to answer a parent pointer lookup
+_TRACE_TIMEOUT_SECONDS = 5.0
+# Fields of a worker's statistics row, named as in SearchResult
+_STATS = ('heuristic_calls', 'heuristic_evaluations', 'heuristic_time_ms',
+          'cache_hits', 'cache_misses', 'peak_open', 'peak_states')
+# Workers are never forked from the calling process, which may be a threaded
+# server; the fork server starts them from a clean single-threaded process
+_START_METHOD = "forkserver" if "forkserver" in mp.get_all_start_methods() else "spawn"
+
+
+class HDAStar(SearchAlgorithm):
+    """
+    Hash-Distributed A* (Kishimoto, Fukunaga and Botea).
+    Every state is owned by exactly one worker process, chosen by the state's
+    Zobrist hash. Workers keep private open and closed lists and forward
+    generated states to their owner as packed bit vectors through message
+    queues, tagged with a pointer to their parent (owner rank, state id).
+    The plan is rebuilt from those pointers once the search has ended.
+    Complete and optimal with admissible heuristic.
+    """
+
+    def __init__(self, task, timeout: float = 30.0,
+                 heuristic: HeuristicFunction | None = None,
+                 workers: int = 4):
+        """
+        Initialize HDA* search.
+
+        Args:
+            task: The planning task
+            timeout: Maximum search time in seconds
+            heuristic: Heuristic function (default: GoalCountHeuristic)
+            workers: Number of worker processes (capped at the CPU count)
+        """
+        super().__init__(task, timeout)
+        self.heuristic = heuristic or GoalCountHeuristic(task)
+        if self.heuristic.path_dependent:
+            # States are evaluated by their owner, which never sees the parent
+            raise ValueError("HDA* does not support path-dependent heuristics")
+        self.workers = max(1, min(workers, os.cpu_count() or 1))
+
+    def search(self) -> SearchResult:
+        """Execute HDA* search."""
+        start_time = time.time()
+
+        initial_state = self.task.initial_state
+
+        # Check if initial state is goal
+        if self.task.is_goal_reached(initial_state):
+            return SearchResult(
+                success=True,
+                plan=[],
+                nodes_expanded=0,
+                nodes_generated=1,
+                search_time_ms=0.0,
+                plan_length=0,
+                search_tree=self._get_search_tree()
+            )
+
+        initial_h = self.heuristic.evaluate(initial_state)
+        if initial_h == float('inf'):
+            return SearchResult(
+                success=False,
+                error_message="No solution exists",
+                nodes_generated=1,
+                search_time_ms=(time.time() - start_time) * 1000,
+                initial_h=initial_h,
+                search_tree=self._get_search_tree()
+            )
+
+        # Workers exchange states packed with the task's shared variable layout
+        root_packed = StateRegistry(self.task).pack(initial_state)
+
+        n = self.workers
+        ctx = mp.get_context(_START_METHOD)
+        if _START_METHOD == "forkserver":
+            ctx.set_forkserver_preload([__name__])
+        inboxes = [ctx.Queue() for _ in range(n)]
+        results = ctx.Queue()
+        replies = ctx.Queue()  # Parent pointer lookups, see _trace_plan
+        incumbent = ctx.Value('d', float('inf'), lock=False)
+        incumbent_lock = ctx.Lock()
+        # Message counters; slot n belongs to the coordinator
+        sent = ctx.Array('q', n + 1, lock=False)
+        received = ctx.Array('q', n, lock=False)
+        idle = ctx.Array('b', n, lock=False)
+        expanded = ctx.Array('q', n, lock=False)
+        generated = ctx.Array('q', n, lock=False)
+        # Per-worker statistics, one row of _STATS fields each
+        stats = ctx.Array('d', n * len(_STATS), lock=False)
+        stop = ctx.Event()
+
+        processes = []
+        for rank in range(n):
+            process = ctx.Process(
+                target=_worker,
+                args=(rank, self.task, self.heuristic, inboxes, results, replies,
+                      incumbent, incumbent_lock, sent, received, idle,
+                      expanded, generated, stats, stop),
+                daemon=True
+            )
+            process.start()
+            processes.append(process)
+
+        # Seed the owner of the initial state
+        sent[n] += 1
+        root_hash = hash(initial_state)
+        inboxes[root_hash % n].put([(root_packed, root_hash, 0, -1, -1, -1)])
+
+        timed_out = False
+        crashed = None
+        best = None
+        plan_ids: List[int] = []
+        try:
+            while True:
+                if time.time() - start_time > self.timeout:
+                    timed_out = True
+                    break
+                # Workers only return once stopped, so any exit now is a crash
+                crashed = next((p for p in processes if not p.is_alive()), None)
+                if crashed is not None:
+                    break
+                if _is_terminated(sent, received, idle):
+                    break
+                time.sleep(_COORDINATOR_POLL_SECONDS)
+            if not timed_out and crashed is None:
+                best = _drain_results(results, incumbent.value)
+                if best is not None:
+                    plan_ids = _trace_plan(inboxes, replies, best[1], best[2])
+        finally:
+            stop.set()
+            for process in processes:
+                process.join(timeout=1.0)
+                if process.is_alive():
+                    process.terminate()
+            for inbox in inboxes:
+                inbox.close()
+                inbox.cancel_join_thread()
+            results.close()
+            replies.close()
+
+        if crashed is not None:
+            raise RuntimeError(f"HDA* worker {processes.index(crashed)} exited "
+                               f"unexpectedly (exit code {crashed.exitcode})")
+
+        self.nodes_expanded = sum(expanded)
+        self.nodes_generated = sum(generated)
+        elapsed = (time.time() - start_time) * 1000
+        search_stats = _sum_stats(stats, n)
+
+        if best is not None:
+            plan = [self.task.actions[i] for i in plan_ids]
+            return SearchResult(
+                success=True,
+                plan=plan,
+                nodes_expanded=self.nodes_expanded,
+                nodes_generated=self.nodes_generated,
+                search_time_ms=elapsed,
+                plan_length=len(plan),
+                initial_h=initial_h,
+                final_h=0.0,
+                search_tree=self._get_search_tree(),
+                **search_stats
+            )
+
+        return SearchResult(
+            success=False,
+            error_message="Search timeout" if timed_out else "No solution exists",
+            nodes_expanded=self.nodes_expanded,
+            nodes_generated=self.nodes_generated,
+            search_time_ms=elapsed,
+            initial_h=initial_h,
+            search_tree=self._get_search_tree(),
+            **search_stats
+        )
+
+
+def _is_terminated(sent, received, idle) -> bool:
+    """
+    Detect global termination: every worker idle and no message in flight.
+    Counters are read on both sides of the idle check so that a message
+    sent while the flags were being read is never missed.
+    """
+    before = (sum(sent), sum(received))
+    if before[0] != before[1]:
+        return False
+    if not all(idle):
+        return False
+    after = (sum(sent), sum(received))
+    return before == after
+
+
+def _sum_stats(stats, n: int) -> Dict[str, float]:
+    """
+    Combine the workers' statistics rows into SearchResult fields.
+    Open list and state peaks are per-worker peaks summed, an upper bound
+    on the combined memory high-water mark.
+    """
+    width = len(_STATS)
+    totals = {name: sum(stats[rank * width + i] for rank in range(n))
+              for i, name in enumerate(_STATS)}
+    result = {name: int(value) for name, value in totals.items()}
+    result['heuristic_time_ms'] = totals['heuristic_time_ms']
+    lookups = totals['cache_hits'] + totals['cache_misses']
+    result['cache_hit_rate'] = totals['cache_hits'] / lookups if lookups else 0.0
+    return result
+
+
+def _drain_results(results, cost: float) -> Tuple[int, int, int] | None:
+    """
+    Return the (cost, owner rank, state id) goal with the incumbent cost, or
+    None if no goal was found. Workers report every improvement under the
+    incumbent lock, so a report with exactly that cost is on its way even if
+    the queue's feeder thread has not delivered it yet.
+    """
+    if cost == float('inf'):
+        return None
+    while True:
+        try:
+            goal = results.get(timeout=_TRACE_TIMEOUT_SECONDS)
+        except queue.Empty:
+            raise RuntimeError(f"HDA* goal with cost {cost:g} was never reported")
+        if goal[0] == cost:
+            return goal
+
+
+def _trace_plan(inboxes, replies, rank: int, state_id: int) -> List[int]:
+    """
+    Action ids of the plan to a goal, following parent pointers back to the
+    initial state. Each step asks the state's owner, which is still running.
+    """
+    action_ids = []
+    while True:
+        inboxes[rank].put(state_id)
+        try:
+            rank, state_id, action_id = replies.get(timeout=_TRACE_TIMEOUT_SECONDS)
+        except queue.Empty:
+            raise RuntimeError(f"HDA* worker {rank} did not answer a plan lookup")
+        if rank < 0:
+            action_ids.reverse()
+            return action_ids
+        action_ids.append(action_id)
+
+
+def _worker(rank: int, task: Task, heuristic: HeuristicFunction, inboxes, results,
+            replies, incumbent, incumbent_lock, sent, received, idle, expanded,
+            generated, stats, stop):
+    """HDA* worker: owns the states whose Zobrist hash maps to `rank`."""
+    n = len(inboxes)
+    inbox = inboxes[rank]
+    actions = task.actions
+
+    # Private closed/open bookkeeping; g values live in the registry
+    registry = StateRegistry(task)
+    open_list = HeapOpenList()
+    # State id -> (parent's owner rank, parent's state id, action id); -1s for the root
+    parents: Dict[int, Tuple[int, int, int]] = {}
+    peak_open = 0
+
+    def insert(packed, state_hash, g, parent_rank, parent_id, action_id):
+        """Add a state owned by this worker unless a cheaper path is known."""
+        state_id, is_new = registry.insert_packed(packed, state_hash)
+        if registry.g[state_id] <= g:
+            return
+        registry.g[state_id] = g
+        registry.closed[state_id] = 0
+        parents[state_id] = (parent_rank, parent_id, action_id)
+        if is_new:
+            registry.h[state_id] = heuristic.evaluate(registry.get_state(state_id))
+        f = g + registry.h[state_id]
+        if f == float('inf') or f >= incumbent.value:
+            return
+        open_list.push(state_id, f, registry.h[state_id])
+
+    def receive(block: bool) -> bool:
+        """Move queued states into the open list. Returns True if any arrived."""
+        got_any = False
+        while True:
+            try:
+                batch = inbox.get(timeout=_IDLE_POLL_SECONDS) if block else inbox.get_nowait()
+            except queue.Empty:
+                return got_any
+            if isinstance(batch, int):
+                # Parent pointer lookup by the coordinator, after termination
+                replies.put(parents[batch])
+                continue
+            idle[rank] = 0
+            for entry in batch:
+                insert(*entry)
+            received[rank] += 1
+            got_any = True
+            block = False
+
+    try:
+        while not stop.is_set():
+            receive(block=False)
+
+            # Everything left in the open list is pruned by the incumbent
+            if open_list and open_list.min_priority() >= incumbent.value:
+                open_list.clear()
+
+            if not open_list:
+                idle[rank] = 1
+                receive(block=True)
+                continue
+
+            if len(open_list) > peak_open:
+                peak_open = len(open_list)
+            state_id = open_list.pop()
+            if registry.closed[state_id]:
+                continue
+            registry.closed[state_id] = 1
+
+            state = registry.get_state(state_id)
+            g = registry.g[state_id]
+            expanded[rank] += 1
+
+            if task.is_goal_reached(state):
+                with incumbent_lock:
+                    if g < incumbent.value:
+                        incumbent.value = g
+                        results.put((g, rank, state_id))
+                continue
+
+            outgoing: Dict[int, list] = {}
+            for action_id in task.get_applicable_action_ids(state):
+                generated[rank] += 1
+                child = actions[action_id].apply(state)
+                child_hash = hash(child)
+                entry = (registry.pack(child), child_hash, g + 1, rank, state_id, action_id)
+                owner = child_hash % n
+                if owner == rank:
+                    insert(*entry)
+                else:
+                    outgoing.setdefault(owner, []).append(entry)
+
+            for owner, batch in outgoing.items():
+                sent[rank] += 1
+                inboxes[owner].put(batch)
+    finally:
+        row = rank * len(_STATS)
+        cache = heuristic.cache
+        stats[row:row + len(_STATS)] = [
+            heuristic.calls, heuristic.evaluations, heuristic.time_spent * 1000,
+            cache.hits if cache is not None else 0,
+            cache.misses if cache is not None else 0,
+            peak_open, len(registry)
+        ]
+        for q in inboxes:
+            q.cancel_join_thread()
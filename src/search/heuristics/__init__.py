@@ -3,5 +3,9 @@ from .base import HeuristicFunction
 from .goal_count import GoalCountHeuristic
 from .h_add import HAddHeuristic
 from .h_max import HMaxHeuristic
+from .lm_cut import LMCutHeuristic
+from .lm_count import LandmarkCountHeuristic
+from .pdb import CanonicalPDBHeuristic
 
-__all__ = ["HeuristicFunction", "GoalCountHeuristic", "HAddHeuristic", "HMaxHeuristic"]
+__all__ = ["HeuristicFunction", "GoalCountHeuristic", "HAddHeuristic", "HMaxHeuristic",
+           "LMCutHeuristic", "LandmarkCountHeuristic", "CanonicalPDBHeuristic"]
@@ -1,13 +1,22 @@
 """Base class for heuristic functions."""
+from __future__ import annotations
+import time
 from abc import ABC, abstractmethod
 
+from ...representations.action import Action
 from ...representations.state import State
 from ...representations.task import Task
+from .cache import HeuristicCache
 
 
 class HeuristicFunction(ABC):
     """Abstract base class for heuristic functions."""
     
+    # True if values depend on the path a state was reached by, not just the state
+    path_dependent = False
+    # False for heuristics cheaper to recompute than to look up
+    cacheable = True
+    
     def __init__(self, task: Task):
         """
         Initialize heuristic with task.
@@ -17,6 +26,43 @@ class HeuristicFunction(ABC):
         """
         self.task = task
         self.goal = task.goal
+        self.cache: HeuristicCache | None = None
+        if self.cacheable and not self.path_dependent:
+            self.cache = HeuristicCache()
+        # Statistics: evaluate() calls, calculate() calls, and the time spent
+        # in calculate() (measured only while `timing` is enabled)
+        self.calls = 0
+        self.evaluations = 0
+        self.time_spent = 0.0
+        self.timing = False
+    
+    def set_cache(self, capacity: int, policy: str = "lru") -> None:
+        """Replace the value cache; a capacity of 0 disables caching."""
+        if capacity <= 0 or not self.cacheable or self.path_dependent:
+            self.cache = None
+        else:
+            self.cache = HeuristicCache(capacity, policy)
+    
+    def evaluate(self, state: State) -> float:
+        """Heuristic value of a state, answered from the cache when possible."""
+        self.calls += 1
+        cache = self.cache
+        if cache is not None:
+            value = cache.get(state)
+            if value is not None:
+                return value
+        
+        self.evaluations += 1
+        if self.timing:
+            start = time.perf_counter()
+            value = self.calculate(state)
+            self.time_spent += time.perf_counter() - start
+        else:
+            value = self.calculate(state)
+        
+        if cache is not None:
+            cache.put(state, value)
+        return value
     
     @abstractmethod
     def calculate(self, state: State) -> float:
@@ -31,6 +77,20 @@ class HeuristicFunction(ABC):
         """
         pass
     
+    def notify_initial_state(self, state: State) -> None:
+        """
+        Called once when a search starts, before the initial state is evaluated.
+        Path-dependent heuristics reset their per-search data here.
+        """
+        pass
+    
+    def notify_transition(self, parent_state: State, action: Action, child_state: State) -> None:
+        """
+        Called for every generated transition, before the child is evaluated.
+        Path-dependent heuristics update the child's path information here.
+        """
+        pass
+    
     def is_goal(self, state: State) -> bool:
         """Check if state satisfies the goal."""
         return self.task.is_goal_reached(state)
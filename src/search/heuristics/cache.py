@@ -0,0 +1,127 @@
+"""Size-bounded heuristic value cache."""
+from __future__ import annotations
+from collections import OrderedDict
+from typing import Dict, List
+
+from ...representations.state import State
+
+DEFAULT_CAPACITY = 100_000
+
+
+class HeuristicCache:
+    """
+    Maps states to heuristic values, holding at most `capacity` entries.
+
+    Keys are the states themselves, so lookups compare the exact fact sets
+    and a hash collision can never return another state's value.
+
+    Eviction policies:
+        lru    evict the least recently used entry (OrderedDict)
+        clock  second-chance approximation of LRU: entries sit in a ring of
+               slots with a reference bit; the hand clears set bits and
+               evicts the first entry whose bit is already clear. Hits only
+               set a bit, which is cheaper than reordering.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, policy: str = "lru"):
+        if capacity < 1:
+            raise ValueError("Cache capacity must be positive")
+        if policy not in ("lru", "clock"):
+            raise ValueError(f"Unknown cache policy: {policy}")
+        self.capacity = capacity
+        self.policy = policy
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._lru: OrderedDict[State, float] = OrderedDict()
+        # CLOCK: state -> slot, plus per-slot key, value and reference bit
+        self._slots: Dict[State, int] = {}
+        self._keys: List[State | None] = []
+        self._values: List[float] = []
+        self._referenced = bytearray()
+        self._hand = 0
+
+    def __len__(self) -> int:
+        return len(self._lru) if self.policy == "lru" else len(self._slots)
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups answered from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def get(self, state: State) -> float | None:
+        """Cached value of a state, or None."""
+        if self.policy == "lru":
+            value = self._lru.get(state)
+            if value is None:
+                self.misses += 1
+                return None
+            self._lru.move_to_end(state)
+            self.hits += 1
+            return value
+
+        slot = self._slots.get(state)
+        if slot is None:
+            self.misses += 1
+            return None
+        self._referenced[slot] = 1
+        self.hits += 1
+        return self._values[slot]
+
+    def put(self, state: State, value: float) -> None:
+        """Store a value, evicting an entry if the cache is full."""
+        if self.policy == "lru":
+            self._lru[state] = value
+            self._lru.move_to_end(state)
+            if len(self._lru) > self.capacity:
+                self._lru.popitem(last=False)
+                self.evictions += 1
+            return
+
+        slot = self._slots.get(state)
+        if slot is not None:
+            self._values[slot] = value
+            self._referenced[slot] = 1
+            return
+        if len(self._keys) < self.capacity:
+            slot = len(self._keys)
+            self._keys.append(state)
+            self._values.append(value)
+            self._referenced.append(0)
+        else:
+            slot = self._evict_clock()
+            self._keys[slot] = state
+            self._values[slot] = value
+        self._slots[state] = slot
+
+    def clear(self) -> None:
+        """Remove all entries (statistics are kept)."""
+        self._lru.clear()
+        self._slots.clear()
+        self._keys.clear()
+        self._values.clear()
+        self._referenced = bytearray()
+        self._hand = 0
+
+    def stats(self) -> Dict[str, float]:
+        """Hit/miss statistics."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self),
+            "hit_rate": self.hit_rate,
+        }
+
+    def _evict_clock(self) -> int:
+        """Advance the clock hand to a victim slot and free it."""
+        while self._referenced[self._hand]:
+            self._referenced[self._hand] = 0
+            self._hand = (self._hand + 1) % self.capacity
+        slot = self._hand
+        self._hand = (self._hand + 1) % self.capacity
+        del self._slots[self._keys[slot]]
+        self.evictions += 1
+        return slot
@@ -9,6 +9,9 @@ class GoalCountHeuristic(HeuristicFunction):
     Simple but not admissible (can overestimate).
     """
     
+    # Counting goals is cheaper than a cache lookup
+    cacheable = False
+    
     def calculate(self, state: State) -> float:
         """Count unsatisfied goals."""
         unsatisfied = 0
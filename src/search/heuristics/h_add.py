@@ -12,7 +12,6 @@ class HAddHeuristic(HeuristicFunction):
     
     def __init__(self, task):
         super().__init__(task)
-        self.cache = {}
         self._precomputed = False
         self._action_preconditions = {}  # Precompute action preconditions
         self._action_effects = {}        # Precompute action effects
@@ -32,10 +31,6 @@ class HAddHeuristic(HeuristicFunction):
         """Calculate h_add heuristic."""
         self._precompute()
         
-        state_hash = hash(state)
-        if state_hash in self.cache:
-            return self.cache[state_hash]
-        
         # Build relaxed planning graph
         costs = self._compute_relaxed_costs(state)
         
@@ -49,7 +44,6 @@ class HAddHeuristic(HeuristicFunction):
                 total = float('inf')
                 break
         
-        self.cache[state_hash] = total
         return total
     
     def _compute_relaxed_costs(self, state: State) -> dict:
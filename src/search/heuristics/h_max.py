@@ -10,16 +10,8 @@ class HMaxHeuristic(HeuristicFunction):
     Admissible (never overestimates).
     """
     
-    def __init__(self, task):
-        super().__init__(task)
-        self.cache = {}
-    
     def calculate(self, state: State) -> float:
         """Calculate h_max heuristic."""
-        state_hash = hash(state)
-        if state_hash in self.cache:
-            return self.cache[state_hash]
-        
         # Build relaxed planning graph
         costs = self._compute_relaxed_costs(state)
         
@@ -33,7 +25,6 @@ class HMaxHeuristic(HeuristicFunction):
                 max_cost = float('inf')
                 break
         
-        self.cache[state_hash] = max_cost
         return max_cost
     
     def _compute_relaxed_costs(self, state: State) -> dict:
@@ -0,0 +1,146 @@
+"""Fact landmark discovery based on h^1 (Zhu & Givan, Keyder et al.)."""
+from __future__ import annotations
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+from ...representations.task import Task
+
+
+@dataclass
+class LandmarkGraph:
+    """
+    Fact landmarks of a task and the orderings between them.
+    Landmark sets are int bitmasks over landmark indices.
+    """
+    facts: List[str] = field(default_factory=list)  # Landmark index -> fact
+    achievers: List[List[int]] = field(default_factory=list)  # Action IDs adding the fact
+    # Landmarks that must be true at some point before each landmark first becomes true
+    parents: List[int] = field(default_factory=list)
+    # Landmarks that must hold immediately before each landmark is achieved
+    necessary_children: List[int] = field(default_factory=list)
+    goal_mask: int = 0
+    solvable: bool = True
+    index: Dict[str, int] = field(init=False, repr=False)  # Fact -> landmark index
+
+    def __post_init__(self):
+        self.index = {fact: i for i, fact in enumerate(self.facts)}
+
+    def __len__(self) -> int:
+        return len(self.facts)
+
+    def mask_of(self, predicates) -> int:
+        """Bitmask of the landmarks among a set of facts."""
+        index = self.index
+        mask = 0
+        for pred in predicates:
+            i = index.get(pred)
+            if i is not None:
+                mask |= 1 << i
+        return mask
+
+
+def get_landmark_graph(task: Task) -> LandmarkGraph:
+    """Return the task's landmark graph, computing it on first use."""
+    graph = task.cache.get("landmark_graph")
+    if graph is None:
+        graph = compute_landmark_graph(task)
+        task.cache["landmark_graph"] = graph
+    return graph
+
+
+def compute_landmark_graph(task: Task) -> LandmarkGraph:
+    """
+    Compute fact landmarks with the h^1 label propagation.
+
+    Every fact p gets a label L(p): the facts that are true at some point on
+    every relaxed path achieving p from the initial state. Labels start at
+    {p} for initial facts and are intersected along all achieving actions
+    until a fixed point is reached. The landmarks of the task are the union
+    of the goal labels; q in L(p) gives the natural ordering q -> p.
+    """
+    facts = task.get_facts()
+    fact_ids = {fact: i for i, fact in enumerate(facts)}
+    actions = task.actions
+    pre_ids = [[fact_ids[p] for p in a.preconditions] for a in actions]
+    add_ids = [[fact_ids[p] for p in a.add_effects] for a in actions]
+    precondition_of: List[List[int]] = [[] for _ in facts]
+    for action_id, pres in enumerate(pre_ids):
+        for p in pres:
+            precondition_of[p].append(action_id)
+
+    labels: List[int | None] = [None] * len(facts)
+    for pred in task.initial_state.predicates:
+        i = fact_ids[pred]
+        labels[i] = 1 << i
+
+    # Actions are re-evaluated whenever the label of a precondition shrinks
+    queue = deque(range(len(actions)))
+    queued = [True] * len(actions)
+    while queue:
+        action_id = queue.popleft()
+        queued[action_id] = False
+        action_label = 0
+        for p in pre_ids[action_id]:
+            if labels[p] is None:
+                break
+            action_label |= labels[p]
+        else:
+            for q in add_ids[action_id]:
+                new_label = action_label | (1 << q)
+                old_label = labels[q]
+                if old_label is not None:
+                    new_label &= old_label
+                    if new_label == old_label:
+                        continue
+                labels[q] = new_label
+                for successor in precondition_of[q]:
+                    if not queued[successor]:
+                        queued[successor] = True
+                        queue.append(successor)
+
+    goal_ids = [fact_ids[p] for p in task.goal]
+    if any(labels[g] is None for g in goal_ids):
+        return LandmarkGraph(solvable=False)
+
+    landmark_bits = 0
+    for g in goal_ids:
+        landmark_bits |= labels[g]
+    landmark_facts = [i for i in range(len(facts)) if landmark_bits >> i & 1]
+    lm_index = {fact_id: i for i, fact_id in enumerate(landmark_facts)}
+
+    def to_landmarks(bits: int) -> int:
+        mask = 0
+        for fact_id, i in lm_index.items():
+            if bits >> fact_id & 1:
+                mask |= 1 << i
+        return mask
+
+    achievers: List[List[int]] = [[] for _ in landmark_facts]
+    for action_id, adds in enumerate(add_ids):
+        for q in adds:
+            if q in lm_index:
+                achievers[lm_index[q]].append(action_id)
+
+    parents = []
+    necessary_children = [0] * len(landmark_facts)
+    for i, fact_id in enumerate(landmark_facts):
+        parents.append(to_landmarks(labels[fact_id]) & ~(1 << i))
+        # Landmarks in the precondition of every relaxed-reachable achiever
+        common = None
+        for action_id in achievers[i]:
+            if any(labels[p] is None for p in pre_ids[action_id]):
+                continue
+            pres = to_landmarks(sum(1 << p for p in pre_ids[action_id]))
+            common = pres if common is None else common & pres
+        for j in range(len(landmark_facts)):
+            if common and common >> j & 1 and j != i:
+                necessary_children[j] |= 1 << i
+
+    return LandmarkGraph(
+        facts=[facts[f] for f in landmark_facts],
+        achievers=achievers,
+        parents=parents,
+        necessary_children=necessary_children,
+        goal_mask=to_landmarks(sum(1 << g for g in goal_ids)),
+    )
@@ -0,0 +1,97 @@
+"""Landmark-count heuristic (Richter, Helmert & Westphal, 2008)."""
+import math
+from typing import Dict
+
+from .base import HeuristicFunction
+from .landmarks import get_landmark_graph
+from ...representations.action import Action
+from ...representations.state import State
+
+
+class LandmarkCountHeuristic(HeuristicFunction):
+    """
+    Landmark-count heuristic.
+    h(s) = number of landmarks that still have to be achieved: those not yet
+    accepted on the path to s, plus accepted ones that are required again
+    (false goal landmarks, and false landmarks needed right before an
+    unaccepted one).
+    Inadmissible by default. With admissible=True each landmark is valued
+    with a uniform cost partitioning over its achievers instead of 1.
+    """
+
+    path_dependent = True
+
+    def __init__(self, task, admissible: bool = False):
+        super().__init__(task)
+        self.admissible = admissible
+        self.graph = get_landmark_graph(task)
+        # Accepted landmarks (bitmask) per state of the current search. Keyed by
+        # the State itself, so states with colliding hashes stay apart
+        self.accepted: Dict[State, int] = {}
+
+    def notify_initial_state(self, state: State) -> None:
+        """Start a new search: forget the last one; only the landmarks true initially are accepted."""
+        self.accepted.clear()
+        self.accepted[state] = self.graph.mask_of(state.predicates)
+
+    def notify_transition(self, parent_state: State, action: Action, child_state: State) -> None:
+        """Accept the child's true landmarks; intersect over the paths reaching it."""
+        parent_accepted = self.accepted.get(parent_state, 0)
+        accepted = parent_accepted | self.graph.mask_of(action.add_effects & child_state.predicates)
+        known = self.accepted.get(child_state)
+        self.accepted[child_state] = accepted if known is None else known & accepted
+
+    def calculate(self, state: State) -> float:
+        """Calculate landmark-count heuristic."""
+        graph = self.graph
+        if not graph.solvable:
+            return float('inf')
+
+        true_mask = graph.mask_of(state.predicates)
+        accepted = self.accepted.get(state)
+        if accepted is None:
+            accepted = true_mask
+        all_mask = (1 << len(graph)) - 1
+
+        # Accepted but false landmarks that have to be achieved again
+        required_again = 0
+        candidates = accepted & ~true_mask
+        while candidates:
+            low = candidates & -candidates
+            i = low.bit_length() - 1
+            if low & graph.goal_mask or graph.necessary_children[i] & ~accepted:
+                required_again |= low
+            candidates ^= low
+
+        future = (all_mask & ~accepted) | required_again
+        if not future:
+            return 0.0
+
+        if not self.admissible:
+            for i in _bits(future):
+                if not graph.achievers[i]:
+                    return float('inf')
+            return float(bin(future).count("1"))
+
+        # Uniform cost partitioning: each action's cost is shared equally by
+        # the future landmarks it achieves
+        counts: Dict[int, int] = {}
+        future_ids = list(_bits(future))
+        for i in future_ids:
+            for action_id in graph.achievers[i]:
+                counts[action_id] = counts.get(action_id, 0) + 1
+        total = 0.0
+        for i in future_ids:
+            achievers = graph.achievers[i]
+            if not achievers:
+                return float('inf')
+            total += min(1.0 / counts[a] for a in achievers)
+        return float(math.ceil(total - 1e-9))
+
+
+def _bits(mask: int):
+    """Yield the indices of the set bits of a mask."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
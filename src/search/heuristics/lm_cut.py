@@ -0,0 +1,197 @@
+"""LM-cut heuristic (Helmert & Domshlak, 2009)."""
+from heapq import heappush, heappop
+from typing import List
+
+from .base import HeuristicFunction
+from ...representations.state import State
+
+INF = float('inf')
+
+# Proposition status during one LM-cut computation
+UNREACHED = 0
+REACHED = 1
+GOAL_ZONE = 2
+BEFORE_GOAL_ZONE = 3
+
+
+class LMCutHeuristic(HeuristicFunction):
+    """
+    Landmark-cut heuristic.
+    Repeatedly computes h_max, extracts a cut of actions that every relaxed
+    plan must use (a disjunctive action landmark), adds its minimum cost and
+    reduces the cost of the cut's actions by that amount.
+    Admissible, and much more informed than h_max.
+    """
+
+    def __init__(self, task):
+        super().__init__(task)
+
+        facts = task.get_facts()
+        fact_ids = {fact: i for i, fact in enumerate(facts)}
+        # Artificial propositions: precondition of precondition-free actions, and the goal
+        self._init_prop = len(facts)
+        self._goal_prop = len(facts) + 1
+        self._fact_ids = fact_ids
+        num_props = len(facts) + 2
+
+        self._op_pre: List[List[int]] = []
+        self._op_eff: List[List[int]] = []
+        self._op_base_cost: List[int] = []
+        for action in task.actions:
+            pre = [fact_ids[p] for p in action.preconditions] or [self._init_prop]
+            self._op_pre.append(pre)
+            self._op_eff.append([fact_ids[p] for p in action.add_effects])
+            self._op_base_cost.append(1)
+        # Artificial goal action with cost 0
+        self._op_pre.append([fact_ids[p] for p in task.goal] or [self._init_prop])
+        self._op_eff.append([self._goal_prop])
+        self._op_base_cost.append(0)
+
+        num_ops = len(self._op_pre)
+        self._precondition_of: List[List[int]] = [[] for _ in range(num_props)]
+        self._effect_of: List[List[int]] = [[] for _ in range(num_props)]
+        for op in range(num_ops):
+            for p in self._op_pre[op]:
+                self._precondition_of[p].append(op)
+            for p in self._op_eff[op]:
+                self._effect_of[p].append(op)
+
+        # Per-evaluation scratch data
+        self._h = [INF] * num_props
+        self._status = [UNREACHED] * num_props
+        self._cost = [0] * num_ops
+        self._unsatisfied = [0] * num_ops
+        self._supporter = [-1] * num_ops
+        self._supporter_cost = [0] * num_ops
+
+    def calculate(self, state: State) -> float:
+        """Calculate LM-cut heuristic."""
+        init_props = [self._fact_ids[p] for p in state.predicates if p in self._fact_ids]
+        init_props.append(self._init_prop)
+
+        self._first_exploration(init_props)
+        if self._status[self._goal_prop] == UNREACHED:
+            return INF
+
+        total = 0
+        status = self._status
+        while self._h[self._goal_prop] != 0:
+            self._mark_goal_plateau(self._goal_prop)
+            cut = self._second_exploration(init_props)
+            cut_cost = min(self._cost[op] for op in cut)
+            for op in cut:
+                self._cost[op] -= cut_cost
+            total += cut_cost
+            self._first_exploration_incremental(cut)
+            for p in range(len(status)):
+                if status[p] == GOAL_ZONE or status[p] == BEFORE_GOAL_ZONE:
+                    status[p] = REACHED
+
+        return float(total)
+
+    def _enqueue_if_necessary(self, queue: list, prop: int, cost: int):
+        """Lower the h_max cost of a proposition and schedule it."""
+        if self._status[prop] == UNREACHED or self._h[prop] > cost:
+            self._status[prop] = REACHED
+            self._h[prop] = cost
+            heappush(queue, (cost, prop))
+
+    def _first_exploration(self, init_props: List[int]):
+        """Compute h_max from scratch with the original action costs."""
+        h = self._h
+        status = self._status
+        for p in range(len(h)):
+            h[p] = INF
+            status[p] = UNREACHED
+        self._cost[:] = self._op_base_cost
+        for op in range(len(self._op_pre)):
+            self._unsatisfied[op] = len(self._op_pre[op])
+            self._supporter[op] = -1
+
+        queue = []
+        for p in init_props:
+            self._enqueue_if_necessary(queue, p, 0)
+
+        unsatisfied = self._unsatisfied
+        while queue:
+            cost, prop = heappop(queue)
+            if h[prop] < cost:
+                continue
+            for op in self._precondition_of[prop]:
+                unsatisfied[op] -= 1
+                if unsatisfied[op] == 0:
+                    # Preconditions are popped in cost order, so this one is the max
+                    self._supporter[op] = prop
+                    self._supporter_cost[op] = cost
+                    target = cost + self._cost[op]
+                    for eff in self._op_eff[op]:
+                        self._enqueue_if_necessary(queue, eff, target)
+
+    def _first_exploration_incremental(self, cut: List[int]):
+        """Update h_max after the costs of the cut's actions were reduced."""
+        h = self._h
+        queue = []
+        for op in cut:
+            cost = h[self._supporter[op]] + self._cost[op]
+            for eff in self._op_eff[op]:
+                if h[eff] > cost:
+                    self._enqueue_if_necessary(queue, eff, cost)
+
+        while queue:
+            popped_cost, prop = heappop(queue)
+            if h[prop] < popped_cost:
+                continue
+            for op in self._precondition_of[prop]:
+                if self._supporter[op] != prop:
+                    continue
+                old_supporter_cost = self._supporter_cost[op]
+                if old_supporter_cost <= popped_cost:
+                    continue
+                # The supporter got cheaper; another precondition may now be the max
+                supporter = prop
+                for pre in self._op_pre[op]:
+                    if h[pre] > h[supporter]:
+                        supporter = pre
+                self._supporter[op] = supporter
+                self._supporter_cost[op] = h[supporter]
+                if h[supporter] != old_supporter_cost:
+                    target = h[supporter] + self._cost[op]
+                    for eff in self._op_eff[op]:
+                        self._enqueue_if_necessary(queue, eff, target)
+
+    def _mark_goal_plateau(self, goal_prop: int):
+        """Mark propositions reaching the goal through zero-cost supporters."""
+        stack = [goal_prop]
+        status = self._status
+        while stack:
+            prop = stack.pop()
+            if prop == -1 or status[prop] == GOAL_ZONE:
+                continue
+            status[prop] = GOAL_ZONE
+            for op in self._effect_of[prop]:
+                if self._cost[op] == 0:
+                    stack.append(self._supporter[op])
+
+    def _second_exploration(self, init_props: List[int]) -> List[int]:
+        """Find the cut: actions leading from before the goal zone into it."""
+        status = self._status
+        cut = []
+        queue = []
+        for p in init_props:
+            status[p] = BEFORE_GOAL_ZONE
+            queue.append(p)
+
+        while queue:
+            prop = queue.pop()
+            for op in self._precondition_of[prop]:
+                if self._supporter[op] != prop:
+                    continue
+                effects = self._op_eff[op]
+                if any(status[eff] == GOAL_ZONE for eff in effects):
+                    cut.append(op)
+                    continue
+                for eff in effects:
+                    if status[eff] != BEFORE_GOAL_ZONE:
+                        status[eff] = BEFORE_GOAL_ZONE
+                        queue.append(eff)
+        return cut
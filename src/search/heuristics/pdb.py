@@ -0,0 +1,447 @@
+"""Pattern database heuristics with iPDB pattern selection and canonical combination."""
+from __future__ import annotations
+import hashlib
+import os
+import pickle
+import random
+import tempfile
+import time
+from array import array
+from collections import deque
+from pathlib import Path
+from typing import Dict, FrozenSet, List, Sequence, Tuple
+
+from .base import HeuristicFunction
+from ...grounding.sas_translator import get_sas_task
+from ...representations.state import State
+from ...representations.task import Task
+
+UNSOLVABLE = 0xFFFF  # Distance entry of abstract states that cannot reach the goal
+CACHE_VERSION = 3
+
+
+class VariableModel:
+    """
+    Finite-domain view of a task used to build projections.
+
+    A variable is a list of mutually exclusive facts; its value is the index
+    of the fact that is true, or len(facts) ("none") if no fact is. The
+    variables are those of the task's SAS+ translation.
+    """
+
+    def __init__(self, task: Task):
+        self.variables: List[List[str]] = [var.facts for var in get_sas_task(task).variables]
+        self.fact_to_value: Dict[str, Tuple[int, int]] = {}
+        for var, facts in enumerate(self.variables):
+            for value, fact in enumerate(facts):
+                self.fact_to_value[fact] = (var, value)
+
+        # Per action: var -> required value, var -> added value, var -> deleted values
+        self.op_pre: List[Dict[int, int]] = []
+        self.op_add: List[Dict[int, int]] = []
+        self.op_del: List[Dict[int, FrozenSet[int]]] = []
+        self.op_valid: List[bool] = []  # False if two preconditions share a variable
+        for action in task.actions:
+            pre, add, dels = {}, {}, {}
+            valid = True
+            for fact in action.preconditions:
+                var, value = self.fact_to_value[fact]
+                if pre.get(var, value) != value:
+                    valid = False
+                pre[var] = value
+            for fact in action.add_effects:
+                var, value = self.fact_to_value[fact]
+                add[var] = value
+            for fact in action.del_effects:
+                var, value = self.fact_to_value[fact]
+                if var not in add:
+                    dels.setdefault(var, set()).add(value)
+            self.op_pre.append(pre)
+            self.op_add.append(add)
+            self.op_del.append({var: frozenset(values) for var, values in dels.items()})
+            self.op_valid.append(valid)
+
+        self.goal: Dict[int, int] = dict(self.fact_to_value[fact] for fact in task.goal)
+        # Actions changing each variable
+        self.affecting_ops: List[List[int]] = [[] for _ in self.variables]
+        for op in range(len(task.actions)):
+            for var in set(self.op_add[op]) | set(self.op_del[op]):
+                self.affecting_ops[var].append(op)
+
+    def domain_size(self, var: int) -> int:
+        """Number of values of a variable, including "none"."""
+        return len(self.variables[var]) + 1
+
+
+def get_variable_model(task: Task) -> VariableModel:
+    """Return the task's variable model, computing it on first use."""
+    model = task.cache.get("pdb_variables")
+    if model is None:
+        model = VariableModel(task)
+        task.cache["pdb_variables"] = model
+    return model
+
+
+class PatternDatabase:
+    """
+    Goal distances of every abstract state of a projection onto a pattern.
+
+    Abstract states are numbered with a mixed-radix perfect hash,
+        index = sum(value[i] * multiplier[i]),
+    and distances are stored in an array('H') indexed by it.
+    """
+
+    def __init__(self, model: VariableModel, pattern: Sequence[int],
+                 distances: array | None = None):
+        self.model = model
+        self.pattern: Tuple[int, ...] = tuple(sorted(pattern))
+        self.sizes = [model.domain_size(var) for var in self.pattern]
+        self.multipliers = []
+        num_states = 1
+        for size in self.sizes:
+            self.multipliers.append(num_states)
+            num_states *= size
+        self.num_states = num_states
+
+        # Lookup: start from the all-"none" index and adjust for each true fact
+        self._base = sum((size - 1) * mult for size, mult in zip(self.sizes, self.multipliers))
+        self._fact_deltas: List[Tuple[str, int]] = []
+        for var, size, mult in zip(self.pattern, self.sizes, self.multipliers):
+            for value, fact in enumerate(model.variables[var]):
+                self._fact_deltas.append((fact, (value - (size - 1)) * mult))
+
+        # Actions that change a variable of the pattern
+        ops = set()
+        for var in self.pattern:
+            ops.update(model.affecting_ops[var])
+        self.relevant_ops: FrozenSet[int] = frozenset(ops)
+
+        self.distances = distances if distances is not None else self._compute_distances()
+
+    @staticmethod
+    def num_abstract_states(model: VariableModel, pattern: Sequence[int]) -> int:
+        """Size of the abstract state space of a pattern, without building it."""
+        size = 1
+        for var in pattern:
+            size *= model.domain_size(var)
+        return size
+
+    def lookup(self, state: State) -> float:
+        """Abstract goal distance of a state, or inf."""
+        index = self._base
+        preds = state.predicates
+        for fact, delta in self._fact_deltas:
+            if fact in preds:
+                index += delta
+        distance = self.distances[index]
+        return float('inf') if distance == UNSOLVABLE else float(distance)
+
+    def _compute_distances(self) -> array:
+        """Build the abstract transition graph and search backward from the goals."""
+        model = self.model
+        position = {var: i for i, var in enumerate(self.pattern)}
+        none = [size - 1 for size in self.sizes]
+        mults = self.multipliers
+        sizes = self.sizes
+
+        abstract_ops = []
+        for op in sorted(self.relevant_ops):
+            if not model.op_valid[op]:
+                continue
+            pres = [(position[v], val) for v, val in model.op_pre[op].items() if v in position]
+            adds = [(position[v], val) for v, val in model.op_add[op].items() if v in position]
+            dels = [(position[v], vals) for v, vals in model.op_del[op].items() if v in position]
+            abstract_ops.append((pres, adds, dels))
+
+        predecessors: List[List[int]] = [[] for _ in range(self.num_states)]
+        goal_states = []
+        goal = [(position[v], val) for v, val in model.goal.items() if v in position]
+        for index in range(self.num_states):
+            values = [(index // m) % s for m, s in zip(mults, sizes)]
+            if all(values[p] == val for p, val in goal):
+                goal_states.append(index)
+            for pres, adds, dels in abstract_ops:
+                if any(values[p] != val for p, val in pres):
+                    continue
+                succ = index
+                for p, vals in dels:
+                    if values[p] in vals:
+                        succ += (none[p] - values[p]) * mults[p]
+                for p, val in adds:
+                    succ += (val - values[p]) * mults[p]
+                if succ != index:
+                    predecessors[succ].append(index)
+
+        distances = array('H', [UNSOLVABLE]) * self.num_states
+        queue = deque(goal_states)
+        for index in goal_states:
+            distances[index] = 0
+        while queue:
+            index = queue.popleft()
+            d = min(distances[index] + 1, UNSOLVABLE - 1)
+            for pred in predecessors[index]:
+                if distances[pred] == UNSOLVABLE:
+                    distances[pred] = d
+                    queue.append(pred)
+        return distances
+
+
+class CanonicalPDBHeuristic(HeuristicFunction):
+    """
+    Canonical combination of pattern databases.
+    h(s) = max over maximal sets of additive PDBs of the sum of their values.
+    Two PDBs are additive if no action changes variables of both patterns.
+    Admissible.
+
+    Patterns are given explicitly or selected by iPDB hill climbing
+    (Haslum et al., 2007). With a cache directory, the pattern collection and
+    distance tables are stored on disk per task and reused by later runs.
+    """
+
+    def __init__(self, task, patterns: List[List[int]] | None = None,
+                 max_pdb_size: int = 2000, max_collection_size: int = 20000,
+                 num_samples: int = 100, min_improvement: int = 1,
+                 max_time: float = 5.0, seed: int = 0,
+                 cache_dir: str | None = None, cache_max_bytes: int | None = None):
+        """
+        Initialize and precompute the pattern databases.
+
+        Args:
+            task: The planning task
+            patterns: Patterns as lists of variable indices (default: iPDB)
+            max_pdb_size: Maximum number of abstract states of one PDB
+            max_collection_size: Maximum abstract states over all PDBs
+            num_samples: Random-walk samples per hill-climbing step
+            min_improvement: Samples a candidate must improve to be added
+            max_time: Time limit for hill climbing in seconds
+            seed: Random seed for the random walks
+            cache_dir: Directory for cached PDBs (default: no disk cache)
+            cache_max_bytes: Size limit of the cache directory; the least
+                recently used entries are evicted (default: unbounded)
+        """
+        super().__init__(task)
+        self.model = get_variable_model(task)
+        self.max_pdb_size = max_pdb_size
+        self.max_collection_size = max_collection_size
+        self.num_samples = num_samples
+        self.min_improvement = min_improvement
+        self.max_time = max_time
+        self._rng = random.Random(seed)
+        self._built: Dict[Tuple[int, ...], PatternDatabase] = {}
+
+        cache_file = None
+        if cache_dir is not None:
+            key = _fingerprint(task, self.model, [patterns, max_pdb_size, max_collection_size,
+                                                  num_samples, min_improvement, seed])
+            cache_file = Path(cache_dir) / f"{key}.pkl"
+
+        self.pdbs = self._load(cache_file) if cache_file else None
+        if self.pdbs is None:
+            if patterns is None:
+                self.pdbs = self._hill_climbing()
+            else:
+                self.pdbs = [self._get_pdb(p) for p in patterns]
+            if cache_file:
+                self._save(cache_file)
+                if cache_max_bytes is not None:
+                    _evict_cache(cache_file.parent, cache_max_bytes)
+        self._built.clear()
+        self.cliques = _additive_cliques(self.pdbs)
+
+    def calculate(self, state: State) -> float:
+        """Calculate canonical PDB heuristic."""
+        return self._canonical(self.pdbs, self.cliques, [pdb.lookup(state) for pdb in self.pdbs])
+
+    @staticmethod
+    def _canonical(pdbs, cliques, values: List[float]) -> float:
+        """Max over additive cliques of the summed PDB values."""
+        if not pdbs:
+            return 0.0
+        if float('inf') in values:
+            return float('inf')
+        return float(max(sum(values[i] for i in clique) for clique in cliques))
+
+    def _get_pdb(self, pattern: Sequence[int]) -> PatternDatabase:
+        """Build a PDB, reusing one already built during this run."""
+        key = tuple(sorted(pattern))
+        if key not in self._built:
+            self._built[key] = PatternDatabase(self.model, key)
+        return self._built[key]
+
+    def _hill_climbing(self) -> List[PatternDatabase]:
+        """
+        iPDB pattern selection.
+        Start with one pattern per goal variable. In each step, try extending
+        every pattern by one causally relevant variable and add the candidate
+        that raises the heuristic on the most random-walk samples.
+        """
+        start = time.time()
+        model = self.model
+        pdbs = [self._get_pdb([var]) for var in sorted(model.goal)]
+        collection_size = sum(pdb.num_states for pdb in pdbs)
+        tried = {pdb.pattern for pdb in pdbs}
+
+        while time.time() - start < self.max_time:
+            cliques = _additive_cliques(pdbs)
+            samples = self._sample_states(pdbs, cliques)
+            if not samples:
+                break
+
+            best, best_score = None, 0
+            for pattern in {pdb.pattern for pdb in pdbs}:
+                for var in self._relevant_variables(pattern):
+                    candidate = tuple(sorted(pattern + (var,)))
+                    if candidate in tried:
+                        continue
+                    size = PatternDatabase.num_abstract_states(model, candidate)
+                    if (size > self.max_pdb_size
+                            or collection_size + size > self.max_collection_size):
+                        continue
+                    if time.time() - start >= self.max_time:
+                        break
+                    pdb = self._get_pdb(candidate)
+                    extended = pdbs + [pdb]
+                    extended_cliques = _additive_cliques(extended)
+                    score = 0
+                    for state, h, values in samples:
+                        values = values + [pdb.lookup(state)]
+                        if self._canonical(extended, extended_cliques, values) > h:
+                            score += 1
+                    if score > best_score:
+                        best, best_score = pdb, score
+
+            if best is None or best_score < self.min_improvement:
+                break
+            pdbs.append(best)
+            tried.add(best.pattern)
+            collection_size += best.num_states
+        return pdbs
+
+    def _relevant_variables(self, pattern: Tuple[int, ...]) -> List[int]:
+        """Variables in the preconditions or effects of actions changing the pattern, plus goals."""
+        model = self.model
+        relevant = set(model.goal)
+        for var in pattern:
+            for op in model.affecting_ops[var]:
+                relevant.update(model.op_pre[op])
+                relevant.update(model.op_add[op])
+                relevant.update(model.op_del[op])
+        return sorted(relevant.difference(pattern))
+
+    def _sample_states(self, pdbs, cliques) -> List[Tuple[State, float, List[float]]]:
+        """Sample states by random walks from the initial state, with their current h and PDB values."""
+        task = self.task
+        initial_h = self._canonical(pdbs, cliques, [p.lookup(task.initial_state) for p in pdbs])
+        if initial_h == float('inf'):
+            return []
+        max_length = max(1, int(2 * initial_h))
+        samples = []
+        for _ in range(self.num_samples):
+            state = task.initial_state
+            for _ in range(self._rng.randint(0, max_length)):
+                applicable = task.get_applicable_action_ids(state)
+                if not applicable:
+                    break
+                state = task.actions[self._rng.choice(applicable)].apply(state)
+            values = [p.lookup(state) for p in pdbs]
+            h = self._canonical(pdbs, cliques, values)
+            if h != float('inf'):
+                samples.append((state, h, values))
+        return samples
+
+    def _load(self, cache_file: Path) -> List[PatternDatabase] | None:
+        """Load cached PDBs, or None if there is no usable cache entry."""
+        try:
+            with open(cache_file, "rb") as f:
+                data = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+        if data.get("version") != CACHE_VERSION:
+            return None
+        # Patterns index the model's variables; reject entries built for another layout
+        num_vars = len(self.model.variables)
+        for pattern, distances in data["pdbs"]:
+            if not all(0 <= var < num_vars for var in pattern):
+                return None
+            if len(distances) != PatternDatabase.num_abstract_states(self.model, pattern):
+                return None
+        try:
+            os.utime(cache_file)  # Recently used entries survive eviction
+        except OSError:
+            pass
+        return [PatternDatabase(self.model, pattern, distances)
+                for pattern, distances in data["pdbs"]]
+
+    def _save(self, cache_file: Path) -> None:
+        """Write the PDBs to the cache directory (atomically)."""
+        data = {
+            "version": CACHE_VERSION,
+            "pdbs": [(pdb.pattern, pdb.distances) for pdb in self.pdbs],
+        }
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=cache_file.parent, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_name, cache_file)
+            except BaseException:
+                os.unlink(tmp_name)
+                raise
+        except OSError:
+            pass  # The cache is an optimization only
+
+
+def _additive_cliques(pdbs: List[PatternDatabase]) -> List[List[int]]:
+    """Maximal sets of pairwise additive PDBs (Bron-Kerbosch)."""
+    n = len(pdbs)
+    neighbours = [
+        {j for j in range(n) if j != i and pdbs[i].relevant_ops.isdisjoint(pdbs[j].relevant_ops)}
+        for i in range(n)
+    ]
+    cliques = []
+
+    def expand(clique, candidates, excluded):
+        if not candidates and not excluded:
+            cliques.append(clique)
+            return
+        for v in list(candidates):
+            expand(clique + [v], candidates & neighbours[v], excluded & neighbours[v])
+            candidates = candidates - {v}
+            excluded = excluded | {v}
+
+    expand([], set(range(n)), set())
+    return cliques
+
+
+def _evict_cache(cache_dir: Path, max_bytes: int) -> None:
+    """Delete the least recently used cache entries until the directory fits max_bytes."""
+    entries = []
+    for path in cache_dir.glob("*.pkl"):
+        try:
+            stat = path.stat()
+        except OSError:
+            continue  # Evicted concurrently
+        entries.append((stat.st_mtime, stat.st_size, path))
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            path.unlink()
+        except OSError:
+            pass
+        total -= size
+
+
+def _fingerprint(task: Task, model: VariableModel, params) -> str:
+    """Stable hash of a task's grounded content, its variables and the PDB parameters."""
+    digest = hashlib.sha256()
+    digest.update(repr((CACHE_VERSION, params)).encode())
+    digest.update(repr(model.variables).encode())
+    digest.update(repr(sorted(task.initial_state.predicates)).encode())
+    digest.update(repr(sorted(task.goal)).encode())
+    for action in task.actions:
+        digest.update(repr((action.name, sorted(action.preconditions), sorted(action.add_effects),
+                            sorted(action.del_effects))).encode())
+    return digest.hexdigest()
@@ -0,0 +1,148 @@
+"""Open lists over integer state IDs."""
+from __future__ import annotations
+import math
+from collections import deque
+from heapq import heappush, heappop
+from typing import Deque, List
+
+ID_BITS = 32
+TIE_BREAK_BITS = 16
+_ID_MASK = (1 << ID_BITS) - 1
+_TIE_BREAK_MAX = (1 << TIE_BREAK_BITS) - 1
+
+
+def to_priority(value: float) -> int:
+    """
+    Convert a cost estimate to an integer priority.
+    Values are rounded up, which keeps admissible estimates admissible
+    under unit action costs.
+    """
+    return math.ceil(value - 1e-9)
+
+
+class HeapOpenList:
+    """
+    Binary heap of plain integer keys.
+
+    Each entry is packed into a single int:
+        priority << 48 | tie_break << 32 | state_id
+    so heap comparisons are integer comparisons instead of tuple
+    comparisons. Ties on priority go to the lower tie_break value, then to
+    the older state ID (FIFO) or the newer one (LIFO).
+    """
+
+    def __init__(self, lifo: bool = False):
+        self._heap: List[int] = []
+        self._lifo = lifo
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def push(self, state_id: int, priority: float, tie_break: float = 0) -> None:
+        """Insert a state with the given priority (e.g. f or h)."""
+        tie_break = min(to_priority(tie_break), _TIE_BREAK_MAX)
+        order = _ID_MASK - state_id if self._lifo else state_id
+        key = (((to_priority(priority) << TIE_BREAK_BITS) | tie_break) << ID_BITS) | order
+        heappush(self._heap, key)
+
+    def pop(self) -> int:
+        """Remove and return the state ID with the lowest key."""
+        order = heappop(self._heap) & _ID_MASK
+        return _ID_MASK - order if self._lifo else order
+
+    def min_priority(self) -> int:
+        """Priority of the next state to be popped."""
+        return self._heap[0] >> (TIE_BREAK_BITS + ID_BITS)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._heap.clear()
+
+
+class BucketOpenList:
+    """
+    Bucket queue for small integer priorities.
+
+    buckets[priority][tie_break] is a deque of state IDs, so push and pop
+    are O(1) amortized. Within a priority, lower tie_break values (e.g. h
+    for A*) are popped first; within a deque, entries are taken FIFO or
+    LIFO.
+    """
+
+    def __init__(self, lifo: bool = False):
+        self._buckets: List[List[Deque[int]]] = []
+        self._bucket_sizes: List[int] = []
+        self._tie_min: List[int] = []  # Lowest possibly non-empty tie_break per bucket
+        self._min = 0  # Lowest possibly non-empty priority
+        self._size = 0
+        self._lifo = lifo
+
+    def __len__(self) -> int:
+        return self._size
+
+    def push(self, state_id: int, priority: float, tie_break: float = 0) -> None:
+        """Insert a state with the given priority (e.g. f or h)."""
+        p = to_priority(priority)
+        t = to_priority(tie_break)
+        while len(self._buckets) <= p:
+            self._buckets.append([])
+            self._bucket_sizes.append(0)
+            self._tie_min.append(0)
+        bucket = self._buckets[p]
+        while len(bucket) <= t:
+            bucket.append(deque())
+        bucket[t].append(state_id)
+        self._bucket_sizes[p] += 1
+        self._size += 1
+        if self._bucket_sizes[p] == 1 or t < self._tie_min[p]:
+            self._tie_min[p] = t
+        if p < self._min or self._size == 1:
+            self._min = p
+
+    def pop(self) -> int:
+        """Remove and return a state ID with the lowest priority and tie_break."""
+        if not self._size:
+            raise IndexError("pop from empty open list")
+        p = self._advance()
+        bucket = self._buckets[p]
+        t = self._tie_min[p]
+        while not bucket[t]:
+            t += 1
+        self._tie_min[p] = t
+        entries = bucket[t]
+        state_id = entries.pop() if self._lifo else entries.popleft()
+        self._bucket_sizes[p] -= 1
+        self._size -= 1
+        return state_id
+
+    def min_priority(self) -> int:
+        """Priority of the next state to be popped."""
+        return self._advance()
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self.__init__(self._lifo)
+
+    def _advance(self) -> int:
+        """Move the minimum pointer to the first non-empty bucket."""
+        while not self._bucket_sizes[self._min]:
+            self._min += 1
+        return self._min
+
+
+def make_open_list(kind: str = "heap", tie_breaking: str = "fifo"):
+    """
+    Create an open list by name.
+
+    Args:
+        kind: "heap" (binary heap) or "bucket" (bucket queue)
+        tie_breaking: "fifo" or "lifo" among entries with equal keys
+    """
+    if tie_breaking not in ("fifo", "lifo"):
+        raise ValueError(f"Unknown tie-breaking: {tie_breaking}")
+    lifo = tie_breaking == "lifo"
+    if kind == "heap":
+        return HeapOpenList(lifo=lifo)
+    if kind == "bucket":
+        return BucketOpenList(lifo=lifo)
+    raise ValueError(f"Unknown open list: {kind}")
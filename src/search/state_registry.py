@@ -0,0 +1,151 @@
+"""Packed state registry with integer state IDs."""
+from __future__ import annotations
+from array import array
+from typing import Dict, List, Tuple
+
+from ..representations.state import State
+from ..representations.action import Action
+from ..representations.task import Task
+from ..grounding.sas_translator import get_sas_task
+
+NO_STATE = -1
+NO_ACTION = -1
+UNREACHED = 2 ** 62  # g value of a state no path has been found to
+
+
+class StateRegistry:
+    """
+    Stores every unique state of a search exactly once and hands out dense
+    integer state IDs.
+
+    States are kept as bit-packed vectors of SAS+ variable values in one
+    contiguous bytearray; a variable with k facts takes bit_length(k) bits
+    (0 meaning none of its facts is true). Per-state search information
+    lives in parallel arrays indexed by state ID, so search code only needs
+    to hold integers:
+
+        g[id]       cost of the best known path
+        h[id]       cached heuristic value
+        parent[id]  state ID the best path came from (NO_STATE for the root)
+        action[id]  index into task.actions of the action that created it
+        closed[id]  1 once the state has been expanded
+    """
+
+    def __init__(self, task: Task):
+        """
+        Initialize an empty registry for a task.
+
+        The packing layout only depends on the task, so registries of the
+        same task (e.g. in different processes) can exchange packed states.
+        """
+        self.task = task
+        self._fact_codes: Dict[str, int] = {}
+        self._layout: List[Tuple[int, int, List[str]]] = []  # (offset, mask, facts) per variable
+        offset = 0
+        for variable in get_sas_task(task).variables:
+            facts = variable.facts
+            width = len(facts).bit_length()
+            for value, fact in enumerate(facts):
+                self._fact_codes[fact] = (value + 1) << offset
+            self._layout.append((offset, (1 << width) - 1, facts))
+            offset += width
+        self.stride = max(1, (offset + 7) // 8)
+
+        self._packed = bytearray()
+        self._hashes = array('q')
+        self._next = array('q')  # Next state ID with the same hash
+        self._buckets: Dict[int, int] = {}  # hash -> first state ID
+
+        self.g = array('q')
+        self.h = array('d')
+        self.parent = array('q')
+        self.action = array('q')
+        self.closed = bytearray()
+
+    def __len__(self) -> int:
+        """Number of registered states."""
+        return len(self._hashes)
+
+    def pack(self, state: State) -> bytes:
+        """Encode a state as a bit vector of variable values."""
+        bits = 0
+        fact_codes = self._fact_codes
+        for pred in state.predicates:
+            bits |= fact_codes[pred]
+        return bits.to_bytes(self.stride, 'little')
+
+    def insert(self, state: State) -> Tuple[int, bool]:
+        """
+        Register a state.
+
+        Returns:
+            (state ID, True if the state was not registered before)
+        """
+        return self.insert_packed(self.pack(state), hash(state))
+
+    def insert_packed(self, packed: bytes, state_hash: int) -> Tuple[int, bool]:
+        """Register a state given its packed bit vector and Zobrist hash."""
+        stride = self.stride
+        state_id = self._buckets.get(state_hash, NO_STATE)
+        while state_id != NO_STATE:
+            start = state_id * stride
+            if self._packed[start:start + stride] == packed:
+                return state_id, False
+            state_id = self._next[state_id]
+
+        state_id = len(self._hashes)
+        self._packed += packed
+        self._hashes.append(state_hash)
+        self._next.append(self._buckets.get(state_hash, NO_STATE))
+        self._buckets[state_hash] = state_id
+
+        self.g.append(UNREACHED)
+        self.h.append(0.0)
+        self.parent.append(NO_STATE)
+        self.action.append(NO_ACTION)
+        self.closed.append(0)
+        return state_id, True
+
+    def get_packed(self, state_id: int) -> bytes:
+        """Get the packed bit vector of a registered state."""
+        start = state_id * self.stride
+        return bytes(self._packed[start:start + self.stride])
+
+    def get_hash(self, state_id: int) -> int:
+        """Get the Zobrist hash of a registered state."""
+        return self._hashes[state_id]
+
+    def get_state(self, state_id: int) -> State:
+        """Rebuild the State for a state ID."""
+        start = state_id * self.stride
+        bits = int.from_bytes(self._packed[start:start + self.stride], 'little')
+        preds = []
+        for offset, mask, facts in self._layout:
+            code = (bits >> offset) & mask
+            if code:
+                preds.append(facts[code - 1])
+        return State(preds, zobrist_hash=self._hashes[state_id])
+
+    def get_depth(self, state_id: int) -> int:
+        """Number of actions on the recorded path to a state."""
+        depth = 0
+        while self.parent[state_id] != NO_STATE:
+            state_id = self.parent[state_id]
+            depth += 1
+        return depth
+
+    def extract_plan(self, state_id: int) -> List[Action]:
+        """Follow parent IDs back to the root and return the action sequence."""
+        actions = self.task.actions
+        plan = []
+        while self.parent[state_id] != NO_STATE:
+            plan.append(actions[self.action[state_id]])
+            state_id = self.parent[state_id]
+        plan.reverse()
+        return plan
+
+    def memory_bytes(self) -> int:
+        """Approximate bytes held by the registry's buffers and arrays."""
+        arrays = (self._hashes, self._next, self.g, self.h, self.parent, self.action)
+        return (len(self._packed) + len(self.closed)
+                + sum(a.itemsize * len(a) for a in arrays))
@@ -0,0 +1,82 @@
+"""
+LRU cache of grounded tasks, keyed by the hash of the domain and problem text.
+
+Parsing and grounding dominate the cost of small searches, and the same
+problems (mostly the shipped benchmarks) are submitted over and over. A cached
+Task also keeps its derived analyses (Task.cache: landmark graph, SAS+
+translation, ...), so repeated heuristic setup is cheaper too. Tasks are not
+modified by search, so one instance is shared between requests.
+"""
+from __future__ import annotations
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Optional
+
+from .config import get_settings
+from .grounding.grounder import Grounder
+from .instrumentation import PhaseTimer
+from .metrics import CACHE_HITS, CACHE_MISSES
+from .parser.domain_parser import DomainParser
+from .parser.problem_parser import ProblemParser
+from .profiling import problem_hash
+from .representations.task import Task
+
+
+class TaskCache:
+    """Thread-safe LRU of grounded tasks."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._tasks: OrderedDict[str, Task] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def get(self, key: str) -> Optional[Task]:
+        with self._lock:
+            task = self._tasks.get(key)
+            if task is not None:
+                self._tasks.move_to_end(key)
+        if task is None:
+            CACHE_MISSES.inc(cache="task")
+        else:
+            CACHE_HITS.inc(cache="task")
+        return task
+
+    def put(self, key: str, task: Task) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._tasks[key] = task
+            self._tasks.move_to_end(key)
+            while len(self._tasks) > self.max_size:
+                self._tasks.popitem(last=False)
+
+    def get_or_ground(self, domain_pddl: str, problem_pddl: str,
+                      timer: Optional[PhaseTimer] = None) -> Task:
+        """Cached task for the PDDL pair; parses and grounds it on a miss."""
+        key = problem_hash(domain_pddl, problem_pddl)
+        task = self.get(key)
+        if task is not None:
+            return task
+        timer = timer or PhaseTimer(enabled=False)
+        with timer.phase("parse"):
+            domain = DomainParser().parse(domain_pddl)
+        with timer.phase("parse"):
+            problem = ProblemParser().parse(problem_pddl)
+        with timer.phase("ground"):
+            task = Grounder(domain, problem).ground_task()
+        self.put(key, task)
+        return task
+
+    def clear(self) -> None:
+        with self._lock:
+            self._tasks.clear()
+
+
+@lru_cache()
+def get_task_cache() -> TaskCache:
+    """Get the process-wide task cache."""
+    return TaskCache(get_settings().task_cache_size)
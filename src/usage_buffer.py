@@ -0,0 +1,194 @@
+"""
+Write-behind buffer for usage tracking.
+
+Tracking endpoints only record events in memory. The buffer writes them to
+the database in one transaction per flush. A flush happens every
+FLUSH_INTERVAL seconds (see the app lifespan), when MAX_PENDING events are
+waiting, and before any read of the tracked statistics.
+
+A failed write is put back and retried by the next flush. After MAX_RETRIES
+failures in a row the events are written one at a time, so an event the
+database rejects is dropped (and logged) without taking the others with it.
+At most MAX_BUFFERED usage rows are held, so a database outage cannot exhaust
+memory; rows beyond that are dropped and counted.
+
+Requests never see a failed flush: tracking endpoints have already buffered
+their event, and reads are served from the data committed so far.
+"""
+from __future__ import annotations
+import asyncio
+import logging
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from .async_db import run_write
+from .database import apply_usage_batch
+
+FLUSH_INTERVAL = 2.0  # Seconds between background flushes
+MAX_PENDING = 500  # Events that trigger a flush without waiting for the interval
+MAX_RETRIES = 5  # Consecutive failed writes before events are written one by one
+MAX_BUFFERED = 20_000  # Usage rows held while writes fail
+
+# uvicorn configures this logger (see main)
+logger = logging.getLogger("uvicorn.error")
+
+
+class UsageBuffer:
+    """Accumulates usage rows and statistic increments until flushed."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._failures = 0  # Consecutive failed writes
+        self._dropped = 0  # Usage rows dropped since the last report
+        self._reset()
+
+    def _reset(self) -> None:
+        self._usage: List[tuple] = []
+        self._plans: Dict[str, int] = {}
+        self._solved: Dict[str, Tuple[int, int]] = {}
+        self._events = 0
+
+    @property
+    def pending(self) -> int:
+        return self._events
+
+    def log_usage(self, username: str, algorithm: str, heuristic: Optional[str],
+                  problem_name: Optional[str], nodes_expanded: int,
+                  plan_length: int, search_time_ms: float) -> None:
+        with self._lock:
+            if len(self._usage) >= MAX_BUFFERED:
+                self._dropped += 1
+                return
+            self._usage.append((username, algorithm, heuristic, problem_name,
+                                nodes_expanded, plan_length, search_time_ms))
+            self._events += 1
+
+    def plan_generated(self, username: str) -> None:
+        with self._lock:
+            self._plans[username] = self._plans.get(username, 0) + 1
+            self._events += 1
+
+    def problem_solved(self, username: str, nodes_expanded: int = 0) -> None:
+        with self._lock:
+            count, nodes = self._solved.get(username, (0, 0))
+            self._solved[username] = (count + 1, nodes + nodes_expanded)
+            self._events += 1
+
+    def _take(self) -> Tuple[List[tuple], Dict[str, int], Dict[str, Tuple[int, int]]]:
+        with self._lock:
+            batch = (self._usage, self._plans, self._solved)
+            self._reset()
+        return batch
+
+    def _restore(self, usage, plans, solved) -> None:
+        """Put back a batch whose write failed, ahead of newer events."""
+        with self._lock:
+            self._usage[:0] = usage
+            if len(self._usage) > MAX_BUFFERED:
+                overflow = len(self._usage) - MAX_BUFFERED
+                del self._usage[MAX_BUFFERED:]
+                self._dropped += overflow
+                self._events -= overflow
+            for username, n in plans.items():
+                self._plans[username] = self._plans.get(username, 0) + n
+            for username, (n, nodes) in solved.items():
+                count, total = self._solved.get(username, (0, 0))
+                self._solved[username] = (count + n, total + nodes)
+            self._events += _count(usage, plans, solved)
+
+    def flush_sync(self) -> int:
+        """Write pending events in one transaction; returns the number written."""
+        self._report_dropped()
+        usage, plans, solved = self._take()
+        written = _count(usage, plans, solved)
+        if not written:
+            return 0
+        try:
+            apply_usage_batch(usage, plans, solved)
+        except Exception:
+            self._failures += 1
+            if self._failures < MAX_RETRIES:
+                self._restore(usage, plans, solved)
+                raise
+            self._failures = 0
+            return self._write_isolated(usage, plans, solved)
+        self._failures = 0
+        return written
+
+    def _write_isolated(self, usage, plans, solved) -> int:
+        """
+        Write a batch that keeps failing one event group at a time and drop
+        the groups the database rejects. MAX_RETRIES failures in a row mean
+        the database itself is failing; the unwritten groups are then put back.
+        """
+        units = ([([row], {}, {}) for row in usage]
+                 + [([], {username: n}, {}) for username, n in plans.items()]
+                 + [([], {}, {username: s}) for username, s in solved.items()])
+        written = dropped = 0
+        failing = []  # Consecutive failed units
+        for i, unit in enumerate(units):
+            try:
+                apply_usage_batch(*unit)
+            except Exception:
+                failing.append(unit)
+                if len(failing) >= MAX_RETRIES:
+                    self._restore(*_merge(failing + units[i + 1:]))
+                    raise
+                continue
+            written += _count(*unit)
+            dropped += sum(_count(*bad) for bad in failing)
+            failing.clear()
+        dropped += sum(_count(*bad) for bad in failing)
+        if dropped:
+            logger.error("Dropped %d usage events the database rejected", dropped)
+        return written
+
+    def _report_dropped(self) -> None:
+        with self._lock:
+            dropped, self._dropped = self._dropped, 0
+        if dropped:
+            logger.warning("Dropped %d usage rows while the buffer was full", dropped)
+
+    async def flush(self) -> int:
+        """Flush without blocking the event loop."""
+        if not self._events:
+            return 0
+        return await run_write(self.flush_sync)
+
+    async def try_flush(self) -> None:
+        """Flush for a request; a failed write stays buffered and is only logged."""
+        try:
+            await self.flush()
+        except Exception:
+            logger.warning("Usage flush failed; retrying on the next flush", exc_info=True)
+
+    async def flush_if_full(self) -> None:
+        if self._events >= MAX_PENDING:
+            await self.try_flush()
+
+    async def run(self, interval: float = FLUSH_INTERVAL) -> None:
+        """Background task: flush every `interval` seconds until cancelled."""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.flush()
+            except Exception:
+                pass  # Put back and retried on the next tick
+
+
+def _count(usage, plans, solved) -> int:
+    """Number of events in a batch."""
+    return len(usage) + sum(plans.values()) + sum(n for n, _ in solved.values())
+
+
+def _merge(units) -> Tuple[List[tuple], Dict[str, int], Dict[str, Tuple[int, int]]]:
+    """Combine (usage, plans, solved) batches of distinct events into one."""
+    usage, plans, solved = [], {}, {}
+    for unit_usage, unit_plans, unit_solved in units:
+        usage.extend(unit_usage)
+        plans.update(unit_plans)
+        solved.update(unit_solved)
+    return usage, plans, solved
+
+
+usage_buffer = UsageBuffer()
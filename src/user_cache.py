@@ -0,0 +1,119 @@
+"""
+Short-lived cache of verified access tokens to user records.
+
+Lets the auth dependency skip the JWT decode and the user lookup on repeated
+requests with the same token. An entry lives for at most TTL seconds and never
+beyond the token's own expiry. Entries are dropped when the user is updated or
+deleted (see database.update_user / delete_user) and when the token is logged
+out; logged out tokens are also remembered as revoked until they expire.
+
+A lookup that started before an invalidation must not repopulate the cache with
+what it read: callers take `generation` before the lookup and pass it to put(),
+which ignores the result if anything was invalidated in between.
+"""
+from __future__ import annotations
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Set, Tuple
+
+from .metrics import CACHE_HITS, CACHE_MISSES
+
+TTL = 60.0  # Seconds a verified token is trusted without re-checking the database
+MAX_ENTRIES = 10_000
+
+
+class UserCache:
+    """Thread-safe token -> user cache with per-user invalidation."""
+
+    def __init__(self, ttl: float = TTL, max_entries: int = MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, Tuple[float, dict]] = OrderedDict()  # Oldest first
+        self._tokens_by_user: Dict[str, Set[str]] = {}
+        self._revoked: Dict[str, float] = {}  # Token -> JWT exp (epoch seconds)
+        self._generation = 0  # Bumped by every invalidation
+        self._lock = threading.Lock()
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def get(self, token: str) -> Optional[dict]:
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is not None and entry[0] <= time.monotonic():
+                self._remove(token)
+                entry = None
+        if entry is None:
+            CACHE_MISSES.inc(cache="token")
+            return None
+        CACHE_HITS.inc(cache="token")
+        return entry[1]
+
+    def put(self, token: str, user: dict, token_expires: Optional[float] = None,
+            generation: Optional[int] = None) -> None:
+        """
+        Cache a verified token; `token_expires` is the JWT exp claim (epoch seconds).
+        Nothing is cached if the token is revoked, or if anything was invalidated
+        since `generation` was read.
+        """
+        lifetime = self.ttl
+        if token_expires is not None:
+            lifetime = min(lifetime, token_expires - time.time())
+        if lifetime <= 0:
+            return
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            if token in self._revoked:
+                return
+            self._remove(token)
+            while len(self._entries) >= self.max_entries:
+                self._remove(next(iter(self._entries)))
+            self._entries[token] = (time.monotonic() + lifetime, user)
+            self._tokens_by_user.setdefault(user['username'], set()).add(token)
+
+    def invalidate_token(self, token: str) -> None:
+        with self._lock:
+            self._generation += 1
+            self._remove(token)
+
+    def invalidate_user(self, username: str) -> None:
+        with self._lock:
+            self._generation += 1
+            for token in self._tokens_by_user.pop(username, ()):
+                self._entries.pop(token, None)
+
+    def revoke_token(self, token: str, token_expires: Optional[float] = None) -> None:
+        """Drop a token and reject it until its exp claim passes (see is_revoked)."""
+        now = time.time()
+        with self._lock:
+            self._generation += 1
+            self._remove(token)
+            for expired in [t for t, expires in self._revoked.items() if expires <= now]:
+                del self._revoked[expired]
+            self._revoked[token] = token_expires if token_expires is not None else float("inf")
+
+    def is_revoked(self, token: str) -> bool:
+        with self._lock:
+            return token in self._revoked
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._tokens_by_user.clear()
+
+    def _remove(self, token: str) -> None:
+        entry = self._entries.pop(token, None)
+        if entry is None:
+            return
+        tokens = self._tokens_by_user.get(entry[1]['username'])
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._tokens_by_user[entry[1]['username']]
+
+
+user_cache = UserCache()
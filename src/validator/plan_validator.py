@@ -73,8 +73,7 @@ class PlanValidator:
                 )
             
             # Apply action
-            new_preds = action.apply(current_state.predicates)
-            current_state = State(new_preds)
+            current_state = action.apply(current_state)
             
             # Record step
             execution_trace.append({